@@ -0,0 +1,202 @@
+import atexit
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+# GroupCommitWriter yang masih hidup, di-flush saat proses selesai
+_writers = weakref.WeakSet()
+
+def _temp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def _fsync_directory(directory):
+    """fsync direktori supaya os.replace ikut tersimpan (tidak ada di Windows)"""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_open(path, mode='w', encoding='utf-8', fsync=True):
+    """
+    Membuka file untuk ditulis secara atomik
+
+    Isi ditulis ke file sementara di direktori yang sama lalu dipindahkan
+    ke path tujuan dengan os.replace. Jika terjadi error (atau crash) di
+    tengah penulisan, file lama tetap utuh.
+
+    Args:
+        path: Path file tujuan
+        mode: 'w' atau 'wb'
+        encoding: Encoding untuk mode teks
+        fsync: fsync file dan direktori sebelum selesai
+
+    Yields:
+        File object sementara
+    """
+    temp_path = _temp_path(path)
+    f = open(temp_path, mode, encoding=None if 'b' in mode else encoding)
+    try:
+        with f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if fsync:
+        _fsync_directory(os.path.dirname(path))
+
+def atomic_write(path, data, fsync=True):
+    """
+    Menulis str / bytes ke file secara atomik
+
+    Returns:
+        Jumlah byte yang ditulis
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    with atomic_open(path, 'wb', fsync=fsync) as f:
+        f.write(data)
+    return len(data)
+
+class GroupCommitWriter:
+    """
+    Menggabungkan banyak penulisan file menjadi satu commit
+
+    write() hanya menyimpan isi terbaru per path; setelah window detik
+    semua yang tertunda ditulis ke file sementara dan di-fsync, lalu
+    dipindahkan ke tujuannya dengan satu fsync per direktori. Save berulang
+    ke file yang sama dalam satu window cukup ditulis sekali. Yang masih
+    tertunda saat proses selesai ikut di-commit (atexit), dan batch yang
+    gagal ditulis dikembalikan untuk dicoba lagi.
+    """
+
+    def __init__(self, window=0.5):
+        """
+        Args:
+            window: Waktu tunggu (detik) sebelum penulisan yang tertunda di-commit
+        """
+        self.window = window
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._commit_lock = threading.RLock()
+        self._timer = None
+        self.commits = 0
+        self.writes = 0
+        _writers.add(self)
+
+    def write(self, path, data, on_commit=None):
+        """
+        Menjadwalkan penulisan file
+
+        Args:
+            path: Path file tujuan
+            data: Isi file (str atau bytes)
+            on_commit: Callback tanpa argumen setelah file ini di-commit
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        with self._lock:
+            self._pending[path] = (data, on_commit)
+            self.writes += 1
+            self._schedule()
+
+    def _schedule(self):
+        # Dipanggil dengan self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.window, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        except Exception as e:
+            # Batch sudah dikembalikan oleh flush() dan dicoba lagi nanti
+            print(f"❌ Group commit failed, will retry: {e}")
+
+    def pending(self, path):
+        with self._lock:
+            return path in self._pending
+
+    def flush(self, path=None):
+        """
+        Meng-commit penulisan yang tertunda sekarang
+
+        Args:
+            path: Hanya commit path ini (default: semua)
+
+        Returns:
+            Jumlah file yang ditulis
+        """
+        with self._commit_lock:
+            with self._lock:
+                if path is None:
+                    batch, self._pending = self._pending, {}
+                elif path in self._pending:
+                    batch = {path: self._pending.pop(path)}
+                else:
+                    batch = {}
+                if not self._pending and self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return 0
+
+            temp_paths = {}
+            try:
+                # Hanya file batch ini yang di-fsync, bukan seluruh filesystem
+                for target, (data, _) in batch.items():
+                    temp_paths[target] = _temp_path(target)
+                    with open(temp_paths[target], 'wb') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+
+                # Direktori di-fsync sekali setelah semua file dipindahkan
+                for target, temp_path in temp_paths.items():
+                    os.replace(temp_path, target)
+                for directory in {os.path.dirname(target) for target in batch}:
+                    _fsync_directory(directory)
+            except BaseException:
+                for temp_path in temp_paths.values():
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                with self._lock:
+                    # Kembalikan batch; save yang lebih baru untuk path yang sama diutamakan
+                    for target, item in batch.items():
+                        self._pending.setdefault(target, item)
+                    self._schedule()
+                raise
+
+            self.commits += 1
+            for _, on_commit in batch.values():
+                if on_commit:
+                    on_commit()
+            return len(batch)
+
+    def close(self):
+        """Commit semua yang tertunda dan hentikan timer"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+@atexit.register
+def _flush_writers():
+    for writer in list(_writers):
+        try:
+            writer.flush()
+        except Exception as e:
+            print(f"❌ Group commit failed at exit: {e}")
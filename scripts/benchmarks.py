@@ -0,0 +1,524 @@
+import io
+import os
+import sys
+import time
+import base64
+import contextlib
+import json
+import resource
+import tempfile
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
+
+from image_processor import (
+    apply_sepia, compile_effects, load_image, process_scrapbook_image, process_scrapbook_images,
+)
+from image_cache import ImageCache
+from scrapbook_index import ScrapbookIndex
+from scrapbook_archive import ScrapbookArchive, load_archive, save_archive
+from atomic_write import GroupCommitWriter, atomic_write
+from pdf_generator import ScrapbookPDFGenerator
+import scrapbook_generator
+from image_derivatives import (
+    DERIVATIVE_FORMATS, DERIVATIVE_QUALITY, DERIVATIVE_WIDTHS, DerivativeStore, choose_variant,
+)
+
+def timed(func, *args, **kwargs):
+    """Menjalankan fungsi sekali dan mengembalikan (hasil, detik)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def make_test_image(megapixels, seed=0):
+    """
+    Membuat gambar RGB sintetis dengan jumlah megapiksel tertentu
+
+    Args:
+        megapixels: Ukuran gambar dalam megapiksel (rasio 4:3)
+        seed: Seed untuk isi piksel
+
+    Returns:
+        PIL Image RGB
+    """
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 64 + seed)
+    return Image.merge('RGB', (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+def sepia_pixel_loop(image):
+    """Implementasi sepia lama (per piksel) sebagai pembanding"""
+    image = image.copy()
+    pixels = image.load()
+    for i in range(image.width):
+        for j in range(image.height):
+            r, g, b = pixels[i, j]
+            tr = int(0.393 * r + 0.769 * g + 0.189 * b)
+            tg = int(0.349 * r + 0.686 * g + 0.168 * b)
+            tb = int(0.272 * r + 0.534 * g + 0.131 * b)
+            pixels[i, j] = (min(255, tr), min(255, tg), min(255, tb))
+    return image
+
+def bench_sepia(sizes=(1, 4, 12)):
+    """Membandingkan sepia per piksel dengan sepia matrix"""
+    print("🎞️ Sepia: pixel loop vs color matrix")
+    for megapixels in sizes:
+        image = make_test_image(megapixels)
+        legacy, legacy_time = timed(sepia_pixel_loop, image)
+        fast, fast_time = timed(apply_sepia, image)
+
+        diffs = [abs(a - b) for a, b in zip(legacy.tobytes(), fast.tobytes())]
+        changed = len(diffs) - diffs.count(0)
+
+        print(f"  {megapixels:>2} MP {image.size}: loop {legacy_time:.2f}s, "
+              f"matrix {fast_time:.3f}s ({legacy_time / fast_time:.0f}x), "
+              f"max diff {max(diffs)}, {changed / len(diffs):.4%} channel values differ")
+
+def staged_effects(image, effects):
+    """Pipeline efek lama: satu gambar perantara per efek"""
+    if effects.get('vintage', False):
+        image = apply_sepia(ImageEnhance.Color(image).enhance(0.7))
+    if effects.get('blur', 0) > 0:
+        image = image.filter(ImageFilter.GaussianBlur(radius=effects['blur']))
+    if effects.get('brightness', 1.0) != 1.0:
+        image = ImageEnhance.Brightness(image).enhance(effects['brightness'])
+    if effects.get('contrast', 1.0) != 1.0:
+        image = ImageEnhance.Contrast(image).enhance(effects['contrast'])
+    return image
+
+def bench_effects(megapixels=12):
+    """Membandingkan pipeline efek bertahap dengan EffectPlan yang difusi"""
+    print(f"🧪 Effect pipeline: staged vs fused plan ({megapixels} MP)")
+    image = make_test_image(megapixels)
+    for effects in (
+        {'vintage': True},
+        {'brightness': 1.1, 'contrast': 1.2},
+        {'vintage': True, 'brightness': 1.1, 'contrast': 1.2},
+        {'vintage': True, 'blur': 2, 'brightness': 1.1, 'contrast': 1.2},
+    ):
+        plan = compile_effects(effects)
+        staged, staged_time = timed(staged_effects, image, effects)
+        fused, fused_time = timed(plan.apply, image)
+        max_diff = max(abs(a - b) for a, b in zip(staged.tobytes(), fused.tobytes()))
+        print(f"  {plan}: staged {staged_time:.3f}s, fused {fused_time:.3f}s, max diff {max_diff}")
+
+def make_data_url(image, quality=90):
+    """Meng-encode gambar uji sebagai data URL JPEG"""
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=quality)
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+def bench_batch(count=24, megapixels=2):
+    """Membandingkan process_scrapbook_images serial dengan process pool"""
+    print(f"📦 Batch processing: {count} x {megapixels} MP, {os.cpu_count()} CPUs")
+    items = [make_data_url(make_test_image(megapixels, seed)) for seed in range(count)]
+    effects = {'vintage': True, 'blur': 1, 'contrast': 1.1, 'polaroid_frame': True}
+
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        results, elapsed = timed(list, process_scrapbook_images(items, effects, workers=workers))
+        failed = sum(1 for result in results if result.error)
+        print(f"  workers={workers}: {elapsed:.2f}s ({count / elapsed:.1f} img/s, {failed} failed)")
+
+def full_decode_preview(data, target_size, plan):
+    """Cara lama: decode resolusi penuh, efek, baru diperkecil"""
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image = plan.apply(image)
+    image.thumbnail(target_size, Image.Resampling.LANCZOS)
+    return image
+
+def draft_decode_preview(data, target_size, plan):
+    """Cara baru: decode pada skala kecil, baru efek"""
+    return plan.apply(load_image(data, target_size))
+
+def _peak_rss_of(func, *args):
+    """Dijalankan di proses baru: (detik, kenaikan peak RSS dalam MB)"""
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    _, elapsed = timed(func, *args)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return elapsed, (peak - baseline) / 1024
+
+def bench_draft(megapixels=12, target_size=(400, 300)):
+    """Membandingkan preview dari decode penuh dengan draft/reduce decode"""
+    print(f"🔍 {megapixels} MP JPEG -> vintage preview fitting {target_size}")
+    buffer = io.BytesIO()
+    make_test_image(megapixels).save(buffer, format='JPEG', quality=90)
+    data = buffer.getvalue()
+    plan = compile_effects({'vintage': True, 'contrast': 1.2})
+
+    for label, func in (('full decode', full_decode_preview), ('draft decode', draft_decode_preview)):
+        # Proses baru per varian supaya peak RSS tidak saling memengaruhi
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            elapsed, rss = executor.submit(_peak_rss_of, func, data, target_size, plan).result()
+        print(f"  {label}: {elapsed:.3f}s, peak RSS +{rss:.1f} MB")
+
+def bench_cache(count=8, megapixels=4):
+    """Membandingkan proses pertama dengan proses ulang lewat ImageCache"""
+    print(f"🗃️ Processed-image cache: {count} x {megapixels} MP, vintage + border")
+    items = [make_data_url(make_test_image(megapixels, seed)) for seed in range(count)]
+    plan = compile_effects({'vintage': True, 'contrast': 1.2, 'polaroid_frame': True})
+    cache = ImageCache()
+
+    def run():
+        for item in items:
+            process_scrapbook_image(item, plan, cache=cache)
+
+    # Output print per gambar tidak relevan untuk benchmark
+    stdout, sys.stdout = sys.stdout, io.StringIO()
+    try:
+        _, cold = timed(run)
+        _, warm = timed(run)
+    finally:
+        sys.stdout = stdout
+
+    print(f"  cold: {cold:.2f}s, warm: {warm:.4f}s ({cold / warm:.0f}x)")
+    print(f"  stats: {cache.stats()}")
+
+def bench_index(count=50_000):
+    """Mengukur listing katalog scrapbook dengan puluhan ribu entri"""
+    print(f"🗂️ Scrapbook index: {count} entries")
+    with tempfile.TemporaryDirectory() as directory:
+        index = ScrapbookIndex(os.path.join(directory, 'index.sqlite3'))
+        themes = ('vintage', 'modern', 'cute', 'nature', 'travel', 'birthday')
+        entries = (
+            (f"scrapbook_{i:06d}.json", {
+                'title': f"Album {i}",
+                'page_count': i % 40 + 1,
+                'photo_count': i % 120,
+                'theme': themes[i % len(themes)],
+                'saved_at': f"2026-{i % 12 + 1:02d}-{i % 28 + 1:02d}T12:00:00",
+            }, 1000 + i)
+            for i in range(count)
+        )
+        _, elapsed = timed(index.upsert_many, entries)
+        print(f"  bulk insert: {elapsed:.2f}s")
+
+        for label, kwargs in (
+            ('first page by filename', {'limit': 50}),
+            ('page 100 by saved_at', {'limit': 50, 'offset': 5000, 'sort_by': 'saved_at'}),
+            ('theme filter by size', {'limit': 50, 'theme': 'travel', 'sort_by': 'size'}),
+            ('title search', {'limit': 50, 'title_contains': 'Album 4999'}),
+        ):
+            rows, elapsed = timed(index.query, **kwargs)
+            print(f"  {label}: {len(rows)} rows in {elapsed * 1000:.2f} ms")
+        index.close()
+
+def make_album(pages=40, photos_per_page=3, megapixels=0.5, distinct=None):
+    """
+    Membuat scrapbook sintetis dengan foto data URL
+
+    Args:
+        distinct: Jumlah foto unik (default: semua foto berbeda)
+    """
+    total = pages * photos_per_page
+    distinct = distinct or total
+    sources = [make_data_url(make_test_image(megapixels, seed)) for seed in range(distinct)]
+    return {
+        'title': 'Benchmark Album',
+        'pages': [
+            {
+                'id': page + 1,
+                'photos': [
+                    {
+                        'id': f"photo_{page}_{i}",
+                        'src': sources[(page * photos_per_page + i) % distinct],
+                        'x': 40 + i * 180, 'y': 60, 'width': 160, 'height': 120, 'rotation': i - 1,
+                    }
+                    for i in range(photos_per_page)
+                ],
+                'texts': [{
+                    'id': 'text_1', 'content': f"Halaman {page + 1}", 'x': 200, 'y': 320,
+                    'fontSize': 20, 'color': '#8B4513', 'fontFamily': 'serif',
+                }],
+                'stickers': [{'id': 'sticker_1', 'emoji': '⭐', 'x': 500, 'y': 40, 'size': 30}],
+                'theme': 'vintage',
+            }
+            for page in range(pages)
+        ],
+    }
+
+def bench_formats(pages=40, photos_per_page=3):
+    """Membandingkan JSON ber-indentasi dengan archive biner"""
+    print(f"🗜️ Persistence formats: {pages} pages x {photos_per_page} photos")
+    album = make_album(pages, photos_per_page)
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'album.json')
+        archive_path = os.path.join(directory, 'album.sbz')
+
+        def save_json():
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(album, f, indent=2, ensure_ascii=False)
+
+        def load_json():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        def read_archive_title():
+            with ScrapbookArchive(archive_path) as archive:
+                return archive.data['title']
+
+        _, json_save = timed(save_json)
+        loaded_json, json_load = timed(load_json)
+        _, archive_save = timed(save_archive, album, archive_path)
+        loaded_archive, archive_load = timed(load_archive, archive_path)
+        _, archive_meta = timed(read_archive_title)
+
+        print(f"  json:    {os.path.getsize(json_path) / 1e6:.1f} MB, "
+              f"save {json_save:.3f}s, load {json_load:.3f}s")
+        print(f"  archive: {os.path.getsize(archive_path) / 1e6:.1f} MB, "
+              f"save {archive_save:.3f}s, load {archive_load:.3f}s, metadata only {archive_meta * 1000:.1f} ms")
+        print(f"  lossless round trip: json {loaded_json == album}, archive {loaded_archive == album}")
+
+def bench_writes(saves=200, files=10, size=64 * 1024):
+    """Throughput autosave: tulis langsung, atomik + fsync, dan group commit"""
+    print(f"💾 Write throughput: {saves} saves over {files} files, {size // 1024} KB each")
+    payload = b'x' * size
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f'album_{i}.json') for i in range(files)]
+
+        def plain():
+            for i in range(saves):
+                with open(paths[i % files], 'wb') as f:
+                    f.write(payload)
+
+        def atomic():
+            for i in range(saves):
+                atomic_write(paths[i % files], payload)
+
+        def group_commit():
+            with GroupCommitWriter(window=0.05) as writer:
+                for i in range(saves):
+                    writer.write(paths[i % files], payload)
+            return writer
+
+        _, plain_time = timed(plain)
+        _, atomic_time = timed(atomic)
+        writer, group_time = timed(group_commit)
+
+        print(f"  plain 'w' (not crash-safe): {saves / plain_time:8.0f} saves/s")
+        print(f"  atomic + fsync each save:   {saves / atomic_time:8.0f} saves/s")
+        print(f"  group commit (50 ms):       {saves / group_time:8.0f} saves/s "
+              f"({writer.commits} commits for {writer.writes} saves)")
+
+def bench_pdf(pages=100, photos_per_page=2):
+    """Membandingkan create_advanced_pdf (platypus) dengan renderer canvas"""
+    print(f"📄 PDF layout: {pages} pages x {photos_per_page} photos")
+    album = make_album(pages, photos_per_page, megapixels=0.3, distinct=12)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for name in ('advanced', 'canvas'):
+            # Cache baru tiap layout supaya decode foto ikut terhitung;
+            # build kedua (cache hangat) menunjukkan biaya layout saja
+            generator = ScrapbookPDFGenerator(cache=ImageCache())
+            build = getattr(generator, f'create_{name}_pdf')
+            path = os.path.join(directory, f'{name}.pdf')
+            _, cold = timed(build, album, path)
+            _, warm = timed(build, album, path)
+            results[name] = (cold, warm)
+            print(f"  {name:<9} cold {cold:.2f}s, warm {warm:.2f}s, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"  speedup: cold {results['advanced'][0] / results['canvas'][0]:.1f}x, "
+              f"warm {results['advanced'][1] / results['canvas'][1]:.1f}x")
+
+def bench_parallel(pages=120, photos_per_page=2):
+    """Renderer canvas serial dibanding create_parallel_pdf"""
+    print(f"🧵 Parallel PDF: {pages} pages x {photos_per_page} photos, {os.cpu_count()} CPUs")
+    album = make_album(pages, photos_per_page, megapixels=0.5, distinct=pages * photos_per_page)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'album.pdf')
+        _, serial = timed(ScrapbookPDFGenerator(cache=False).create_canvas_pdf, album, path)
+        print(f"  serial canvas:      {serial:.2f}s")
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            _, parallel = timed(ScrapbookPDFGenerator(cache=False).create_parallel_pdf,
+                                album, path, workers=workers)
+            print(f"  parallel x{workers:<2}       {parallel:.2f}s ({serial / parallel:.1f}x)")
+
+def bench_reuse(pages=100, photos_per_page=3, distinct=4):
+    """Ukuran dan waktu build PDF dengan foto yang dipakai berulang"""
+    print(f"♻️ Image reuse: {pages} pages x {photos_per_page} photos, {distinct} unique photos")
+    album = make_album(pages, photos_per_page, megapixels=0.3, distinct=distinct)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ('pdf_from_scrapbook', 'canvas_pdf'):
+            for share_images in (False, True):
+                generator = ScrapbookPDFGenerator(cache=ImageCache(), share_images=share_images)
+                build = getattr(generator, f'create_{name}')
+                path = os.path.join(directory, f'{name}.pdf')
+                build(album, path)
+                # Build kedua: foto sudah di cache, yang diukur hanya embedding
+                _, seconds = timed(build, album, path)
+                label = 'shared XObject' if share_images else 'per use'
+                print(f"  {name:<19} {label:<15} {seconds:.2f}s, {os.path.getsize(path) / 1e3:.0f} KB")
+
+def iter_synthetic_pages(pages, sources):
+    """Halaman sintetis yang dibuat saat dibaca (seperti iter_pages())"""
+    for page in range(pages):
+        yield {
+            'id': page + 1,
+            'photos': [
+                {'id': f"photo_{page}_{i}", 'src': sources[(page + i) % len(sources)],
+                 'x': 40 + i * 180, 'y': 60, 'width': 160, 'height': 120, 'rotation': i - 1}
+                for i in range(3)
+            ],
+            'texts': [{'id': 'text_1', 'content': f"Halaman {page + 1}", 'x': 200, 'y': 320,
+                       'fontSize': 20, 'color': '#8B4513', 'fontFamily': 'serif'}],
+            'stickers': [{'id': 'sticker_1', 'emoji': '⭐', 'x': 500, 'y': 40, 'size': 30}],
+            'theme': 'vintage',
+        }
+
+def _peak_traced(func, *args):
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_streaming(page_counts=(100, 1000)):
+    """
+    Profil memori ekspor PDF: reportlab canvas dibanding StreamingCanvas
+
+    Memori puncak streaming harus tetap datar (maksimal 1.5x) dari 100 ke
+    1000 halaman; reportlab canvas menyimpan seluruh dokumen sampai save().
+    """
+    print(f"🌊 Streaming PDF memory: {' vs '.join(map(str, page_counts))} pages")
+    sources = [make_data_url(make_test_image(0.02, seed)) for seed in range(6)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'album.pdf')
+        peaks = {}
+        for name in ('canvas', 'streaming'):
+            for pages in page_counts:
+                generator = ScrapbookPDFGenerator(cache=False)
+                build = getattr(generator, f'create_{name}_pdf')
+                album = {'title': 'Benchmark Album', 'pages': iter_synthetic_pages(pages, sources)}
+                peaks[name, pages] = _peak_traced(build, album, path)
+                print(f"  {name:<9} {pages:>5} pages: peak {peaks[name, pages] / 1e6:6.1f} MB, "
+                      f"file {os.path.getsize(path) / 1e6:.1f} MB")
+
+        growth = peaks['streaming', page_counts[-1]] / peaks['streaming', page_counts[0]]
+        print(f"  streaming growth {growth:.2f}x: {'flat ✅' if growth <= 1.5 else 'NOT flat ❌'}")
+        return growth <= 1.5
+
+def background_shape_loop(width, height, color, pattern):
+    """Referensi: pola digambar bentuk per bentuk lalu di-encode setiap panggilan"""
+    color_rgb = tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
+    img = Image.new('RGB', (width, height), color_rgb)
+    draw = ImageDraw.Draw(img)
+    if pattern == 'dots':
+        for x in range(0, width, 30):
+            for y in range(0, height, 30):
+                if (x + y) % 60 == 0:
+                    draw.ellipse([x-2, y-2, x+2, y+2], fill=(200, 200, 200))
+    elif pattern == 'lines':
+        for y in range(0, height, 25):
+            draw.line([(0, y), (width, y)], fill=(200, 200, 200), width=1)
+    elif pattern == 'grid':
+        for x in range(0, width, 20):
+            draw.line([(x, 0), (x, height)], fill=(200, 200, 200), width=1)
+        for y in range(0, height, 20):
+            draw.line([(0, y), (width, y)], fill=(200, 200, 200), width=1)
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+def bench_backgrounds(pages=500):
+    """Background untuk template bertema: bentuk per bentuk vs tile + cache"""
+    print(f"🧱 Page backgrounds: {pages} pages")
+    colors = ['#F5E6D3', '#FFFFFF', '#FFE4E1', '#F0F8E8']
+    patterns = ['dots', 'lines', 'grid']
+    specs = [(600, 400, colors[page % len(colors)], patterns[page % len(patterns)])
+             for page in range(pages)]
+
+    _, reference = timed(lambda: [background_shape_loop(*spec) for spec in specs])
+    scrapbook_generator._render_page_background.cache_clear()
+    _, tiled = timed(lambda: [scrapbook_generator.create_page_background(*spec) for spec in specs])
+    _, warm = timed(lambda: [scrapbook_generator.create_page_background(*spec) for spec in specs])
+    info = scrapbook_generator._render_page_background.cache_info()
+    print(f"  shape loop:   {reference:.3f}s")
+    print(f"  tile + cache: {tiled:.3f}s ({reference / tiled:.0f}x), {info.currsize} rendered")
+    print(f"  warm cache:   {warm:.4f}s ({warm / pages * 1e6:.1f} µs/page)")
+
+def bench_derivatives(count=6, megapixels=6):
+    """Tangga derivatif dari satu decode vs decode terpisah per ukuran"""
+    print(f"🪜 Derivatives: {count} images x {megapixels} MP, widths {DERIVATIVE_WIDTHS}, "
+          f"formats {DERIVATIVE_FORMATS}")
+    sources = []
+    for seed in range(count):
+        buffer = io.BytesIO()
+        make_test_image(megapixels, seed).save(buffer, 'JPEG', quality=90)
+        sources.append(buffer.getvalue())
+
+    def separate_decodes():
+        for data in sources:
+            for width in DERIVATIVE_WIDTHS:
+                image = load_image(data)
+                image = image.resize((width, round(image.height * width / image.width)), Image.Resampling.LANCZOS)
+                for image_format in DERIVATIVE_FORMATS:
+                    image.save(io.BytesIO(), image_format, quality=DERIVATIVE_QUALITY)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = DerivativeStore(directory)
+        _, separate = timed(separate_decodes)
+        _, ladder = timed(lambda: [store.generate(data) for data in sources])
+        print(f"  decode per size: {separate:.2f}s")
+        print(f"  one-decode ladder: {ladder:.2f}s ({separate / ladder:.1f}x)")
+
+        manifest = store.generate(sources[0])
+        variant = choose_variant(manifest, 400, 300, formats=('JPEG',))
+        _, original = timed(lambda: [load_image(data, (400, 300)) for data in sources])
+        _, derived = timed(lambda: [load_image(store.read(store.generate(data), variant), (400, 300))
+                                    for data in sources])
+        print(f"  400x300 from original: {original:.3f}s, from {variant['width']}px variant: {derived:.3f}s")
+
+def bench_themes(pages=10_000):
+    """Template bertema besar: registry tema dibangun sekali vs per halaman"""
+    print(f"🎨 Themed template: {pages} pages")
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, template = timed(scrapbook_generator.generate_scrapbook_template, 'vintage', pages)
+        _, themed_pages = timed(lambda: [scrapbook_generator.create_themed_page('cute', page)
+                                         for page in range(1, pages + 1)])
+        _, album = timed(scrapbook_generator.create_themed_album, 'cute', pages, seed=1)
+    # Yang dulu dibayar setiap panggilan: membangun ulang semua tema
+    _, rebuild = timed(lambda: [scrapbook_generator.theme_registry.__wrapped__(None)
+                                for _ in range(pages)])
+    print(f"  generate_scrapbook_template: {template:.3f}s ({template / pages * 1e6:.1f} µs/page)")
+    print(f"  create_themed_page x{pages}: {themed_pages:.3f}s")
+    print(f"  create_themed_album:        {album:.3f}s")
+    print(f"  rebuilding themes per page would add {rebuild:.3f}s")
+
+BENCHMARKS = {
+    'sepia': bench_sepia,
+    'effects': bench_effects,
+    'batch': bench_batch,
+    'draft': bench_draft,
+    'cache': bench_cache,
+    'index': bench_index,
+    'formats': bench_formats,
+    'writes': bench_writes,
+    'pdf': bench_pdf,
+    'parallel': bench_parallel,
+    'reuse': bench_reuse,
+    'streaming': bench_streaming,
+    'backgrounds': bench_backgrounds,
+    'derivatives': bench_derivatives,
+    'themes': bench_themes,
+}
+
+if __name__ == "__main__":
+    print("⏱️ Scrapbook Benchmarks")
+    print("=" * 50)
+
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark: {name} (available: {', '.join(BENCHMARKS)})")
+            continue
+        BENCHMARKS[name]()
+        print()
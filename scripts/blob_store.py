@@ -0,0 +1,101 @@
+import base64
+import hashlib
+import os
+import re
+
+# Referensi blob mengikuti bentuk data URL: blob:<mime>;sha256,<hex>
+BLOB_PREFIX = 'blob:'
+# Bentuk lengkapnya dicek, karena object URL browser (blob:https://...)
+# memakai prefix yang sama
+_BLOB_REF = re.compile(r'blob:([^,]*);sha256,([0-9a-f]{64})')
+
+def is_blob_ref(src):
+    """True jika src adalah referensi blob, bukan data URL / path / object URL"""
+    return isinstance(src, str) and _BLOB_REF.fullmatch(src) is not None
+
+def parse_blob_ref(ref):
+    """
+    Memecah referensi blob
+
+    Returns:
+        Tuple (mime_type, digest)
+    """
+    match = _BLOB_REF.fullmatch(ref) if isinstance(ref, str) else None
+    if match is None:
+        raise ValueError(f"Not a blob reference: {str(ref)[:40]!r}")
+    return match.group(1), match.group(2)
+
+class BlobStore:
+    """
+    Penyimpanan foto berbasis isi (content-addressed) di direktori terpisah
+
+    Setiap blob disimpan sekali dengan nama SHA-256 dari isinya, jadi foto
+    yang sama di beberapa halaman atau scrapbook otomatis hanya tersimpan
+    satu kali. JSON scrapbook cukup menyimpan referensi blob.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def put(self, data, mime_type='application/octet-stream'):
+        """
+        Menyimpan bytes sebagai blob (dilewati jika sudah ada)
+
+        Returns:
+            Referensi blob
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return f"{BLOB_PREFIX}{mime_type};sha256,{digest}"
+
+    def put_data_url(self, data_url):
+        """
+        Memindahkan data URL base64 ke blob store
+
+        Returns:
+            Referensi blob, atau data URL asli jika bukan base64
+        """
+        header, _, payload = data_url.partition(',')
+        if not header.endswith(';base64'):
+            return data_url
+        mime_type = header[len('data:'):-len(';base64')]
+        return self.put(base64.b64decode(payload), mime_type)
+
+    def read(self, ref):
+        """Membaca bytes blob dari referensinya"""
+        _, digest = parse_blob_ref(ref)
+        with open(self._path(digest), 'rb') as f:
+            return f.read()
+
+    def to_data_url(self, ref):
+        """Mengubah referensi blob kembali menjadi data URL base64"""
+        mime_type, _ = parse_blob_ref(ref)
+        return f"data:{mime_type};base64,{base64.b64encode(self.read(ref)).decode()}"
+
+    def exists(self, ref):
+        _, digest = parse_blob_ref(ref)
+        return os.path.exists(self._path(digest))
+
+# Example usage
+if __name__ == "__main__":
+    print("🧱 Scrapbook Blob Store")
+    print("=" * 40)
+
+    store = BlobStore("scrapbook_blobs")
+    ref = store.put(b'example photo bytes', 'image/jpeg')
+    print(f"Stored blob: {ref}")
+    print(f"Same bytes, same ref: {store.put(b'example photo bytes', 'image/jpeg') == ref}")
+
+    print("\nAvailable methods:")
+    print("  - put(data, mime_type) / put_data_url(data_url)")
+    print("  - read(ref) / to_data_url(ref)")
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# kind: 'phase_started', 'phase_finished', 'page_started', 'page_finished',
+#       'image_processed' atau 'bytes_written'
+# value: ukuran gambar (image_processed) / total byte file output sejauh ini
+#        (bytes_written); elapsed: detik per halaman atau per fase
+ProgressEvent = namedtuple('ProgressEvent', ['kind', 'phase', 'page', 'value', 'elapsed'])
+
+class ExportCancelled(Exception):
+    """Ekspor dihentikan lewat CancelToken"""
+
+class CancelToken:
+    """
+    Token pembatalan kooperatif untuk ekspor yang berjalan lama
+
+    Boleh di-cancel dari thread lain (mis. job runner); ekspor memeriksanya
+    di antara halaman dan berhenti dengan bersih.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise ExportCancelled("Export cancelled")
+
+class ProgressReporter:
+    """
+    Meneruskan event progres ke callback dan memeriksa pembatalan
+
+    Tanpa callback dan token semua method-nya tidak melakukan apa-apa, jadi
+    exporter bisa memanggilnya tanpa syarat.
+    """
+
+    def __init__(self, callback=None, cancel_token=None):
+        """
+        Args:
+            callback: Fungsi callback(ProgressEvent) (optional)
+            cancel_token: CancelToken (optional)
+        """
+        self.callback = callback
+        self.cancel_token = cancel_token
+        self._phase = None
+
+    def emit(self, kind, page=None, value=None, elapsed=None, phase=None):
+        if self.callback:
+            self.callback(ProgressEvent(kind, phase or self._phase, page, value, elapsed))
+
+    def check(self):
+        """Melempar ExportCancelled jika ekspor sudah dibatalkan"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    @contextmanager
+    def phase(self, name):
+        """Menandai satu fase ekspor; phase_finished membawa waktu fase (detik)"""
+        previous, self._phase = self._phase, name
+        start = time.perf_counter()
+        self.emit('phase_started')
+        try:
+            yield
+        finally:
+            self.emit('phase_finished', elapsed=time.perf_counter() - start)
+            self._phase = previous
+
+    def page_started(self, page):
+        self.check()
+        self.emit('page_started', page)
+
+    def page_finished(self, page, elapsed):
+        self.emit('page_finished', page, elapsed=elapsed)
+
+    def image_processed(self, size):
+        self.emit('image_processed', value=size)
+
+    def bytes_written(self, size):
+        self.emit('bytes_written', value=size)
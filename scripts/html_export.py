@@ -0,0 +1,485 @@
+import base64
+import hashlib
+import html
+import io
+import math
+import os
+import re
+from datetime import datetime
+
+from PIL import Image
+
+from atomic_write import atomic_open, atomic_write
+from image_processor import encode_image, load_image
+
+STYLESHEET = """
+        body {
+            font-family: 'Arial', sans-serif;
+            background: linear-gradient(135deg, #fef3c7 0%, #fed7aa 50%, #fecaca 100%);
+            margin: 0;
+            padding: 20px;
+            min-height: 100vh;
+        }
+        .container {
+            max-width: 800px;
+            margin: 0 auto;
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 2rem;
+        }
+        .title {
+            font-size: 2.5rem;
+            color: #92400e;
+            margin-bottom: 0.5rem;
+        }
+        .page {
+            background: white;
+            border-radius: 0.75rem;
+            padding: 2rem;
+            margin-bottom: 2rem;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+            position: relative;
+            min-height: 400px;
+        }
+        .page-number {
+            position: absolute;
+            bottom: 1rem;
+            right: 1rem;
+            color: #6b7280;
+            font-size: 0.9rem;
+        }
+        .photo {
+            position: absolute;
+            border: 4px solid white;
+            border-radius: 0.25rem;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+        }
+        .photo img {
+            width: 100%;
+            height: 100%;
+            object-fit: cover;
+            border-radius: 0.125rem;
+        }
+        .text {
+            position: absolute;
+            font-family: 'Dancing Script', cursive;
+            font-weight: 600;
+        }
+        .sticker {
+            position: absolute;
+            font-size: 2rem;
+        }
+        @import url('https://fonts.googleapis.com/css2?family=Dancing+Script:wght@400;500;600;700&display=swap');
+"""
+
+# Fragmen HTML; method format-nya diambil sekali dan dipakai untuk setiap elemen
+_document_head = """<!DOCTYPE html>
+<html lang="id">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>📖 {title}</title>
+    <style>{stylesheet}    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 class="title">📖 {title}</h1>
+            <p>Dibuat pada: {created_date}</p>
+        </div>
+""".format
+_page_open = '<div class="page">\n  <div class="page-number">Halaman {}</div>\n'.format
+_photo_open = ('  <div class="photo" style="left: {}px; top: {}px; width: {}px; height: {}px; '
+               'transform: rotate({}deg);">').format
+PHOTO_CLOSE = '</div>\n'
+_text = ('  <div class="text" style="left: {}px; top: {}px; font-size: {}px; color: {}; '
+         'font-family: {};">{}</div>\n').format
+_sticker = '  <div class="sticker" style="left: {}px; top: {}px; font-size: {}px;">{}</div>\n'.format
+PAGE_CLOSE = '</div>\n'
+DOCUMENT_FOOT = """    </div>
+</body>
+</html>
+"""
+
+# Nilai style dari data scrapbook divalidasi, bukan hanya di-escape, supaya
+# tidak bisa menyisipkan deklarasi CSS lain (mis. "red;background:url(...)")
+_CSS_COLOR = re.compile(r'#[0-9a-fA-F]{3,8}|[a-zA-Z]{1,32}')
+CSS_FONT_FAMILIES = {
+    'serif': 'serif',
+    'sans-serif': 'sans-serif',
+    'monospace': 'monospace',
+    'cursive': 'cursive',
+    'fantasy': 'fantasy',
+    'dancing script': "'Dancing Script'",
+    'playfair display': "'Playfair Display'",
+    'inter': "'Inter'",
+}
+
+def _escape(value):
+    return html.escape(str(value))
+
+def _css_number(value, default=0):
+    """Angka CSS dari value, atau default jika bukan angka"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = float(default)
+    if not math.isfinite(number):
+        number = float(default)
+    return str(int(number)) if number.is_integer() else repr(number)
+
+def _css_color(value, default='#000000'):
+    """Warna hex atau nama warna, atau default"""
+    return value if isinstance(value, str) and _CSS_COLOR.fullmatch(value) else default
+
+def _css_font_family(value, default='sans-serif'):
+    """Daftar font dari value yang ada di CSS_FONT_FAMILIES, atau default"""
+    families = [CSS_FONT_FAMILIES.get(family.strip().strip('"\'').lower())
+                for family in str(value or '').split(',')]
+    families = [family for family in families if family]
+    return html.escape(', '.join(families) if families else default)
+
+def _write_inline_image(f, src):
+    # src ditulis terpisah supaya data URL besar tidak disalin ke string baru
+    f.write('<img src="')
+    f.write(_escape(src))
+    f.write('" alt="Photo">')
+
+def write_page(f, page, page_number, resolve_src=None, write_image=None):
+    """
+    Menulis markup satu halaman scrapbook ke file object
+
+    Args:
+        f: File object teks
+        page: Dictionary halaman
+        page_number: Nomor halaman yang ditampilkan
+        resolve_src: Fungsi src -> URL gambar (mis. referensi blob -> data URL)
+        write_image: Fungsi write_image(f, photo) yang menulis tag <img>
+                     (default: src inline lewat resolve_src)
+    """
+    f.write(_page_open(page_number))
+
+    for photo in page.get('photos', []):
+        f.write(_photo_open(_css_number(photo.get('x', 0)), _css_number(photo.get('y', 0)),
+                            _css_number(photo.get('width', 0)), _css_number(photo.get('height', 0)),
+                            _css_number(photo.get('rotation', 0))))
+        if write_image:
+            write_image(f, photo)
+        else:
+            _write_inline_image(f, resolve_src(photo['src']) if resolve_src else photo['src'])
+        f.write(PHOTO_CLOSE)
+
+    for text in page.get('texts', []):
+        f.write(_text(_css_number(text.get('x', 0)), _css_number(text.get('y', 0)),
+                      _css_number(text.get('fontSize', 16), 16), _css_color(text.get('color', '#000000')),
+                      _css_font_family(text.get('fontFamily', 'sans-serif')), _escape(text.get('content', ''))))
+
+    for sticker in page.get('stickers', []):
+        f.write(_sticker(_css_number(sticker.get('x', 0)), _css_number(sticker.get('y', 0)),
+                         _css_number(sticker.get('size', 32), 32), _escape(sticker.get('emoji', ''))))
+
+    f.write(PAGE_CLOSE)
+
+def write_html(f, scrapbook_data, resolve_src=None):
+    """
+    Menulis scrapbook sebagai HTML standalone, halaman demi halaman
+
+    Setiap halaman langsung ditulis ke file; dengan 'pages' berupa iterator
+    (mis. dari iter_pages()) yang ada di memori hanya satu halaman dan satu
+    foto pada satu waktu. Semua teks dari data di-escape.
+
+    Args:
+        f: File object teks
+        scrapbook_data: Dictionary berisi data scrapbook
+        resolve_src: Fungsi src -> URL gambar (optional)
+
+    Returns:
+        Jumlah halaman yang ditulis
+    """
+    title = _escape(scrapbook_data.get('title', 'My Digital Scrapbook'))
+    f.write(_document_head(title=title, stylesheet=STYLESHEET,
+                           created_date=datetime.now().strftime('%d %B %Y')))
+
+    page_count = 0
+    for page_count, page in enumerate(scrapbook_data.get('pages', []), 1):
+        write_page(f, page, page_count, resolve_src)
+
+    f.write(DOCUMENT_FOOT)
+    return page_count
+
+# Ekspor multi-file: lebar varian gambar (px) untuk srcset
+SITE_IMAGE_WIDTHS = (480, 1200)
+SITE_IMAGE_QUALITY = 85
+IMAGE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+    'image/svg+xml': '.svg',
+}
+
+SITE_STYLESHEET = STYLESHEET + """
+        .page-nav {
+            display: flex;
+            justify-content: space-between;
+            margin-bottom: 1rem;
+        }
+        .page-nav a {
+            color: #92400e;
+        }
+        .page-list {
+            background: white;
+            border-radius: 0.75rem;
+            padding: 1rem 2rem;
+        }
+"""
+
+_site_head = """<!DOCTYPE html>
+<html lang="id">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>📖 {title}</title>
+    <link rel="stylesheet" href="style.css">
+</head>
+<body>
+    <div class="container">
+""".format
+_site_nav = '<nav class="page-nav">{} <a href="index.html">Daftar Isi</a> {}</nav>\n'.format
+_site_prev = '<a href="{}" rel="prev">← Sebelumnya</a>'.format
+_site_next = '<a href="{}" rel="next">Berikutnya →</a>'.format
+NAV_PLACEHOLDER = '<span></span>'
+_site_index_header = """        <div class="header">
+            <h1 class="title">📖 {title}</h1>
+            <p>Dibuat pada: {created_date}</p>
+        </div>
+        <ol class="page-list">
+""".format
+_site_index_entry = '            <li><a href="{}">Halaman {}</a></li>\n'.format
+SITE_INDEX_FOOT = """        </ol>
+""" + DOCUMENT_FOOT
+_site_image = '<img src="{}" srcset="{}" sizes="{}px" loading="lazy" decoding="async" alt="Photo">'.format
+_site_image_plain = '<img src="{}" loading="lazy" decoding="async" alt="Photo">'.format
+
+def site_page_filename(page_number):
+    return f"page-{page_number:04d}.html"
+
+def split_data_url(src):
+    """
+    Memecah data URL base64
+
+    Returns:
+        Tuple (mime_type, bytes), atau None jika src bukan data URL base64
+    """
+    if not isinstance(src, str) or not src.startswith('data:'):
+        return None
+    header, _, payload = src.partition(',')
+    if not header.endswith(';base64'):
+        return None
+    return header[len('data:'):-len(';base64')], base64.b64decode(payload)
+
+class _ByteCounter:
+    """File object palsu yang hanya menghitung byte UTF-8 yang ditulis"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text):
+        self.size += len(text) if text.isascii() else len(text.encode('utf-8'))
+
+class SiteImages:
+    """
+    Menulis gambar ekspor multi-file ke direktori images/
+
+    Setiap isi gambar ditulis sekali (nama file dari hash isinya), beserta
+    varian yang lebih kecil untuk srcset. Varian diambil dari DerivativeStore
+    jika ada, atau dibuat sendiri dari satu decode.
+    """
+
+    def __init__(self, directory, widths=SITE_IMAGE_WIDTHS, quality=SITE_IMAGE_QUALITY,
+                 derivatives=None):
+        self.directory = directory
+        self.widths = sorted(widths, reverse=True)
+        self.quality = quality
+        self.derivatives = derivatives
+        self.bytes = 0
+        self.files = 0
+        self._written = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            atomic_write(path, data, fsync=False)
+        self.bytes += len(data)
+        self.files += 1
+        return f"{os.path.basename(self.directory)}/{name}"
+
+    def add(self, data, mime_type):
+        """
+        Menulis gambar (sekali per isi) dan variannya
+
+        Returns:
+            Tuple (src, list of (url, lebar)); list kosong jika tanpa varian
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        written = self._written.get(digest)
+        if written is not None:
+            return written
+
+        src = self._write(digest + IMAGE_EXTENSIONS.get(mime_type, '.img'), data)
+        if self.derivatives:
+            written = self._written[digest] = (src, self._derivative_candidates(digest, data, src))
+            return written
+
+        candidates = []
+        try:
+            with Image.open(io.BytesIO(data)) as header:
+                width, height = header.size
+        except Exception:
+            # Format yang tidak bisa dibuka PIL (mis. SVG) ditulis apa adanya
+            width = None
+
+        widths = [w for w in self.widths if width and w < width]
+        if widths:
+            # Decode sekali pada varian terbesar, varian lain dari hasilnya
+            image = load_image(data, (widths[0], max(1, round(height * widths[0] / width))))
+            for variant_width in widths:
+                variant_size = (variant_width, max(1, round(height * variant_width / width)))
+                if image.size != variant_size:
+                    image = image.resize(variant_size, Image.Resampling.LANCZOS)
+                url = self._write(f"{digest}-{variant_width}.jpg", encode_image(image, 'JPEG', self.quality))
+                candidates.append((url, variant_width))
+            candidates.reverse()
+            candidates.append((src, width))
+
+        written = self._written[digest] = (src, candidates)
+        return written
+
+    def _derivative_candidates(self, digest, data, src):
+        """Varian srcset dari tangga derivatif (satu format, format pertama store)"""
+        manifest = self.derivatives.generate(data)
+        image_format = self.derivatives.formats[0]
+        candidates = []
+        for variant in manifest['variants']:
+            if variant['format'] != image_format:
+                continue
+            name = f"{digest}-{variant['width']}{os.path.splitext(variant['file'])[1]}"
+            candidates.append((self._write(name, self.derivatives.read(manifest, variant)),
+                               variant['width']))
+        if candidates:
+            candidates.sort(key=lambda candidate: candidate[1])
+            candidates.append((src, manifest['width']))
+        return candidates
+
+def write_html_site(scrapbook_data, output_dir, image_data=None, widths=SITE_IMAGE_WIDTHS,
+                    quality=SITE_IMAGE_QUALITY, derivatives=None):
+    """
+    Menulis scrapbook sebagai situs HTML multi-file
+
+    Setiap halaman menjadi file sendiri dengan link sebelumnya / berikutnya,
+    index.html berisi daftar halaman, dan foto disimpan sebagai file di
+    images/ (dengan varian srcset dan loading="lazy") alih-alih di-inline.
+    Browser cukup mengunduh halaman yang dibuka dan foto yang terlihat.
+
+    Args:
+        scrapbook_data: Dictionary berisi data scrapbook ('pages' boleh
+                        berupa iterator)
+        output_dir: Direktori output
+        image_data: Fungsi src -> (mime_type, bytes) atau None (default:
+                    split_data_url); src lain (mis. URL) dipakai apa adanya
+        widths: Lebar varian gambar (px)
+        quality: Kualitas JPEG varian
+        derivatives: image_derivatives.DerivativeStore; jika diisi varian
+                     diambil dari tangga derivatifnya (widths diabaikan)
+
+    Returns:
+        Dictionary laporan: pages, html_bytes, image_bytes, image_files,
+        total_bytes, dan inline_bytes (ukuran ekspor satu file inline)
+    """
+    image_data = image_data or split_data_url
+    os.makedirs(output_dir, exist_ok=True)
+    images = SiteImages(os.path.join(output_dir, 'images'), widths, quality, derivatives)
+    title = _escape(scrapbook_data.get('title', 'My Digital Scrapbook'))
+    created_date = datetime.now().strftime('%d %B %Y')
+
+    # Ukuran versi inline dihitung tanpa meng-encode base64: panjangnya
+    # sudah diketahui dari jumlah byte gambar
+    inline = _ByteCounter()
+    inline.write(_document_head(title=title, stylesheet=STYLESHEET, created_date=created_date))
+
+    def write_site_image(f, photo):
+        source = image_data(photo['src'])
+        if source is None:
+            src = _escape(photo['src'])
+            f.write(_site_image_plain(src))
+            inline.write(f'<img src="{src}" alt="Photo">')
+            return
+        mime_type, data = source
+        src, candidates = images.add(data, mime_type)
+        if candidates:
+            # src cadangan: varian terkecil yang masih selebar tampilan foto
+            display_width = photo.get('width', 0)
+            src = next((url for url, width in candidates if width >= display_width), src)
+            srcset = ', '.join(f"{url} {width}w" for url, width in candidates)
+            f.write(_site_image(src, srcset, _escape(display_width)))
+        else:
+            f.write(_site_image_plain(src))
+        inline.size += (len(f'<img src="data:{mime_type};base64,') + 4 * ((len(data) + 2) // 3)
+                        + len('" alt="Photo">'))
+
+    def write_inline_image(f, photo):
+        """Sudah dihitung oleh write_site_image()"""
+
+    html_bytes = 0
+
+    def write_site_page(page, page_number, has_next):
+        nonlocal html_bytes
+        path = os.path.join(output_dir, site_page_filename(page_number))
+        with atomic_open(path, 'w', fsync=False) as f:
+            f.write(_site_head(title=f"{title} - Halaman {page_number}"))
+            nav = _site_nav(
+                _site_prev(site_page_filename(page_number - 1)) if page_number > 1 else NAV_PLACEHOLDER,
+                _site_next(site_page_filename(page_number + 1)) if has_next else NAV_PLACEHOLDER,
+            )
+            f.write(nav)
+            write_page(f, page, page_number, write_image=write_site_image)
+            f.write(nav)
+            f.write(DOCUMENT_FOOT)
+        html_bytes += os.path.getsize(path)
+        write_page(inline, page, page_number, write_image=write_inline_image)
+
+    # Satu halaman ditahan sampai halaman berikutnya terbaca, supaya link
+    # "berikutnya" hanya ada jika halamannya memang ada
+    page_count = 0
+    previous = None
+    for page_count, page in enumerate(scrapbook_data.get('pages', []), 1):
+        if previous is not None:
+            write_site_page(previous, page_count - 1, True)
+        previous = page
+    if previous is not None:
+        write_site_page(previous, page_count, False)
+    inline.write(DOCUMENT_FOOT)
+
+    for name, content in (('style.css', SITE_STYLESHEET.lstrip('\n')), ('index.html', None)):
+        path = os.path.join(output_dir, name)
+        with atomic_open(path, 'w', fsync=False) as f:
+            if content is not None:
+                f.write(content)
+            else:
+                f.write(_site_head(title=title))
+                f.write(_site_index_header(title=title, created_date=created_date))
+                for page_number in range(1, page_count + 1):
+                    f.write(_site_index_entry(site_page_filename(page_number), page_number))
+                f.write(SITE_INDEX_FOOT)
+        html_bytes += os.path.getsize(path)
+
+    return {
+        'pages': page_count,
+        'html_bytes': html_bytes,
+        'image_bytes': images.bytes,
+        'image_files': images.files,
+        'total_bytes': html_bytes + images.bytes,
+        'inline_bytes': inline.size,
+    }
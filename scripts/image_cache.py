@@ -0,0 +1,231 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+class ImageCache:
+    """
+    Cache hasil olahan gambar (bytes) di memori dan opsional di disk
+
+    Key dibuat dari hash isi sumber gambar ditambah parameter olahan
+    (effect plan, ukuran, format), jadi gambar yang sama dengan efek yang
+    sama tidak perlu di-decode dan di-encode ulang. Kedua tingkat cache
+    dibatasi ukurannya dan membuang entri yang paling lama tidak dipakai.
+    """
+
+    def __init__(self, memory_limit=64 * 1024 * 1024, directory=None, disk_limit=512 * 1024 * 1024):
+        self.memory_limit = memory_limit
+        self.directory = directory
+        self.disk_limit = disk_limit
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        self._lock = threading.Lock()
+
+        if directory:
+            self._scan_directory()
+
+    @staticmethod
+    def make_key(source, *parts):
+        """
+        Membuat cache key dari isi sumber gambar dan parameter olahan
+
+        Args:
+            source: Data URL / string base64, bytes, atau path file
+            *parts: Parameter tambahan (plan key, ukuran, format, ...)
+
+        Returns:
+            Hex digest SHA-256
+        """
+        digest = hashlib.sha256()
+        if isinstance(source, (bytes, bytearray)):
+            digest.update(source)
+        elif isinstance(source, str) and (source.startswith('data:') or not os.path.isfile(source)):
+            digest.update(source.encode())
+        else:
+            with open(source, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        digest.update(repr(parts).encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _scan_directory(self):
+        """Membaca entri disk yang sudah ada, urut dari yang paling lama dipakai"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+
+    def get(self, key):
+        """
+        Mengambil data dari cache
+
+        Returns:
+            bytes, atau None jika tidak ada
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+
+            if self.directory and key in self._disk:
+                try:
+                    with open(self._path(key), 'rb') as f:
+                        data = f.read()
+                    os.utime(self._path(key))
+                except OSError:
+                    self._disk_size -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._put_memory(key, data)
+                    return data
+
+            self.misses += 1
+            return None
+
+    def put(self, key, data):
+        """Menyimpan data ke cache memori (dan disk jika diaktifkan)"""
+        data = bytes(data)
+        with self._lock:
+            self._put_memory(key, data)
+
+            if self.directory and key not in self._disk and len(data) <= self.disk_limit:
+                path = self._path(key)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                self._disk[key] = len(data)
+                self._disk_size += len(data)
+                self._evict_disk()
+
+    def _put_memory(self, key, data):
+        if len(data) > self.memory_limit:
+            return
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self.evictions += 1
+
+    def _evict_disk(self):
+        while self._disk_size > self.disk_limit:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get_or_create(self, key, create):
+        """
+        Mengambil data dari cache, atau membuatnya dengan create() lalu disimpan
+
+        Args:
+            key: Cache key dari make_key()
+            create: Fungsi tanpa argumen yang mengembalikan bytes
+
+        Returns:
+            bytes
+        """
+        data = self.get(key)
+        if data is None:
+            data = create()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        """Mengosongkan cache memori dan disk"""
+        with self._lock:
+            for key in list(self._disk):
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._memory.clear()
+            self._disk.clear()
+            self._memory_size = 0
+            self._disk_size = 0
+
+    def stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            Dictionary berisi hit/miss, jumlah entri dan ukuran
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'memory_entries': len(self._memory),
+            'memory_bytes': self._memory_size,
+            'disk_entries': len(self._disk),
+            'disk_bytes': self._disk_size,
+        }
+
+_default_cache = ImageCache()
+
+def get_default_cache():
+    """Cache bersama yang dipakai fungsi gambar jika cache tidak diberikan"""
+    return _default_cache
+
+def configure_default_cache(memory_limit=64 * 1024 * 1024, directory=None, disk_limit=512 * 1024 * 1024):
+    """
+    Mengganti cache bersama, misalnya untuk mengaktifkan cache disk
+
+    Returns:
+        ImageCache baru
+    """
+    global _default_cache
+    _default_cache = ImageCache(memory_limit, directory, disk_limit)
+    return _default_cache
+
+def resolve_cache(cache):
+    """None -> cache bersama, False -> tanpa cache, selain itu apa adanya"""
+    if cache is None:
+        return _default_cache
+    return cache or None
+
+# Example usage
+if __name__ == "__main__":
+    print("🗃️ Scrapbook Image Cache")
+    print("=" * 40)
+
+    cache = ImageCache(memory_limit=1024)
+    key = ImageCache.make_key(b'photo-bytes', 'plan', (400, 300), 'JPEG')
+    cache.get_or_create(key, lambda: b'processed')
+    cache.get_or_create(key, lambda: b'processed')
+    print(f"Stats: {cache.stats()}")
+
+    print("\nAvailable functions:")
+    print("  - ImageCache(memory_limit, directory, disk_limit)")
+    print("  - get_default_cache() / configure_default_cache(...)")
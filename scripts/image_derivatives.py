@@ -0,0 +1,147 @@
+import hashlib
+import io
+import json
+import os
+
+from PIL import Image, features
+
+from atomic_write import atomic_write
+from image_processor import encode_image, load_image
+
+# Tangga ukuran derivatif (lebar, px) dan formatnya
+DERIVATIVE_WIDTHS = (160, 480, 1200)
+DERIVATIVE_FORMATS = ('WEBP', 'JPEG') if features.check('webp') else ('JPEG',)
+DERIVATIVE_QUALITY = 82
+FORMAT_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'WEBP': '.webp',
+}
+MANIFEST_NAME = 'manifest.json'
+
+def source_digest(data):
+    """Digest gambar asli (SHA-256, sama dengan nama blob di BlobStore)"""
+    return hashlib.sha256(data).hexdigest()
+
+def choose_variant(manifest, width, height=None, formats=None):
+    """
+    Varian terkecil yang setidaknya width x height piksel
+
+    Args:
+        manifest: Manifest dari DerivativeStore
+        width: Lebar minimum (piksel)
+        height: Tinggi minimum (optional)
+        formats: Format yang boleh dipakai (default: semua)
+
+    Returns:
+        Dictionary varian, atau None jika tidak ada yang cukup besar
+        (pakai gambar asli)
+    """
+    candidates = [
+        variant for variant in manifest['variants']
+        if (formats is None or variant['format'] in formats)
+        and variant['width'] >= width and (height is None or variant['height'] >= height)
+    ]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda variant: (variant['width'], variant['bytes']))
+
+class DerivativeStore:
+    """
+    Penyimpanan derivatif (ukuran kecil) foto
+
+    generate() membuat seluruh tangga ukuran x format dari satu decode dan
+    menyimpannya di <directory>/<digest[:2]>/<digest>/ beserta manifest.json.
+    Exporter memilih varian terkecil yang cukup lewat choose_variant(),
+    jadi tidak ada lagi yang perlu me-resize foto asli sendiri.
+    """
+
+    def __init__(self, directory, widths=DERIVATIVE_WIDTHS, formats=DERIVATIVE_FORMATS,
+                 quality=DERIVATIVE_QUALITY):
+        """
+        Args:
+            directory: Direktori cache derivatif
+            widths: Lebar varian (px); hanya yang lebih kecil dari aslinya dibuat
+            formats: Format varian ('JPEG', 'WEBP')
+            quality: Kualitas encode
+        """
+        self.directory = directory
+        self.widths = tuple(sorted(widths, reverse=True))
+        self.formats = tuple(formats)
+        self.quality = quality
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest, name=MANIFEST_NAME):
+        return os.path.join(self.directory, digest[:2], digest, name)
+
+    def manifest(self, digest):
+        """Manifest derivatif sebuah gambar, atau None jika belum dibuat"""
+        try:
+            with open(self._path(digest), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def path(self, manifest, variant):
+        """Path file sebuah varian"""
+        return self._path(manifest['source'], variant['file'])
+
+    def read(self, manifest, variant):
+        """Bytes file sebuah varian"""
+        with open(self.path(manifest, variant), 'rb') as f:
+            return f.read()
+
+    def generate(self, data, digest=None):
+        """
+        Membuat derivatif sebuah gambar (dilewati jika manifest-nya sudah ada)
+
+        Gambar di-decode sekali pada varian terbesar; varian yang lebih kecil
+        di-resize dari varian sebelumnya, lalu setiap ukuran di-encode ke
+        semua format. Manifest ditulis terakhir, jadi derivatif yang
+        setengah jadi tidak pernah dipakai.
+
+        Args:
+            data: Bytes gambar asli
+            digest: source_digest(data) jika sudah diketahui
+
+        Returns:
+            Dictionary manifest: source, width, height, format, variants
+            (list of {width, height, format, file, bytes})
+        """
+        digest = digest or source_digest(data)
+        manifest = self.manifest(digest)
+        if manifest is not None:
+            return manifest
+
+        manifest = {'source': digest, 'width': None, 'height': None, 'format': None, 'variants': []}
+        try:
+            with Image.open(io.BytesIO(data)) as header:
+                width, height = header.size
+                manifest.update(width=width, height=height, format=header.format)
+        except Exception:
+            # Bukan gambar raster (mis. SVG): tanpa derivatif
+            width = None
+
+        widths = [w for w in self.widths if width and w < width]
+        if widths:
+            image = None
+            for variant_width in widths:
+                size = (variant_width, max(1, round(height * variant_width / width)))
+                if image is None:
+                    image = load_image(data, size)
+                if image.size != size:
+                    image = image.resize(size, Image.Resampling.LANCZOS)
+                for image_format in self.formats:
+                    name = f"{variant_width}{FORMAT_EXTENSIONS[image_format]}"
+                    encoded = encode_image(image, image_format, self.quality)
+                    os.makedirs(os.path.dirname(self._path(digest, name)), exist_ok=True)
+                    # Derivatif bisa dibuat ulang, jadi tidak perlu fsync
+                    atomic_write(self._path(digest, name), encoded, fsync=False)
+                    manifest['variants'].append({
+                        'width': size[0], 'height': size[1], 'format': image_format,
+                        'file': name, 'bytes': len(encoded),
+                    })
+            manifest['variants'].reverse()
+
+        os.makedirs(os.path.dirname(self._path(digest)), exist_ok=True)
+        atomic_write(self._path(digest), json.dumps(manifest, indent=2), fsync=False)
+        return manifest
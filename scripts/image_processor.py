@@ -1,101 +1,540 @@
 from PIL import Image, ImageFilter, ImageEnhance, ImageDraw, ImageFont
 import io
+import os
 import base64
 import json
 import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 
-def process_scrapbook_image(image_data, effects=None):
+from image_cache import resolve_cache
+
+# Sepia formula sebagai matrix 3x4 (R, G, B, offset) untuk Image.convert.
+# Pillow menambahkan 0.5 lalu memotong dan meng-clamp ke 0..255, jadi offset
+# -0.5 meniru int() + min(255, ...) dari formula per-piksel yang lama
+# (selisih maksimal 1 pada sebagian kecil piksel karena presisi float32).
+SEPIA_MATRIX = (
+    0.393, 0.769, 0.189, -0.5,
+    0.349, 0.686, 0.168, -0.5,
+    0.272, 0.534, 0.131, -0.5,
+)
+
+def apply_sepia(image):
     """
-    Memproses gambar untuk scrapbook dengan berbagai efek
+    Menerapkan tone sepia ke seluruh gambar dalam satu operasi
     
     Args:
-        image_data: Base64 encoded image data atau path file
-        effects: Dictionary berisi efek yang ingin diterapkan
+        image: PIL Image dengan mode RGB
     
     Returns:
-        Processed image as base64 string
+        PIL Image baru dengan tone sepia
     """
+    return image.convert('RGB', SEPIA_MATRIX)
+
+# Bobot luminance yang dipakai Pillow saat konversi RGB -> L
+LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+
+# Saturasi yang dipakai efek vintage sebelum tone sepia
+VINTAGE_SATURATION = 0.7
+
+# Ukuran bingkai polaroid (kiri/kanan, atas, bawah) dalam piksel
+POLAROID_FRAME = (40, 40, 80)
+
+EffectStep = namedtuple('EffectStep', ['name', 'params'])
+
+def _matmul3(a, b):
+    """Perkalian dua matrix 3x3 yang disimpan sebagai tuple baris"""
+    return tuple(
+        tuple(sum(a[i][k] * b[k][j] for k in range(3)) for j in range(3))
+        for i in range(3)
+    )
+
+def _saturation_matrix(factor):
+    """Matrix 3x3 yang setara dengan ImageEnhance.Color(factor)"""
+    return tuple(
+        tuple(
+            (1 - factor) * LUMA_WEIGHTS[j] + (factor if i == j else 0.0)
+            for j in range(3)
+        )
+        for i in range(3)
+    )
+
+def _tone_value(value, brightness, contrast, mean):
+    """Nilai satu kanal setelah brightness lalu contrast (meniru Image.blend)"""
+    value = min(255, max(0, int(value * brightness)))
+    if contrast != 1.0:
+        value = min(255, max(0, int(mean + contrast * (value - mean))))
+    return value
+
+class EffectPlan:
+    """
+    Rencana efek yang sudah dikompilasi dari dictionary effects
+
+    Operasi titik yang bersebelahan digabung: saturasi + sepia menjadi satu
+    pass color matrix, brightness + contrast menjadi satu pass lookup table.
+    Blur dan bingkai polaroid hanya muncul di plan jika memang diminta.
+    Plan tidak menyimpan state per gambar, jadi bisa dipakai ulang untuk
+    banyak gambar sekaligus.
+    """
+
+    def __init__(self, steps):
+        self.steps = tuple(steps)
+
+    @property
+    def key(self):
+        """Representasi stabil dari plan, cocok untuk cache key"""
+        return repr(self.steps)
+
+    def describe(self):
+        """
+        Daftar langkah plan dalam bentuk yang mudah dibaca
+
+        Returns:
+            List of strings, satu per langkah
+        """
+        return [
+            f"{step.name}({', '.join(f'{k}={v}' for k, v in step.params if k != 'matrix')})"
+            for step in self.steps
+        ]
+
+    def apply(self, image):
+        """
+        Menerapkan seluruh langkah plan ke gambar RGB
+
+        Args:
+            image: PIL Image dengan mode RGB
+
+        Returns:
+            PIL Image hasil
+        """
+        for step in self.steps:
+            params = dict(step.params)
+
+            if step.name == 'color_matrix':
+                image = image.convert('RGB', params['matrix'])
+
+            elif step.name == 'blur':
+                image = image.filter(ImageFilter.GaussianBlur(radius=params['radius']))
+
+            elif step.name == 'tone':
+                brightness = params['brightness']
+                contrast = params['contrast']
+                mean = 0
+                if contrast != 1.0:
+                    # Mean luminance setelah brightness, dihitung dari histogram
+                    # per kanal tanpa membuat gambar perantara
+                    histogram = image.histogram()
+                    pixel_count = image.width * image.height
+                    luma = 0.0
+                    for channel, weight in enumerate(LUMA_WEIGHTS):
+                        counts = histogram[channel * 256:(channel + 1) * 256]
+                        total = sum(
+                            count * min(255, int(value * brightness))
+                            for value, count in enumerate(counts) if count
+                        )
+                        luma += weight * total / pixel_count
+                    mean = int(luma + 0.5)
+
+                table = [_tone_value(v, brightness, contrast, mean) for v in range(256)]
+                image = image.point(table * 3)
+
+            elif step.name == 'polaroid_frame':
+                side, top, bottom = params['size']
+                framed = Image.new('RGB', (image.width + 2 * side, image.height + top + bottom), 'white')
+                framed.paste(image, (side, top))
+                image = framed
+
+        return image
+
+    def __bool__(self):
+        return bool(self.steps)
+
+    def __repr__(self):
+        return f"EffectPlan({' -> '.join(self.describe()) or 'identity'})"
+
+def compile_effects(effects=None):
+    """
+    Mengompilasi dictionary effects menjadi EffectPlan yang berurutan
+
+    Args:
+        effects: Dictionary berisi efek ('vintage', 'saturation', 'blur',
+                 'brightness', 'contrast', 'polaroid_frame')
+
+    Returns:
+        EffectPlan
+    """
+    if isinstance(effects, EffectPlan):
+        return effects
     if effects is None:
         effects = {}
+
+    steps = []
+
+    # Saturasi + sepia -> satu color matrix
+    saturation = effects.get('saturation', 1.0)
+    if effects.get('vintage', False):
+        saturation *= VINTAGE_SATURATION
+
+    matrix = None
+    offsets = (-0.5, -0.5, -0.5)
+    if saturation != 1.0:
+        matrix = _saturation_matrix(saturation)
+    if effects.get('vintage', False):
+        sepia = tuple(tuple(SEPIA_MATRIX[row * 4:row * 4 + 3]) for row in range(3))
+        if matrix:
+            # Pipeline bertahap memotong hasil saturasi ke integer sebelum
+            # sepia (rata-rata -0.5 per kanal); kompensasi bias tersebut
+            offsets = tuple(-0.5 - 0.5 * sum(row) for row in sepia)
+            matrix = _matmul3(sepia, matrix)
+        else:
+            matrix = sepia
+
+    if matrix:
+        flat = tuple(value for row, offset in zip(matrix, offsets) for value in row + (offset,))
+        steps.append(EffectStep('color_matrix', (
+            ('saturation', saturation),
+            ('sepia', effects.get('vintage', False)),
+            ('matrix', flat),
+        )))
+
+    if effects.get('blur', 0) > 0:
+        steps.append(EffectStep('blur', (('radius', effects['blur']),)))
+
+    # Brightness + contrast -> satu lookup table
+    brightness = effects.get('brightness', 1.0)
+    contrast = effects.get('contrast', 1.0)
+    if brightness != 1.0 or contrast != 1.0:
+        steps.append(EffectStep('tone', (('brightness', brightness), ('contrast', contrast))))
+
+    # Bingkai paling akhir supaya operasi lain tidak memproses area bingkai
+    if effects.get('polaroid_frame', False):
+        steps.append(EffectStep('polaroid_frame', (('size', POLAROID_FRAME),)))
+
+    return EffectPlan(steps)
+
+def _fit_size(size, target_size):
+    """Ukuran terbesar yang muat di dalam target_size dengan rasio asli"""
+    width, height = size
+    scale = min(target_size[0] / width, target_size[1] / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def load_image(image_data, target_size=None):
+    """
+    Membuka gambar sebagai RGB, opsional langsung diperkecil saat decode
     
-    try:
-        # Handle base64 atau file path
-        if isinstance(image_data, str) and image_data.startswith('data:'):
-            # Base64 image
-            image_bytes = base64.b64decode(image_data.split(',')[1])
-            image = Image.open(io.BytesIO(image_bytes))
+    Jika target_size diberikan, JPEG di-decode dengan draft() pada skala DCT
+    terkecil yang masih cukup, format lain diperkecil dengan reduce(), lalu
+    hasilnya di-resize agar muat di dalam target_size (tidak pernah diperbesar).
+    
+    Args:
+        image_data: Base64 data URL, bytes, path file, atau ScrapbookImage
+        target_size: Tuple (width, height) maksimum (optional)
+    
+    Returns:
+        PIL Image RGB
+    """
+    if isinstance(image_data, ScrapbookImage):
+        return image_data.load(target_size)
+    
+    # Handle base64, bytes atau file path
+    if isinstance(image_data, str) and image_data.startswith('data:'):
+        # Base64 image
+        image_bytes = base64.b64decode(image_data.split(',')[1])
+        image = Image.open(io.BytesIO(image_bytes))
+    elif isinstance(image_data, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image_data))
+    else:
+        # File path
+        image = Image.open(image_data)
+    
+    fitted = _fit_size(image.size, target_size) if target_size else image.size
+    if fitted != image.size and image.format == 'JPEG':
+        # Decoder JPEG langsung menghasilkan skala 1/2, 1/4 atau 1/8
+        image.draft('RGB', fitted)
+    
+    # Convert to RGB if necessary
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    if fitted != image.size:
+        # Pengecilan kelipatan bulat yang murah dulu, sisanya LANCZOS
+        factor = min(image.width // fitted[0], image.height // fitted[1])
+        if factor > 1:
+            image = image.reduce(factor)
+        image = image.resize(fitted, Image.Resampling.LANCZOS)
+    
+    return image
+
+def encode_image(image, format='JPEG', quality=90):
+    """
+    Meng-encode PIL Image sebagai bytes dengan format tertentu
+    
+    Dipakai juga oleh exporter (HTML, derivatif) agar semua modul
+    meng-encode gambar dengan cara yang sama.
+    
+    Args:
+        image: PIL Image
+        format: Format Pillow ('JPEG', 'WEBP', 'PNG', ...)
+        quality: Kualitas encode untuk JPEG dan WEBP (WEBP tanpa quality
+                 memakai default Pillow 80); format lain mengabaikannya
+    
+    Returns:
+        bytes gambar
+    """
+    buffer = io.BytesIO()
+    if format in ('JPEG', 'WEBP'):
+        image.save(buffer, format=format, quality=quality)
+    else:
+        image.save(buffer, format=format)
+    return buffer.getvalue()
+
+def _encode_jpeg(image, quality=90):
+    """Meng-encode PIL Image sebagai bytes JPEG"""
+    return encode_image(image, 'JPEG', quality)
+
+def _bytes_to_data_url(data, mime_type='image/jpeg'):
+    """Membungkus bytes gambar sebagai data URL base64"""
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+
+def _to_data_url(image, quality=90):
+    """Meng-encode PIL Image sebagai data URL JPEG"""
+    return _bytes_to_data_url(_encode_jpeg(image, quality))
+
+# Format yang boleh diteruskan apa adanya ke data URL
+MIME_TYPES = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'GIF': 'image/gif',
+    'WEBP': 'image/webp',
+}
+
+class ScrapbookImage:
+    """
+    Handle gambar internal: PIL Image dan/atau bytes ter-encode beserta formatnya
+    
+    Fungsi gambar menerima dan mengembalikan handle ini, jadi rangkaian
+    olahan (mis. vintage -> border -> PDF) cukup decode sekali dan encode
+    sekali. Data URL hanya dibuat di batas luar lewat to_data_url().
+    """
+    
+    def __init__(self, image=None, data=None, format=None):
+        self._image = image
+        self.data = data
+        self.format = format
+    
+    @classmethod
+    def open(cls, source):
+        """
+        Membuat handle dari data URL, bytes atau path file tanpa decode piksel
+        
+        Args:
+            source: Base64 data URL, bytes, path file, atau ScrapbookImage
+        
+        Returns:
+            ScrapbookImage
+        """
+        if isinstance(source, cls):
+            return source
+        if isinstance(source, str) and source.startswith('data:'):
+            data = base64.b64decode(source.split(',')[1])
+        elif isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
         else:
-            # File path
-            image = Image.open(image_data)
+            with open(source, 'rb') as f:
+                data = f.read()
         
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        # Image.open hanya membaca header untuk format
+        with Image.open(io.BytesIO(data)) as header:
+            image_format = header.format
+        return cls(data=data, format=image_format)
+    
+    @property
+    def image(self):
+        """PIL Image RGB (di-decode saat pertama kali dibutuhkan)"""
+        if self._image is None:
+            self._image = load_image(self.data)
+        return self._image
+    
+    @property
+    def size(self):
+        if self._image is None:
+            with Image.open(io.BytesIO(self.data)) as header:
+                return header.size
+        return self._image.size
+    
+    def load(self, target_size=None):
+        """
+        PIL Image RGB yang muat di dalam target_size
+        
+        Handle yang belum di-decode memakai draft decode dari load_image().
+        """
+        if self._image is None:
+            if not target_size:
+                return self.image
+            return load_image(self.data, target_size)
+        
+        fitted = _fit_size(self._image.size, target_size) if target_size else self._image.size
+        if fitted == self._image.size:
+            return self._image
+        return self._image.resize(fitted, Image.Resampling.LANCZOS)
+    
+    def encode(self, format='JPEG', quality=90):
+        """
+        Bytes ter-encode; bytes asli dipakai ulang tanpa re-encode jika formatnya sama
+        
+        Returns:
+            bytes
+        """
+        if self.data is not None and self.format == format:
+            return self.data
+        return encode_image(self.image, format, quality)
+    
+    def to_data_url(self, format='JPEG', quality=90):
+        """Data URL base64 untuk batas luar (HTML, JSON, JavaScript)"""
+        if self.data is not None and self.format in MIME_TYPES:
+            format = self.format
+        return _bytes_to_data_url(self.encode(format, quality), MIME_TYPES.get(format, 'image/jpeg'))
+    
+    def __repr__(self):
+        state = 'decoded' if self._image is not None else 'encoded'
+        return f"ScrapbookImage({self.format or 'RGB'}, {state})"
+
+def json_default(value):
+    """
+    Serializer JSON (json.dump(..., default=json_default)) untuk ScrapbookImage
+    
+    Handle gambar diubah ke data URL di batas ekspor; tipe lain tetap
+    menghasilkan TypeError seperti biasa.
+    """
+    if isinstance(value, ScrapbookImage):
+        return value.to_data_url()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def process_scrapbook_image(image_data, effects=None, max_size=None, cache=None):
+    """
+    Memproses gambar untuk scrapbook dengan berbagai efek
+    
+    Args:
+        image_data: Base64 encoded image data, path file, atau ScrapbookImage
+        effects: Dictionary berisi efek yang ingin diterapkan, atau
+                 EffectPlan hasil compile_effects() untuk dipakai ulang
+        max_size: Tuple (width, height) maksimum; gambar diperkecil saat
+                  decode sebelum efek diterapkan (optional)
+        cache: ImageCache (default: cache bersama, False untuk menonaktifkan)
+    
+    Returns:
+        Processed image as base64 string, atau ScrapbookImage jika input
+        berupa ScrapbookImage (tanpa encode ulang)
+    """
+    try:
+        plan = compile_effects(effects)
+        as_handle = isinstance(image_data, ScrapbookImage)
+        
+        # Handle tidak di-cache: hasilnya tetap di memori sampai di-encode
+        # sekali di batas luar
+        cache = None if as_handle else resolve_cache(cache)
+        
+        key = None
+        if cache:
+            key = cache.make_key(image_data, 'process', plan.key, max_size, 'JPEG', 90)
+            cached = cache.get(key)
+            if cached is not None:
+                print("Image processing completed! (cached)")
+                return _bytes_to_data_url(cached)
+        
+        image = load_image(image_data, max_size)
         
         print(f"Processing image: {image.size}")
         
-        # Apply vintage effect
-        if effects.get('vintage', False):
-            print("Applying vintage effect...")
-            # Reduce saturation
-            enhancer = ImageEnhance.Color(image)
-            image = enhancer.enhance(0.7)
-            
-            # Add sepia tone
-            pixels = image.load()
-            for i in range(image.width):
-                for j in range(image.height):
-                    r, g, b = pixels[i, j]
-                    # Sepia formula
-                    tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                    tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                    tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                    
-                    pixels[i, j] = (min(255, tr), min(255, tg), min(255, tb))
-        
-        # Apply blur effect
-        if effects.get('blur', 0) > 0:
-            print(f"Applying blur: {effects['blur']}")
-            image = image.filter(ImageFilter.GaussianBlur(radius=effects['blur']))
-        
-        # Adjust brightness
-        if effects.get('brightness', 1.0) != 1.0:
-            print(f"Adjusting brightness: {effects['brightness']}")
-            enhancer = ImageEnhance.Brightness(image)
-            image = enhancer.enhance(effects['brightness'])
-        
-        # Adjust contrast
-        if effects.get('contrast', 1.0) != 1.0:
-            print(f"Adjusting contrast: {effects['contrast']}")
-            enhancer = ImageEnhance.Contrast(image)
-            image = enhancer.enhance(effects['contrast'])
-        
-        # Add polaroid frame
-        if effects.get('polaroid_frame', False):
-            print("Adding polaroid frame...")
-            frame_width = 40
-            frame_height_top = 40
-            frame_height_bottom = 80
-            
-            new_width = image.width + 2 * frame_width
-            new_height = image.height + frame_height_top + frame_height_bottom
-            
-            framed = Image.new('RGB', (new_width, new_height), 'white')
-            framed.paste(image, (frame_width, frame_height_top))
-            image = framed
+        if plan:
+            print(f"Applying effects: {' -> '.join(plan.describe())}")
+            image = plan.apply(image)
+        
+        if as_handle:
+            print("Image processing completed!")
+            return ScrapbookImage(image)
         
         # Convert back to base64
-        buffer = io.BytesIO()
-        image.save(buffer, format='JPEG', quality=90)
-        img_str = base64.b64encode(buffer.getvalue()).decode()
+        encoded = _encode_jpeg(image)
+        if cache:
+            cache.put(key, encoded)
         
         print("Image processing completed!")
-        return f"data:image/jpeg;base64,{img_str}"
+        return _bytes_to_data_url(encoded)
         
     except Exception as e:
         print(f"Error processing image: {e}")
         return None
 
+# Hasil satu item dari process_scrapbook_images: data berisi data URL jika
+# berhasil, error berisi pesan kesalahan jika gagal
+ImageResult = namedtuple('ImageResult', ['index', 'data', 'error'])
+
+def _process_batch_item(index, image_data, plan, max_size=None):
+    """Worker untuk process_scrapbook_images (dijalankan di proses lain)"""
+    try:
+        return ImageResult(index, _to_data_url(plan.apply(load_image(image_data, max_size))), None)
+    except Exception as e:
+        return ImageResult(index, None, f"{type(e).__name__}: {e}")
+
+def process_scrapbook_images(items, effects=None, workers=None, ordered=True, max_size=None):
+    """
+    Memproses banyak gambar sekaligus dengan efek yang sama di process pool
+    
+    Args:
+        items: Iterable berisi base64 image data atau path file
+        effects: Dictionary efek atau EffectPlan (dikompilasi sekali)
+        workers: Jumlah proses worker (default: jumlah CPU, 1 = tanpa pool)
+        ordered: True untuk hasil sesuai urutan input, False untuk hasil
+                 segera setelah selesai
+        max_size: Tuple (width, height) maksimum per gambar (optional)
+    
+    Yields:
+        ImageResult(index, data, error) untuk setiap item
+    """
+    plan = compile_effects(effects)
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1:
+        for index, image_data in enumerate(items):
+            yield _process_batch_item(index, image_data, plan, max_size)
+        return
+    
+    # Batasi jumlah item yang sedang diproses supaya ribuan foto tidak
+    # semuanya tertahan di memori sekaligus
+    max_pending = workers * 2
+    items = iter(enumerate(items))
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        
+        def submit_next():
+            for index, image_data in items:
+                future = executor.submit(_process_batch_item, index, image_data, plan, max_size)
+                pending[future] = index
+                return True
+            return False
+        
+        while len(pending) < max_pending and submit_next():
+            pass
+        
+        while pending:
+            if ordered:
+                future = next(iter(pending))
+                done = [future]
+                wait(done)
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    yield future.result()
+                except Exception as e:
+                    # Worker mati (mis. BrokenProcessPool) tetap dilaporkan per item
+                    yield ImageResult(index, None, f"{type(e).__name__}: {e}")
+                submit_next()
+
 def create_photo_collage(image_paths, layout='grid', output_size=(800, 600)):
     """
     Membuat kolase foto untuk scrapbook
@@ -218,8 +657,14 @@ if __name__ == "__main__":
     for effect, value in effects.items():
         print(f"  - {effect}: {value}")
     
+    print(f"\nCompiled plan: {compile_effects(effects)}")
+    
     print("\nAvailable functions:")
-    print("  - process_scrapbook_image(image_data, effects)")
+    print("  - compile_effects(effects)")
+    print("  - ScrapbookImage.open(source) / handle.to_data_url()")
+    print("  - load_image(image_data, target_size)")
+    print("  - process_scrapbook_image(image_data, effects, max_size)")
+    print("  - process_scrapbook_images(items, effects, workers)")
     print("  - create_photo_collage(image_paths, layout)")
     
     print("\nCollage layouts: grid, horizontal, vertical, random")
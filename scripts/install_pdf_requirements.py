@@ -29,7 +29,8 @@ def main():
     # Required packages for PDF generation
     packages = [
         "reportlab",
-        "Pillow"
+        "Pillow",
+        "pypdf"  # optional: create_parallel_pdf merges page chunks with it
     ]
     
     print("Checking and installing required packages...\n")
@@ -1,23 +1,172 @@
 from reportlab.lib.pagesizes import letter, A4, A3
-from reportlab.platypus import SimpleDocTemplate, Image, Spacer, Paragraph
+from reportlab.platypus import BaseDocTemplate, SimpleDocTemplate, Flowable, Image, Spacer, Paragraph
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import json
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
 import base64
+import hashlib
 import io
 from PIL import Image as PILImage
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import islice
+
+from image_processor import ScrapbookImage
+from image_cache import ImageCache, resolve_cache
+from blob_store import BlobStore, is_blob_ref, parse_blob_ref
+from image_derivatives import DerivativeStore, choose_variant
+from scrapbook_journal import iter_pages, read_header
+from pdf_stream import StreamingCanvas
+from atomic_write import atomic_open
+from export_progress import ExportCancelled, ProgressReporter
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    # Opsional: tanpa pypdf, mode paralel hanya memparalelkan persiapan gambar
+    PdfReader = PdfWriter = None
+
+# Ukuran halaman editor (px), lihat .scrapbook-page di style.css
+EDITOR_PAGE_SIZE = (600, 400)
+
+# Warna dasar halaman per tema (warna pertama gradien .theme-* di style.css)
+THEME_BACKGROUNDS = {
+    'vintage': '#f5e6d3',
+    'modern': '#ffffff',
+    'cute': '#ffe4e1',
+    'nature': '#f0f8e8',
+}
+DEFAULT_BACKGROUND = '#fef7ed'
+
+# fontFamily CSS -> font standar PDF (tidak perlu embed font)
+FONT_FAMILIES = {
+    'serif': 'Times-Roman',
+    'sans-serif': 'Helvetica',
+    'monospace': 'Courier',
+    'cursive': 'Times-Italic',
+    'dancing script': 'Times-Italic',
+}
+DEFAULT_FONT = 'Helvetica'
+PHOTO_BORDER = 4
+
+# Resolusi output gambar: layar / cetak
+SCREEN_DPI = 96
+PRINT_DPI = 300
+TEXT_PADDING = 4
+
+def _pdf_font(font_family):
+    """Font PDF standar untuk fontFamily CSS (mis. "'Dancing Script', cursive")"""
+    for family in (font_family or '').split(','):
+        font = FONT_FAMILIES.get(family.strip().strip('"\'').lower())
+        if font:
+            return font
+    return DEFAULT_FONT
+
+def _pdf_color(value, default=colors.black):
+    try:
+        return colors.HexColor(value) if value else default
+    except (ValueError, TypeError):
+        return default
+
+def image_form(pdf_canvas, image_data):
+    """
+    Nama form XObject berisi gambar, dibuat sekali per isi gambar per dokumen
+    
+    Gambar diidentifikasi dari hash bytes-nya, jadi foto atau background yang
+    sama di banyak halaman hanya di-embed (dan di-decode ReportLab) sekali;
+    pemakaian berikutnya cukup mereferensikan form-nya.
+    
+    Args:
+        pdf_canvas: reportlab Canvas
+        image_data: bytes gambar (mis. JPEG)
+    
+    Returns:
+        Nama form untuk canvas.doForm(); form berukuran 1x1 unit
+    """
+    name = f"img_{hashlib.sha1(image_data).hexdigest()}"
+    if not pdf_canvas.hasForm(name):
+        pdf_canvas.beginForm(name, 0, 0, 1, 1)
+        pdf_canvas.drawImage(ImageReader(io.BytesIO(image_data)), 0, 0, 1, 1)
+        pdf_canvas.endForm()
+    return name
+
+def draw_shared_image(pdf_canvas, image_data, x, y, width, height):
+    """Menggambar gambar lewat image_form() di kotak (x, y, width, height)"""
+    name = image_form(pdf_canvas, image_data)
+    pdf_canvas.saveState()
+    pdf_canvas.translate(x, y)
+    pdf_canvas.scale(width, height)
+    pdf_canvas.doForm(name)
+    pdf_canvas.restoreState()
+
+class SharedImage(Flowable):
+    """Pengganti platypus Image yang memakai form XObject bersama"""
+    
+    def __init__(self, image_data, width, height):
+        Flowable.__init__(self)
+        self.image_data = image_data
+        self.width = width
+        self.height = height
+        self.hAlign = 'CENTER'
+    
+    def draw(self):
+        draw_shared_image(self.canv, self.image_data, 0, 0, self.width, self.height)
+
+def _page_transform(page_size=None):
+    """
+    Skala dan offset halaman editor di tengah halaman PDF
+    
+    Returns:
+        Tuple (scale, offset_x, offset_y)
+    """
+    page_size = page_size or EDITOR_PAGE_SIZE
+    scale = min(page_size[0] / EDITOR_PAGE_SIZE[0], page_size[1] / EDITOR_PAGE_SIZE[1])
+    return (scale,
+            (page_size[0] - EDITOR_PAGE_SIZE[0] * scale) / 2,
+            (page_size[1] - EDITOR_PAGE_SIZE[1] * scale) / 2)
+
+def _page_count(scrapbook_data):
+    """Jumlah halaman, juga untuk scrapbook yang pages-nya berupa iterator"""
+    pages = scrapbook_data.get('pages', [])
+    if 'page_count' in scrapbook_data and not isinstance(pages, list):
+        return scrapbook_data['page_count']
+    return len(pages)
 
 class ScrapbookPDFGenerator:
     """
     Generator PDF untuk scrapbook dengan ReportLab
     """
     
-    def __init__(self):
+    def __init__(self, cache=None, blob_store=None, share_images=True, dpi=SCREEN_DPI,
+                 progress=None, cancel_token=None, derivatives=None):
+        """
+        Args:
+            cache: ImageCache untuk gambar yang sudah di-resize (default:
+                   cache bersama, False untuk menonaktifkan)
+            blob_store: BlobStore untuk foto yang disimpan sebagai referensi blob
+            share_images: Embed setiap gambar unik sekali sebagai XObject
+                          bersama (lihat image_form())
+            dpi: Resolusi gambar di PDF (SCREEN_DPI = 96, PRINT_DPI = 300);
+                 ukuran piksel foto dihitung dari ukuran gambarnya di halaman
+            progress: Callback(ProgressEvent) untuk progres ekspor (optional)
+            cancel_token: CancelToken; diperiksa di antara halaman (optional)
+            derivatives: DerivativeStore; foto blob di-resample dari varian
+                         terkecil yang cukup, bukan dari foto asli (optional)
+        """
+        self.cache = resolve_cache(cache)
+        self.blob_store = blob_store
+        self.derivatives = derivatives
+        self.share_images = share_images
+        self.dpi = dpi
+        self._image_sizes = {}
+        self.page_timings = []
+        self.progress = ProgressReporter(progress, cancel_token)
         self.styles = getSampleStyleSheet()
         self.setup_custom_styles()
     
@@ -57,42 +206,165 @@ class ScrapbookPDFGenerator:
         Convert base64 string to PIL Image
         
         Args:
-            base64_string: Base64 encoded image
-            max_width: Maximum width for resizing
-            max_height: Maximum height for resizing
+            base64_string: Base64 encoded image, referensi blob, atau ScrapbookImage
+            max_width: Maximum width for resizing (piksel)
+            max_height: Maximum height for resizing (piksel)
         
         Returns:
-            PIL Image object
+            PIL Image object (tidak pernah diperbesar), atau None jika gagal
         """
         try:
-            # Remove data URL prefix if present
-            if base64_string.startswith('data:'):
-                base64_string = base64_string.split(',')[1]
+            # Decode langsung pada skala terkecil yang cukup; handle yang sudah
+            # di memori cukup di-resize, tanpa encode / decode JPEG perantara
+            return self._image_handle(base64_string).load((max_width, max_height))
             
-            # Decode base64
-            image_data = base64.b64decode(base64_string)
-            image = PILImage.open(io.BytesIO(image_data))
+        except Exception as e:
+            print(f"Error converting base64 to image: {e}")
+            return None
+    
+    def box_image(self, image_source, width, height):
+        """
+        PIL Image untuk kotak width x height point pada self.dpi
+        
+        Versi base64_to_image() dengan ukuran dalam point PDF, mengikuti
+        kebijakan ukuran yang sama dengan image_bytes().
+        """
+        return self.base64_to_image(image_source, *self.target_pixels(width, height))
+    
+    def _image_handle(self, image_source):
+        """ScrapbookImage dari data URL, referensi blob, atau handle (tanpa decode piksel)"""
+        if is_blob_ref(image_source):
+            # Foto tersimpan di blob store, dibaca saat dibutuhkan
+            return ScrapbookImage.open(self.blob_store.read(image_source))
+        if (isinstance(image_source, str) and not image_source.startswith('data:')
+                and not os.path.exists(image_source)):
+            # Base64 tanpa prefix data URL (seperti yang diterima base64_to_image dulu)
+            return ScrapbookImage.open(base64.b64decode(image_source))
+        return ScrapbookImage.open(image_source)
+    
+    def target_pixels(self, width, height):
+        """Ukuran piksel untuk kotak width x height point pada self.dpi"""
+        return (max(1, round(width * self.dpi / 72)), max(1, round(height * self.dpi / 72)))
+    
+    def image_key(self, image_source, max_width, max_height, quality=90, cover=False):
+        """Key cache untuk hasil image_bytes()"""
+        parts = ('pdf', max_width, max_height, 'JPEG', quality) + (('cover',) if cover else ())
+        return self.cache.make_key(image_source, *parts)
+    
+    def image_bytes(self, image_source, max_width=400, max_height=300, quality=90, cover=False):
+        """
+        Bytes JPEG foto untuk ReportLab, tanpa file sementara
+        
+        Foto di-resample sekali ke ukuran target; foto yang sudah cukup kecil
+        tidak di-resample sama sekali, dan JPEG seperti itu dipakai apa
+        adanya (tanpa decode / re-encode). Hasilnya diberikan ke ReportLab
+        lewat BytesIO.
+        
+        Args:
+            image_source: Base64 data URL, referensi blob, atau ScrapbookImage
+            max_width: Lebar target (piksel), mis. dari target_pixels()
+            max_height: Tinggi target (piksel)
+            quality: Kualitas JPEG jika perlu di-encode ulang
+            cover: True jika foto harus menutupi seluruh target (object-fit:
+                   cover), False jika harus muat di dalamnya
+        
+        Returns:
+            bytes JPEG, atau None jika gagal
+        """
+        if is_blob_ref(image_source) and self.blob_store is None:
+            # Foto tidak bisa dibaca sama sekali: ekspor harus gagal, bukan
+            # diam-diam tanpa foto
+            raise ValueError("Photo is a blob reference but the generator has no blob_store "
+                             "(load with resolve_blobs=True or pass blob_store)")
+        
+        try:
+            key = None
+            if isinstance(image_source, ScrapbookImage):
+                handle = image_source
+            else:
+                if self.cache:
+                    key = self.image_key(image_source, max_width, max_height, quality, cover)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        self.progress.image_processed(len(cached))
+                        return cached
+                
+                handle = ((is_blob_ref(image_source)
+                           and self._derivative_handle(image_source, max_width, max_height, cover))
+                          or self._image_handle(image_source))
             
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            width, height = handle.size
+            ratio = (max if cover else min)(max_width / width, max_height / height)
             
-            # Resize if too large
-            image.thumbnail((max_width, max_height), PILImage.Resampling.LANCZOS)
+            data = None
+            if ratio >= 1:
+                # Sudah cukup kecil: tidak perlu resample
+                if handle.data is not None and handle.format == 'JPEG':
+                    with PILImage.open(io.BytesIO(handle.data)) as header:
+                        if header.mode in ('RGB', 'L'):
+                            data = handle.data
+                if data is None:
+                    data = ScrapbookImage(image=handle.load()).encode('JPEG', quality)
+            else:
+                target = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+                data = ScrapbookImage(image=handle.load(target)).encode('JPEG', quality)
             
-            return image
+            if key:
+                self.cache.put(key, data)
+            self.progress.image_processed(len(data))
+            return data
             
         except Exception as e:
-            print(f"Error converting base64 to image: {e}")
+            print(f"Error preparing image: {e}")
             return None
     
+    def _derivative_handle(self, ref, max_width, max_height, cover=False):
+        """Handle varian derivatif JPEG terkecil yang cukup untuk target, atau None"""
+        if not self.derivatives:
+            return None
+        manifest = self.derivatives.manifest(parse_blob_ref(ref)[1])
+        if not manifest or not manifest['variants']:
+            return None
+        width, height = manifest['width'], manifest['height']
+        ratio = (max if cover else min)(max_width / width, max_height / height)
+        if ratio >= 1:
+            return None
+        variant = choose_variant(manifest, round(width * ratio), round(height * ratio), formats=('JPEG',))
+        if variant is None:
+            return None
+        return ScrapbookImage.open(self.derivatives.read(manifest, variant))
+    
+    def _image_flowable(self, image_data, width, height):
+        if self.share_images:
+            return SharedImage(image_data, width, height)
+        return Image(io.BytesIO(image_data), width=width, height=height)
+    
+    def _draw_image(self, pdf_canvas, image_data, x, y, width, height):
+        if isinstance(pdf_canvas, StreamingCanvas):
+            # Sudah meng-embed setiap gambar unik sekali
+            pdf_canvas.draw_image_data(image_data, x, y, width, height)
+        elif self.share_images:
+            draw_shared_image(pdf_canvas, image_data, x, y, width, height)
+        else:
+            pdf_canvas.drawImage(ImageReader(io.BytesIO(image_data)), x, y, width, height)
+    
+    def _image_size(self, image_data):
+        """Ukuran piksel gambar dari header-nya (diingat per isi gambar)"""
+        digest = hashlib.sha1(image_data).digest()
+        size = self._image_sizes.get(digest)
+        if size is None:
+            with PILImage.open(io.BytesIO(image_data)) as header:
+                size = self._image_sizes[digest] = header.size
+        return size
+    
     def create_pdf_from_scrapbook(self, scrapbook_data, output_filename="scrapbook.pdf", 
                                  page_size=letter, include_toc=True):
         """
         Membuat PDF dari data scrapbook
         
         Args:
-            scrapbook_data: Dictionary berisi data scrapbook
+            scrapbook_data: Dictionary berisi data scrapbook ('pages' boleh
+                            berupa iterator, mis. dari iter_pages())
             output_filename: Nama file PDF output
             page_size: Ukuran halaman (letter, A4, A3)
             include_toc: Include table of contents
@@ -127,59 +399,63 @@ class ScrapbookPDFGenerator:
             # Process each page
             pages = scrapbook_data.get('pages', [])
             
-            for i, page in enumerate(pages, 1):
-                # Page title
-                story.append(Paragraph(f"Halaman {i}", self.styles['PageTitle']))
-                story.append(Spacer(1, 20))
-                
-                # Process photos
-                photos = page.get('photos', [])
-                for photo in photos:
-                    if photo.get('src'):
-                        pil_image = self.base64_to_image(photo['src'])
-                        if pil_image:
-                            # Save temporary image
-                            temp_filename = f"temp_photo_{i}_{photo['id']}.jpg"
-                            pil_image.save(temp_filename, 'JPEG', quality=85)
-                            
-                            # Add to PDF
-                            img = Image(temp_filename)
-                            img.drawHeight = 3 * inch
-                            img.drawWidth = 4 * inch
-                            story.append(img)
+            with self.progress.phase('layout'):
+                for i, page in enumerate(pages, 1):
+                    page_start = time.perf_counter()
+                    self.progress.page_started(i)
+                    
+                    # Add page break except before the first page (pages bisa
+                    # berupa iterator, jadi jumlahnya tidak diketahui di depan)
+                    if i > 1:
+                        story.append(Spacer(1, 50))
+                    
+                    # Page title
+                    story.append(Paragraph(f"Halaman {i}", self.styles['PageTitle']))
+                    story.append(Spacer(1, 20))
+                    
+                    # Process photos
+                    photos = page.get('photos', [])
+                    for photo in photos:
+                        if photo.get('src'):
+                            image_data = self.image_bytes(photo['src'], *self.target_pixels(4 * inch, 3 * inch),
+                                                          quality=85)
+                            if image_data:
+                                # Gambar diberikan dari memori, tanpa file sementara
+                                img = self._image_flowable(image_data, 4 * inch, 3 * inch)
+                                story.append(img)
+                                story.append(Spacer(1, 10))
+                    
+                    # Process texts
+                    texts = page.get('texts', [])
+                    for text in texts:
+                        content = text.get('content', '')
+                        if content:
+                            story.append(Paragraph(content, self.styles['ScrapbookText']))
                             story.append(Spacer(1, 10))
-                            
-                            # Clean up temp file
-                            try:
-                                os.remove(temp_filename)
-                            except:
-                                pass
-                
-                # Process texts
-                texts = page.get('texts', [])
-                for text in texts:
-                    content = text.get('content', '')
-                    if content:
-                        story.append(Paragraph(content, self.styles['ScrapbookText']))
+                    
+                    # Process stickers (as text)
+                    stickers = page.get('stickers', [])
+                    if stickers:
+                        sticker_text = ' '.join([sticker.get('emoji', '') for sticker in stickers])
+                        story.append(Paragraph(f"Stickers: {sticker_text}", self.styles['Normal']))
                         story.append(Spacer(1, 10))
-                
-                # Process stickers (as text)
-                stickers = page.get('stickers', [])
-                if stickers:
-                    sticker_text = ' '.join([sticker.get('emoji', '') for sticker in stickers])
-                    story.append(Paragraph(f"Stickers: {sticker_text}", self.styles['Normal']))
-                    story.append(Spacer(1, 10))
-                
-                # Add page break except for last page
-                if i < len(pages):
-                    story.append(Spacer(1, 50))
+                    
+                    self.progress.page_finished(i, time.perf_counter() - page_start)
             
-            # Build PDF
-            doc.build(story)
+            # Build PDF; pembatalan juga diperiksa setiap halaman PDF selesai
+            def check_cancelled(pdf_canvas, doc):
+                self.progress.check()
+            
+            with self.progress.phase('build'):
+                doc.build(story, onFirstPage=check_cancelled, onLaterPages=check_cancelled)
+            self.progress.bytes_written(os.path.getsize(output_filename))
             
             print(f"✅ PDF created successfully: {output_filename}")
             return output_filename
             
+        except ExportCancelled:
+            print(f"⛔ PDF export cancelled: {output_filename}")
+            return None
         except Exception as e:
             print(f"❌ Error creating PDF: {e}")
             return None
@@ -189,7 +465,9 @@ class ScrapbookPDFGenerator:
         Membuat PDF dengan layout yang lebih advanced
         
         Args:
-            scrapbook_data: Dictionary berisi data scrapbook
+            scrapbook_data: Dictionary berisi data scrapbook ('pages' boleh
+                            berupa iterator; jumlahnya diambil dari
+                            'page_count' jika ada)
             output_filename: Nama file PDF output
         
         Returns:
@@ -206,9 +484,11 @@ class ScrapbookPDFGenerator:
                     leftPadding=1*cm, rightPadding=1*cm,
                     topPadding=1*cm, bottomPadding=1*cm
                 )
-                return PageTemplate(id='normal', frames=frame)
+                # Pembatalan diperiksa setiap halaman PDF selesai
+                return PageTemplate(id='normal', frames=frame,
+                                    onPage=lambda pdf_canvas, doc: self.progress.check())
             
-            doc = SimpleDocTemplate(
+            doc = BaseDocTemplate(
                 output_filename,
                 pagesize=A4,
                 pageTemplates=[create_page_template()]
@@ -228,7 +508,7 @@ class ScrapbookPDFGenerator:
             
             # Metadata
             metadata = [
-                f"Total Halaman: {len(scrapbook_data.get('pages', []))}",
+                f"Total Halaman: {_page_count(scrapbook_data)}",
                 f"Dibuat: {datetime.now().strftime('%d %B %Y')}",
                 f"Tema: Mixed Themes"
             ]
@@ -242,95 +522,493 @@ class ScrapbookPDFGenerator:
             # Process pages with enhanced layout
             pages = scrapbook_data.get('pages', [])
             
-            for i, page in enumerate(pages, 1):
-                # New page for each scrapbook page
-                if i > 1:
-                    from reportlab.platypus import PageBreak
-                    story.append(PageBreak())
-                
-                # Page header with theme info
-                theme = page.get('theme', 'default').title()
-                header_text = f"Halaman {i} - Tema {theme}"
-                story.append(Paragraph(header_text, self.styles['PageTitle']))
-                story.append(Spacer(1, 1*cm))
-                
-                # Create a table-like layout for photos and text
-                from reportlab.platypus import Table, TableStyle
-                
-                page_content = []
-                
-                # Photos section
-                photos = page.get('photos', [])
-                if photos:
-                    photo_row = []
-                    for j, photo in enumerate(photos[:2]):  # Max 2 photos per row
-                        if photo.get('src'):
-                            pil_image = self.base64_to_image(photo['src'], 200, 150)
-                            if pil_image:
-                                temp_filename = f"temp_adv_{i}_{j}.jpg"
-                                pil_image.save(temp_filename, 'JPEG', quality=90)
-                                
-                                img = Image(temp_filename, width=6*cm, height=4*cm)
-                                photo_row.append(img)
-                                
-                                # Clean up
-                                try:
-                                    os.remove(temp_filename)
-                                except:
-                                    pass
+            with self.progress.phase('layout'):
+                for i, page in enumerate(pages, 1):
+                    page_start = time.perf_counter()
+                    self.progress.page_started(i)
+                    
+                    # New page for each scrapbook page
+                    if i > 1:
+                        from reportlab.platypus import PageBreak
+                        story.append(PageBreak())
+                    
+                    # Page header with theme info
+                    theme = page.get('theme', 'default').title()
+                    header_text = f"Halaman {i} - Tema {theme}"
+                    story.append(Paragraph(header_text, self.styles['PageTitle']))
+                    story.append(Spacer(1, 1*cm))
+                    
+                    # Create a table-like layout for photos and text
+                    from reportlab.platypus import Table, TableStyle
                     
-                    if photo_row:
-                        # Pad row if needed
-                        while len(photo_row) < 2:
-                            photo_row.append("")
+                    page_content = []
+                    
+                    # Photos section
+                    photos = page.get('photos', [])
+                    if photos:
+                        photo_row = []
+                        for j, photo in enumerate(photos[:2]):  # Max 2 photos per row
+                            if photo.get('src'):
+                                image_data = self.image_bytes(photo['src'], *self.target_pixels(6*cm, 4*cm))
+                                if image_data:
+                                    img = self._image_flowable(image_data, 6*cm, 4*cm)
+                                    photo_row.append(img)
+                    
+                        if photo_row:
+                            # Pad row if needed
+                            while len(photo_row) < 2:
+                                photo_row.append("")
                         
-                        page_content.append(photo_row)
-                
-                # Text section
-                texts = page.get('texts', [])
-                text_content = []
-                for text in texts:
-                    content = text.get('content', '')
-                    if content:
-                        text_content.append(content)
-                
-                if text_content:
-                    text_para = Paragraph(' • '.join(text_content), self.styles['ScrapbookText'])
-                    page_content.append([text_para, ""])
-                
-                # Stickers section
-                stickers = page.get('stickers', [])
-                if stickers:
-                    sticker_text = ' '.join([s.get('emoji', '') for s in stickers])
-                    sticker_para = Paragraph(f"Dekorasi: {sticker_text}", self.styles['Normal'])
-                    page_content.append([sticker_para, ""])
-                
-                # Create table if we have content
-                if page_content:
-                    table = Table(page_content, colWidths=[10*cm, 6*cm])
-                    table.setStyle(TableStyle([
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                        ('TOPPADDING', (0, 0), (-1, -1), 6),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ]))
-                    story.append(table)
-                
-                story.append(Spacer(1, 1*cm))
+                            page_content.append(photo_row)
+                    
+                    # Text section
+                    texts = page.get('texts', [])
+                    text_content = []
+                    for text in texts:
+                        content = text.get('content', '')
+                        if content:
+                            text_content.append(content)
+                    
+                    if text_content:
+                        text_para = Paragraph(' • '.join(text_content), self.styles['ScrapbookText'])
+                        page_content.append([text_para, ""])
+                    
+                    # Stickers section
+                    stickers = page.get('stickers', [])
+                    if stickers:
+                        sticker_text = ' '.join([s.get('emoji', '') for s in stickers])
+                        sticker_para = Paragraph(f"Dekorasi: {sticker_text}", self.styles['Normal'])
+                        page_content.append([sticker_para, ""])
+                    
+                    # Create table if we have content
+                    if page_content:
+                        table = Table(page_content, colWidths=[10*cm, 6*cm])
+                        table.setStyle(TableStyle([
+                            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                            ('TOPPADDING', (0, 0), (-1, -1), 6),
+                            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                        ]))
+                        story.append(table)
+                    
+                    story.append(Spacer(1, 1*cm))
+                    self.progress.page_finished(i, time.perf_counter() - page_start)
             
             # Build PDF
-            doc.build(story)
+            with self.progress.phase('build'):
+                doc.build(story)
+            self.progress.bytes_written(os.path.getsize(output_filename))
             
             print(f"✅ Advanced PDF created successfully: {output_filename}")
             return output_filename
             
+        except ExportCancelled:
+            print(f"⛔ Advanced PDF export cancelled: {output_filename}")
+            return None
         except Exception as e:
             print(f"❌ Error creating advanced PDF: {e}")
             return None
 
-def create_pdf_from_json(json_file, output_pdf=None, advanced=False):
+    def _draw_element_box(self, pdf_canvas, element, draw):
+        """
+        Menyiapkan koordinat elemen editor lalu memanggil draw(width, height)
+        
+        Titik asal dipindah ke pojok kiri-bawah elemen dengan rotasi CSS
+        (searah jarum jam, di sekitar titik tengah) sudah diterapkan.
+        """
+        x, y = element.get('x', 0), element.get('y', 0)
+        width, height = element.get('width', 0), element.get('height', 0)
+        rotation = element.get('rotation') or 0
+        
+        pdf_canvas.saveState()
+        # Sumbu y editor mengarah ke bawah, sumbu y PDF ke atas
+        pdf_canvas.translate(x + width / 2, EDITOR_PAGE_SIZE[1] - y - height / 2)
+        if rotation:
+            pdf_canvas.rotate(-rotation)
+        pdf_canvas.translate(-width / 2, -height / 2)
+        draw(width, height)
+        pdf_canvas.restoreState()
+    
+    def photo_target(self, photo, scale=1):
+        """
+        Ukuran piksel foto editor di dalam bingkainya
+        
+        Args:
+            photo: Dictionary foto (width / height dalam px editor)
+            scale: Point PDF per px editor
+        """
+        return self.target_pixels((photo['width'] - 2 * PHOTO_BORDER) * scale,
+                                  (photo['height'] - 2 * PHOTO_BORDER) * scale)
+    
+    def _draw_photo(self, pdf_canvas, photo, scale=1):
+        image_data = self.image_bytes(photo['src'], *self.photo_target(photo, scale), cover=True)
+        if not image_data:
+            return
+        image_width, image_height = self._image_size(image_data)
+        
+        def draw(width, height):
+            pdf_canvas.setFillColor(colors.white)
+            pdf_canvas.rect(0, 0, width, height, stroke=0, fill=1)
+            inner_width = width - 2 * PHOTO_BORDER
+            inner_height = height - 2 * PHOTO_BORDER
+            
+            # object-fit: cover -> skala terbesar, sisanya dipotong clip path
+            scale = max(inner_width / image_width, inner_height / image_height)
+            draw_width, draw_height = image_width * scale, image_height * scale
+            clip = pdf_canvas.beginPath()
+            clip.rect(PHOTO_BORDER, PHOTO_BORDER, inner_width, inner_height)
+            pdf_canvas.clipPath(clip, stroke=0, fill=0)
+            self._draw_image(pdf_canvas, image_data,
+                             PHOTO_BORDER + (inner_width - draw_width) / 2,
+                             PHOTO_BORDER + (inner_height - draw_height) / 2,
+                             draw_width, draw_height)
+        
+        self._draw_element_box(pdf_canvas, photo, draw)
+    
+    def _draw_text(self, pdf_canvas, content, element, font, font_size, color):
+        lines = str(content).split('\n')
+        box = dict(element, width=0, height=0)
+        
+        def draw(width, height):
+            pdf_canvas.setFont(font, font_size)
+            pdf_canvas.setFillColor(color)
+            # Baseline baris pertama: padding + setengah leading + ascent
+            baseline = -(TEXT_PADDING + font_size * 0.9)
+            for line in lines:
+                pdf_canvas.drawString(TEXT_PADDING, baseline, line)
+                baseline -= font_size * 1.2
+        
+        self._draw_element_box(pdf_canvas, box, draw)
+    
+    def draw_page(self, pdf_canvas, page, page_number, scale=1):
+        """
+        Menggambar satu halaman scrapbook pada koordinat editor
+        
+        Args:
+            pdf_canvas: reportlab Canvas dengan sistem koordinat EDITOR_PAGE_SIZE
+            page: Dictionary halaman
+            page_number: Nomor halaman (untuk label dan bookmark)
+            scale: Point PDF per px editor (untuk resolusi foto)
+        """
+        page_width, page_height = EDITOR_PAGE_SIZE
+        
+        pdf_canvas.setFillColor(_pdf_color(THEME_BACKGROUNDS.get(page.get('theme'), DEFAULT_BACKGROUND)))
+        pdf_canvas.rect(0, 0, page_width, page_height, stroke=0, fill=1)
+        
+        # Urutan sama dengan z-index editor: foto, teks, stiker
+        for photo in page.get('photos', []):
+            if photo.get('src'):
+                self._draw_photo(pdf_canvas, photo, scale)
+        
+        for text in page.get('texts', []):
+            if text.get('content'):
+                self._draw_text(pdf_canvas, text['content'], text,
+                                _pdf_font(text.get('fontFamily')),
+                                text.get('fontSize', 16), _pdf_color(text.get('color')))
+        
+        for sticker in page.get('stickers', []):
+            if sticker.get('emoji'):
+                self._draw_text(pdf_canvas, sticker['emoji'], sticker,
+                                DEFAULT_FONT, sticker.get('size', 32), colors.black)
+        
+        pdf_canvas.setFont(DEFAULT_FONT, 10)
+        pdf_canvas.setFillColor(colors.HexColor('#6b7280'))
+        pdf_canvas.drawRightString(page_width - 16, 12, f"Halaman {page_number}")
+        
+        key = f"page_{page_number}"
+        pdf_canvas.bookmarkPage(key)
+        pdf_canvas.addOutlineEntry(f"Halaman {page_number}", key, level=0)
+    
+    def create_canvas_pdf(self, scrapbook_data, output_filename="scrapbook_canvas.pdf", page_size=None):
+        """
+        Membuat PDF dengan menggambar elemen langsung pada posisi editornya
+        
+        Setiap halaman scrapbook menjadi satu halaman PDF; foto, teks dan
+        stiker digambar di x / y / width / height / rotation yang tersimpan,
+        tanpa layout flowable platypus.
+        
+        Args:
+            scrapbook_data: Dictionary berisi data scrapbook ('pages' boleh
+                            berupa iterator)
+            output_filename: Nama file PDF output
+            page_size: Ukuran halaman PDF (default: ukuran editor dalam pt);
+                       halaman editor diskalakan dan diletakkan di tengah
+        
+        Returns:
+            Path file PDF yang dibuat
+        """
+        try:
+            page_size = page_size or EDITOR_PAGE_SIZE
+            pdf_canvas = canvas.Canvas(output_filename, pagesize=page_size)
+            pdf_canvas.setTitle(scrapbook_data.get('title', 'My Digital Scrapbook'))
+            
+            with self.progress.phase('render'):
+                self.page_timings = self.render_pages(pdf_canvas, scrapbook_data.get('pages', []), 1, page_size)
+            with self.progress.phase('write'):
+                pdf_canvas.save()
+            self.progress.bytes_written(os.path.getsize(output_filename))
+            
+            print(f"✅ Canvas PDF created successfully: {output_filename}")
+            return output_filename
+            
+        except ExportCancelled:
+            print(f"⛔ Canvas PDF export cancelled: {output_filename}")
+            return None
+        except Exception as e:
+            print(f"❌ Error creating canvas PDF: {e}")
+            return None
+    
+    def render_pages(self, pdf_canvas, pages, first_page_number=1, page_size=None):
+        """
+        Menggambar halaman-halaman scrapbook, satu halaman PDF per halaman
+        
+        Args:
+            pdf_canvas: reportlab Canvas
+            pages: Iterable halaman
+            first_page_number: Nomor halaman pertama
+            page_size: Ukuran halaman PDF (default: ukuran editor)
+        
+        Returns:
+            List of (page_number, detik) waktu render setiap halaman
+        """
+        scale, offset_x, offset_y = _page_transform(page_size)
+        
+        timings = []
+        for page_number, page in enumerate(pages, first_page_number):
+            start = time.perf_counter()
+            self.progress.page_started(page_number)
+            pdf_canvas.saveState()
+            pdf_canvas.translate(offset_x, offset_y)
+            pdf_canvas.scale(scale, scale)
+            self.draw_page(pdf_canvas, page, page_number, scale)
+            pdf_canvas.restoreState()
+            pdf_canvas.showPage()
+            timings.append((page_number, time.perf_counter() - start))
+            self.progress.page_finished(page_number, timings[-1][1])
+            if isinstance(pdf_canvas, StreamingCanvas):
+                # Halaman sudah langsung ditulis ke file
+                self.progress.bytes_written(pdf_canvas.bytes_written)
+        return timings
+    
+    def create_streaming_pdf(self, scrapbook_data, output_filename="scrapbook_stream.pdf", page_size=None):
+        """
+        Membuat PDF canvas yang ditulis ke file halaman demi halaman
+        
+        Layout sama dengan create_canvas_pdf(), tapi setiap halaman langsung
+        ditulis dan dilepas dari memori (lihat pdf_stream.StreamingCanvas).
+        Dengan 'pages' berupa iterator (mis. dari iter_pages()), memori yang
+        dipakai tetap datar berapa pun jumlah halamannya.
+        
+        Args:
+            scrapbook_data: Dictionary berisi data scrapbook
+            output_filename: Nama file PDF output
+            page_size: Ukuran halaman PDF (default: ukuran editor)
+        
+        Returns:
+            Path file PDF yang dibuat
+        """
+        try:
+            page_size = page_size or EDITOR_PAGE_SIZE
+            with atomic_open(output_filename, 'wb') as f:
+                pdf_canvas = StreamingCanvas(f, page_size)
+                pdf_canvas.setTitle(scrapbook_data.get('title', 'My Digital Scrapbook'))
+                with self.progress.phase('render'):
+                    self.page_timings = self.render_pages(pdf_canvas, scrapbook_data.get('pages', []), 1, page_size)
+                with self.progress.phase('write'):
+                    pdf_canvas.save()
+            self.progress.bytes_written(pdf_canvas.bytes_written)
+            
+            print(f"✅ Streaming PDF created successfully: {output_filename}")
+            return output_filename
+            
+        except ExportCancelled:
+            # atomic_open membuang file sementara, file lama tetap utuh
+            print(f"⛔ Streaming PDF export cancelled: {output_filename}")
+            return None
+        except Exception as e:
+            print(f"❌ Error creating streaming PDF: {e}")
+            return None
+    
+    def create_parallel_pdf(self, scrapbook_data, output_filename="scrapbook_parallel.pdf",
+                            page_size=None, workers=None, chunk_size=20):
+        """
+        Membuat PDF canvas dengan memakai beberapa proses
+        
+        Halaman dibagi menjadi potongan chunk_size halaman; setiap potongan
+        (decode / resize foto dan render) dikerjakan di process pool lalu
+        digabung sesuai urutan, termasuk bookmark per halaman. Tanpa pypdf
+        hanya persiapan foto yang paralel, render tetap serial.
+        
+        Args:
+            scrapbook_data: Dictionary berisi data scrapbook ('pages' boleh
+                            berupa iterator)
+            output_filename: Nama file PDF output
+            page_size: Ukuran halaman PDF (default: ukuran editor)
+            workers: Jumlah proses (default: jumlah CPU)
+            chunk_size: Jumlah halaman per potongan
+        
+        Returns:
+            Path file PDF yang dibuat (waktu per halaman ada di self.page_timings)
+        """
+        try:
+            page_size = page_size or EDITOR_PAGE_SIZE
+            workers = workers or os.cpu_count() or 1
+            blob_dir = self.blob_store.directory if self.blob_store else None
+            derivative_dir = self.derivatives.directory if self.derivatives else None
+            pages = iter(scrapbook_data.get('pages', []))
+            chunks = iter(lambda: list(islice(pages, chunk_size)), [])
+            
+            with ProcessPoolExecutor(workers, initializer=_init_pdf_worker,
+                                     initargs=(blob_dir, self.dpi, derivative_dir,
+                                               self.share_images)) as executor:
+                try:
+                    if PdfWriter is not None:
+                        self._render_chunks_parallel(executor, chunks, chunk_size, workers,
+                                                     scrapbook_data, output_filename, page_size)
+                    else:
+                        self._prepare_assets_parallel(executor, chunks, workers,
+                                                      scrapbook_data, output_filename, page_size)
+                except ExportCancelled:
+                    # Potongan yang belum mulai tidak perlu dikerjakan lagi
+                    executor.shutdown(cancel_futures=True)
+                    raise
+            self.progress.bytes_written(os.path.getsize(output_filename))
+            
+            total = sum(seconds for _, seconds in self.page_timings)
+            print(f"✅ Parallel PDF created successfully: {output_filename} "
+                  f"({len(self.page_timings)} pages, {total:.2f}s page time on {workers} workers)")
+            return output_filename
+            
+        except ExportCancelled:
+            print(f"⛔ Parallel PDF export cancelled: {output_filename}")
+            return None
+        except Exception as e:
+            print(f"❌ Error creating parallel PDF: {e}")
+            return None
+    
+    def _render_chunks_parallel(self, executor, chunks, chunk_size, workers,
+                                scrapbook_data, output_filename, page_size):
+        """Render potongan halaman di worker lalu gabungkan dengan pypdf"""
+        writer = PdfWriter()
+        writer.add_metadata({'/Title': scrapbook_data.get('title', 'My Digital Scrapbook')})
+        self.page_timings = []
+        
+        # Paling banyak workers * 2 potongan di memori sekaligus, digabung sesuai urutan
+        with self.progress.phase('render'):
+            pending = []
+            first_page_number = 1
+            for chunk in chunks:
+                self.progress.check()
+                pending.append(executor.submit(_render_pdf_chunk, chunk, first_page_number, page_size))
+                first_page_number += len(chunk)
+                if len(pending) >= workers * 2:
+                    self._append_chunk(writer, pending.pop(0).result())
+            for future in pending:
+                self.progress.check()
+                self._append_chunk(writer, future.result())
+        
+        # Batal sebelum menulis: file lama (jika ada) tetap utuh
+        self.progress.check()
+        with self.progress.phase('write'):
+            with atomic_open(output_filename, 'wb') as f:
+                writer.write(f)
+    
+    def _append_chunk(self, writer, result):
+        pdf_data, timings = result
+        # Outline (bookmark "Halaman N") ikut dipindahkan bersama halamannya
+        writer.append(PdfReader(io.BytesIO(pdf_data)))
+        self.page_timings.extend(timings)
+        # Halaman dirender di worker; progres dilaporkan saat potongannya digabung
+        for page_number, seconds in timings:
+            self.progress.page_started(page_number)
+            self.progress.page_finished(page_number, seconds)
+    
+    def _prepare_assets_parallel(self, executor, chunks, workers,
+                                 scrapbook_data, output_filename, page_size):
+        """Siapkan foto di worker (ke image cache), lalu render serial"""
+        cache = self.cache or ImageCache()
+        original_cache, self.cache = self.cache, cache
+        try:
+            pdf_canvas = canvas.Canvas(output_filename, pagesize=page_size)
+            pdf_canvas.setTitle(scrapbook_data.get('title', 'My Digital Scrapbook'))
+            self.page_timings = []
+            
+            pending = []
+            first_page_number = 1
+            
+            def render(future, chunk, number):
+                assets, prepare_timings = future.result()
+                for key, data in assets:
+                    cache.put(key, data)
+                timings = self.render_pages(pdf_canvas, chunk, number, page_size)
+                self.page_timings.extend(
+                    (page_number, seconds + prepared)
+                    for (page_number, seconds), (_, prepared) in zip(timings, prepare_timings)
+                )
+            
+            with self.progress.phase('render'):
+                for chunk in chunks:
+                    self.progress.check()
+                    pending.append((executor.submit(_prepare_pdf_chunk, chunk, first_page_number, page_size),
+                                    chunk, first_page_number))
+                    first_page_number += len(chunk)
+                    if len(pending) >= workers * 2:
+                        render(*pending.pop(0))
+                for item in pending:
+                    render(*item)
+            
+            self.progress.check()
+            with self.progress.phase('write'):
+                pdf_canvas.save()
+        finally:
+            self.cache = original_cache
+
+# Generator per proses worker untuk create_parallel_pdf
+_worker_generator = None
+
+def _init_pdf_worker(blob_dir, dpi, derivative_dir=None, share_images=True):
+    global _worker_generator
+    blob_store = BlobStore(blob_dir) if blob_dir else None
+    derivatives = DerivativeStore(derivative_dir) if derivative_dir else None
+    _worker_generator = ScrapbookPDFGenerator(cache=ImageCache(), blob_store=blob_store, dpi=dpi,
+                                              derivatives=derivatives, share_images=share_images)
+
+def _render_pdf_chunk(pages, first_page_number, page_size):
+    """Render potongan halaman menjadi bytes PDF (di proses worker)"""
+    buffer = io.BytesIO()
+    pdf_canvas = canvas.Canvas(buffer, pagesize=page_size)
+    timings = _worker_generator.render_pages(pdf_canvas, pages, first_page_number, page_size)
+    pdf_canvas.save()
+    return buffer.getvalue(), timings
+
+def _prepare_pdf_chunk(pages, first_page_number, page_size):
+    """
+    Decode / resize foto potongan halaman (di proses worker)
+    
+    Returns:
+        Tuple (list of (cache key, bytes JPEG), list of (page_number, detik))
+    """
+    generator = _worker_generator
+    scale = _page_transform(page_size)[0]
+    assets = []
+    timings = []
+    for page_number, page in enumerate(pages, first_page_number):
+        start = time.perf_counter()
+        for photo in page.get('photos', []):
+            src = photo.get('src')
+            if not isinstance(src, str):
+                continue
+            width, height = generator.photo_target(photo, scale)
+            data = generator.image_bytes(src, width, height, cover=True)
+            if data:
+                assets.append((generator.image_key(src, width, height, cover=True), data))
+        timings.append((page_number, time.perf_counter() - start))
+    return assets, timings
+
+def create_pdf_from_json(json_file, output_pdf=None, advanced=False, layout=None, dpi=SCREEN_DPI,
+                         progress=None, cancel_token=None):
     """
     Utility function untuk membuat PDF dari file JSON
     
@@ -338,24 +1016,47 @@ def create_pdf_from_json(json_file, output_pdf=None, advanced=False):
         json_file: Path ke file JSON scrapbook
         output_pdf: Nama file PDF output (optional)
         advanced: Use advanced layout
+        layout: 'basic', 'advanced', 'canvas', 'stream' atau 'parallel'
+                (menggantikan advanced)
+        dpi: Resolusi gambar (SCREEN_DPI atau PRINT_DPI)
+        progress: Callback(ProgressEvent) untuk progres ekspor (optional)
+        cancel_token: export_progress.CancelToken untuk membatalkan (optional)
     
     Returns:
-        Path file PDF yang dibuat
+        Path file PDF yang dibuat, atau None jika gagal / dibatalkan
     """
     try:
-        # Load JSON data
-        with open(json_file, 'r', encoding='utf-8') as f:
-            scrapbook_data = json.load(f)
+        # Header dibaca dulu, halaman di-stream satu per satu saat render
+        scrapbook_data = read_header(json_file)
+        scrapbook_data['pages'] = iter_pages(json_file)
         
         # Generate output filename if not provided
         if output_pdf is None:
             base_name = os.path.splitext(os.path.basename(json_file))[0]
             output_pdf = f"{base_name}.pdf"
         
+        # Foto yang disimpan ScrapbookDataManager berupa referensi blob
+        blob_store = None
+        blob_dir = scrapbook_data.get('metadata', {}).get('blob_dir')
+        if blob_dir:
+            blob_store = BlobStore(os.path.join(os.path.dirname(json_file), blob_dir))
+        derivatives = None
+        derivative_dir = scrapbook_data.get('metadata', {}).get('derivative_dir')
+        if derivative_dir:
+            derivatives = DerivativeStore(os.path.join(os.path.dirname(json_file), derivative_dir))
+        
         # Create PDF
-        generator = ScrapbookPDFGenerator()
+        generator = ScrapbookPDFGenerator(blob_store=blob_store, dpi=dpi, derivatives=derivatives,
+                                          progress=progress, cancel_token=cancel_token)
         
-        if advanced:
+        layout = layout or ('advanced' if advanced else 'basic')
+        if layout == 'stream':
+            return generator.create_streaming_pdf(scrapbook_data, output_pdf)
+        elif layout == 'parallel':
+            return generator.create_parallel_pdf(scrapbook_data, output_pdf)
+        elif layout == 'canvas':
+            return generator.create_canvas_pdf(scrapbook_data, output_pdf)
+        elif layout == 'advanced':
             return generator.create_advanced_pdf(scrapbook_data, output_pdf)
         else:
             return generator.create_pdf_from_scrapbook(scrapbook_data, output_pdf)
@@ -438,14 +1139,23 @@ if __name__ == "__main__":
     print("Creating advanced PDF...")
     advanced_pdf = generator.create_advanced_pdf(sample_data, "sample_advanced.pdf")
     
+    # Test canvas PDF creation (posisi sama dengan editor)
+    print("Creating canvas PDF...")
+    canvas_pdf = generator.create_canvas_pdf(sample_data, "sample_canvas.pdf")
+    
     print("\n✅ PDF Generator ready!")
     print("Available functions:")
     print("  - create_pdf_from_scrapbook(data, filename)")
     print("  - create_advanced_pdf(data, filename)")
-    print("  - create_pdf_from_json(json_file, output_pdf)")
+    print("  - create_canvas_pdf(data, filename, page_size)")
+    print("  - create_streaming_pdf(data, filename, page_size)")
+    print("  - create_parallel_pdf(data, filename, page_size, workers)")
+    print("  - create_pdf_from_json(json_file, output_pdf, progress=callback, cancel_token=token)")
     
     print(f"\nSample PDFs created:")
     if basic_pdf:
         print(f"  - {basic_pdf}")
     if advanced_pdf:
         print(f"  - {advanced_pdf}")
+    if canvas_pdf:
+        print(f"  - {canvas_pdf}")
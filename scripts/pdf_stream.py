@@ -0,0 +1,287 @@
+import hashlib
+import io
+import math
+import zlib
+from array import array
+
+from PIL import Image
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.pathobject import PDFPathObject
+
+# Objek yang nomornya dipesan di awal, ditulis terakhir
+CATALOG_OBJECT = 1
+PAGES_OBJECT = 2
+OUTLINES_OBJECT = 3
+
+def _number(value):
+    """Angka PDF ringkas (tanpa nol di belakang koma)"""
+    if isinstance(value, int):
+        return str(value)
+    text = f"{value:.4f}".rstrip('0').rstrip('.')
+    return text if text not in ('', '-0') else '0'
+
+def _pdf_string(text):
+    """String literal PDF (WinAnsiEncoding; karakter di luar itu jadi '?')"""
+    data = str(text).encode('cp1252', 'replace')
+    data = data.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+    return b'(' + data + b')'
+
+class StreamingCanvas:
+    """
+    Canvas PDF yang menulis setiap halaman ke file begitu showPage() dipanggil
+
+    Mengimplementasikan bagian API reportlab Canvas yang dipakai
+    ScrapbookPDFGenerator.draw_page(), jadi renderer yang sama bisa dipakai.
+    Berbeda dengan reportlab Canvas yang menyimpan seluruh dokumen sampai
+    save(), yang tersimpan di memori di sini hanya isi halaman yang sedang
+    digambar, offset objek, dan daftar gambar / font unik. Gambar JPEG
+    di-embed apa adanya (DCTDecode) dan hanya sekali per isi gambar.
+    """
+
+    def __init__(self, f, pagesize):
+        """
+        Args:
+            f: File object biner yang bisa ditulis
+            pagesize: Tuple (width, height) dalam point
+        """
+        self._f = f
+        self._pagesize = pagesize
+        self._position = 0
+        self._offsets = array('Q', [0] * (OUTLINES_OBJECT + 1))
+        self._page_refs = array('L')
+        self._fonts = {}
+        self._images = {}
+        self._title = None
+
+        self._code = []
+        self._page_fonts = {}
+        self._page_images = {}
+        self._font = ('Helvetica', 12)
+
+        # Outline ditulis satu entri di belakang supaya /Next bisa diisi
+        self._outline_first = None
+        self._outline_pending = None
+        self._outline_count = 0
+
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    @property
+    def bytes_written(self):
+        """Jumlah byte yang sudah ditulis ke file"""
+        return self._position
+
+    # Penulisan objek
+
+    def _write(self, data):
+        self._f.write(data)
+        self._position += len(data)
+
+    def _allocate(self):
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write_object(self, number, body, stream=None):
+        self._offsets[number] = self._position
+        self._write(f"{number} 0 obj\n".encode())
+        self._write(body)
+        if stream is not None:
+            self._write(b'\nstream\n')
+            self._write(stream)
+            self._write(b'\nendstream')
+        self._write(b'\nendobj\n')
+
+    # State grafis
+
+    def saveState(self):
+        self._code.append('q')
+
+    def restoreState(self):
+        self._code.append('Q')
+
+    def translate(self, dx, dy):
+        self._code.append(f"1 0 0 1 {_number(dx)} {_number(dy)} cm")
+
+    def scale(self, x, y):
+        self._code.append(f"{_number(x)} 0 0 {_number(y)} 0 0 cm")
+
+    def rotate(self, theta):
+        """Rotasi berlawanan arah jarum jam (derajat), seperti reportlab"""
+        cos, sin = math.cos(math.radians(theta)), math.sin(math.radians(theta))
+        self._code.append(f"{_number(cos)} {_number(sin)} {_number(-sin)} {_number(cos)} 0 0 cm")
+
+    def setFillColor(self, color):
+        self._code.append(f"{_number(color.red)} {_number(color.green)} {_number(color.blue)} rg")
+
+    def setStrokeColor(self, color):
+        self._code.append(f"{_number(color.red)} {_number(color.green)} {_number(color.blue)} RG")
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        operator = {(1, 1): 'B', (0, 1): 'f', (1, 0): 'S'}.get((bool(stroke), bool(fill)), 'n')
+        self._code.append(f"{_number(x)} {_number(y)} {_number(width)} {_number(height)} re {operator}")
+
+    def beginPath(self):
+        return PDFPathObject()
+
+    def clipPath(self, path, stroke=1, fill=0):
+        operator = {(1, 1): 'B', (0, 1): 'f', (1, 0): 'S'}.get((bool(stroke), bool(fill)), 'n')
+        self._code.append(f"{path.getCode()} W {operator}")
+
+    # Teks
+
+    def _font_resource(self, font_name):
+        font = self._fonts.get(font_name)
+        if font is None:
+            number = self._allocate()
+            self._write_object(number, (
+                f"<< /Type /Font /Subtype /Type1 /BaseFont /{font_name} "
+                f"/Encoding /WinAnsiEncoding >>"
+            ).encode())
+            font = self._fonts[font_name] = (f"F{len(self._fonts) + 1}", number)
+        self._page_fonts[font[0]] = font[1]
+        return font[0]
+
+    def setFont(self, font_name, size):
+        self._font = (font_name, size)
+
+    def drawString(self, x, y, text):
+        font_name, size = self._font
+        resource = self._font_resource(font_name)
+        self._code.append(
+            f"BT /{resource} {_number(size)} Tf {_number(x)} {_number(y)} Td "
+            f"{_pdf_string(text).decode('latin-1')} Tj ET"
+        )
+
+    def drawRightString(self, x, y, text):
+        font_name, size = self._font
+        self.drawString(x - stringWidth(str(text), font_name, size), y, text)
+
+    # Gambar
+
+    def _image_resource(self, image_data):
+        digest = hashlib.sha1(image_data).digest()
+        image = self._images.get(digest)
+        if image is None:
+            with Image.open(io.BytesIO(image_data)) as source:
+                width, height = source.size
+                if source.format == 'JPEG' and source.mode in ('RGB', 'L'):
+                    # JPEG di-embed apa adanya, tanpa decode
+                    color_space = 'DeviceRGB' if source.mode == 'RGB' else 'DeviceGray'
+                    stream, filter_name = image_data, 'DCTDecode'
+                else:
+                    pixels = source.convert('RGB')
+                    color_space = 'DeviceRGB'
+                    stream, filter_name = zlib.compress(pixels.tobytes()), 'FlateDecode'
+
+            number = self._allocate()
+            self._write_object(number, (
+                f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                f"/ColorSpace /{color_space} /BitsPerComponent 8 /Filter /{filter_name} "
+                f"/Length {len(stream)} >>"
+            ).encode(), stream)
+            image = self._images[digest] = (f"Im{len(self._images) + 1}", number)
+        self._page_images[image[0]] = image[1]
+        return image[0]
+
+    def draw_image_data(self, image_data, x, y, width, height):
+        """Menggambar bytes gambar di kotak (x, y, width, height)"""
+        resource = self._image_resource(image_data)
+        self._code.append(
+            f"q {_number(width)} 0 0 {_number(height)} {_number(x)} {_number(y)} cm /{resource} Do Q"
+        )
+
+    # Halaman dan dokumen
+
+    def setTitle(self, title):
+        self._title = title
+
+    def bookmarkPage(self, key):
+        """Tujuan outline selalu halaman saat ini, jadi key tidak perlu disimpan"""
+
+    def addOutlineEntry(self, title, key, level=0):
+        """Entri outline level atas yang menunjuk ke halaman saat ini"""
+        number = self._allocate()
+        if self._outline_pending is not None:
+            self._write_outline_entry(*self._outline_pending, next_number=number)
+            previous = self._outline_pending[0]
+        else:
+            self._outline_first = number
+            previous = None
+        # Halaman ini baru ditulis di showPage, jadi yang disimpan indeksnya
+        self._outline_pending = (number, title, previous, len(self._page_refs))
+        self._outline_count += 1
+
+    def _write_outline_entry(self, number, title, previous, page_index, next_number=None):
+        if page_index >= len(self._page_refs):
+            return
+        entry = (
+            f"<< /Title {_pdf_string(title).decode('latin-1')} /Parent {OUTLINES_OBJECT} 0 R "
+            f"/Dest [{self._page_refs[page_index]} 0 R /Fit]"
+        )
+        if previous is not None:
+            entry += f" /Prev {previous} 0 R"
+        if next_number is not None:
+            entry += f" /Next {next_number} 0 R"
+        self._write_object(number, (entry + " >>").encode('latin-1'))
+
+    def showPage(self):
+        """Menulis halaman saat ini ke file dan memulai halaman baru"""
+        content = zlib.compress('\n'.join(self._code).encode('latin-1'))
+        content_number = self._allocate()
+        self._write_object(content_number,
+                           f"<< /Length {len(content)} /Filter /FlateDecode >>".encode(), content)
+
+        fonts = ' '.join(f"/{name} {number} 0 R" for name, number in self._page_fonts.items())
+        images = ' '.join(f"/{name} {number} 0 R" for name, number in self._page_images.items())
+        page_number = self._allocate()
+        width, height = self._pagesize
+        self._write_object(page_number, (
+            f"<< /Type /Page /Parent {PAGES_OBJECT} 0 R "
+            f"/MediaBox [0 0 {_number(width)} {_number(height)}] "
+            f"/Resources << /Font << {fonts} >> /XObject << {images} >> >> "
+            f"/Contents {content_number} 0 R >>"
+        ).encode())
+        self._page_refs.append(page_number)
+
+        self._code = []
+        self._page_fonts = {}
+        self._page_images = {}
+
+    def save(self):
+        """Menutup dokumen: page tree, outline, catalog dan xref"""
+        if self._code:
+            self.showPage()
+
+        if self._outline_pending is not None:
+            self._write_outline_entry(*self._outline_pending)
+        outline_last = self._outline_pending[0] if self._outline_pending else None
+        if self._outline_first is not None:
+            self._write_object(OUTLINES_OBJECT, (
+                f"<< /Type /Outlines /First {self._outline_first} 0 R "
+                f"/Last {outline_last} 0 R /Count {self._outline_count} >>"
+            ).encode())
+        else:
+            self._write_object(OUTLINES_OBJECT, b"<< /Type /Outlines /Count 0 >>")
+
+        kids = ' '.join(f"{number} 0 R" for number in self._page_refs)
+        self._write_object(PAGES_OBJECT, (
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_refs)} >>"
+        ).encode())
+        self._write_object(CATALOG_OBJECT, (
+            f"<< /Type /Catalog /Pages {PAGES_OBJECT} 0 R /Outlines {OUTLINES_OBJECT} 0 R "
+            f"/PageMode /UseOutlines >>"
+        ).encode())
+
+        info_number = self._allocate()
+        info = b"<< /Producer (scrapbook pdf_stream)"
+        if self._title:
+            info += b" /Title " + _pdf_string(self._title)
+        self._write_object(info_number, info + b" >>")
+
+        xref_position = self._position
+        lines = [f"xref\n0 {len(self._offsets)}\n", "0000000000 65535 f \n"]
+        lines += [f"{offset:010d} 00000 n \n" for offset in self._offsets[1:]]
+        self._write(''.join(lines).encode())
+        self._write((
+            f"trailer\n<< /Size {len(self._offsets)} /Root {CATALOG_OBJECT} 0 R "
+            f"/Info {info_number} 0 R >>\nstartxref\n{xref_position}\n%%EOF\n"
+        ).encode())
@@ -0,0 +1,172 @@
+import base64
+import binascii
+import hashlib
+import json
+import mmap
+import struct
+import zipfile
+
+from atomic_write import atomic_open
+from blob_store import BLOB_PREFIX, is_blob_ref, parse_blob_ref
+
+ARCHIVE_EXTENSION = '.sbz'
+METADATA_MEMBER = 'scrapbook.json'
+IMAGE_DIR = 'images/'
+
+# Local file header ZIP: 30 byte tetap, panjang nama di offset 26, extra di 28
+_LOCAL_HEADER = struct.Struct('<4s22xHH')
+
+def _pack_src(src, images, blob_store=None):
+    """
+    Memindahkan src foto ke member gambar archive jika bisa dikembalikan persis
+
+    Returns:
+        Referensi gambar di archive, atau src apa adanya
+    """
+    # Handle gambar (mis. ScrapbookImage) dikemas dari data URL-nya
+    to_data_url = getattr(src, 'to_data_url', None)
+    if to_data_url:
+        src = to_data_url()
+
+    if is_blob_ref(src) and blob_store is not None:
+        _, digest = parse_blob_ref(src)
+        images.setdefault(digest, blob_store.read(src))
+        return src
+
+    if not isinstance(src, str) or not src.startswith('data:'):
+        return src
+    header, _, payload = src.partition(',')
+    if not header.endswith(';base64'):
+        return src
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        return src
+    # Hanya base64 kanonik yang dipindah, supaya load menghasilkan string yang sama
+    if base64.b64encode(data).decode() != payload:
+        return src
+
+    digest = hashlib.sha256(data).hexdigest()
+    images.setdefault(digest, data)
+    mime_type = header[len('data:'):-len(';base64')]
+    return f"{BLOB_PREFIX}{mime_type};sha256,{digest}"
+
+def save_archive(scrapbook_data, path, blob_store=None):
+    """
+    Menyimpan scrapbook sebagai archive ZIP
+
+    Metadata disimpan sebagai JSON ringkas (tanpa indentasi, terkompresi),
+    foto disimpan sebagai member terpisah tanpa kompresi sehingga bisa
+    dibaca langsung lewat mmap. Foto yang sama hanya disimpan sekali.
+
+    Args:
+        scrapbook_data: Dictionary berisi data scrapbook
+        path: Path file archive
+        blob_store: BlobStore untuk foto yang berupa referensi blob (optional)
+
+    Returns:
+        Path file archive
+    """
+    images = {}
+    stored = dict(scrapbook_data)
+    if 'pages' in scrapbook_data:
+        stored['pages'] = [
+            dict(page, photos=[
+                dict(photo, src=_pack_src(photo['src'], images, blob_store)) if 'src' in photo else photo
+                for photo in page['photos']
+            ]) if 'photos' in page else page
+            for page in scrapbook_data['pages']
+        ]
+
+    metadata = json.dumps(stored, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    with atomic_open(path, 'wb') as f, zipfile.ZipFile(f, 'w') as archive:
+        for digest, data in images.items():
+            archive.writestr(IMAGE_DIR + digest, data, compress_type=zipfile.ZIP_STORED)
+        archive.writestr(METADATA_MEMBER, metadata, compress_type=zipfile.ZIP_DEFLATED)
+    return path
+
+class ScrapbookArchive:
+    """
+    Pembaca archive scrapbook berbasis mmap
+
+    Member gambar disimpan tanpa kompresi, jadi read_image() mengembalikan
+    memoryview langsung ke isi file tanpa menyalin bytes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._zip = zipfile.ZipFile(self._file)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = {}
+        self._data = None
+
+    @property
+    def data(self):
+        """Dictionary scrapbook dengan src foto berupa referensi gambar archive"""
+        if self._data is None:
+            self._data = self._read_metadata()
+        return self._data
+
+    def _read_metadata(self):
+        return json.loads(self._zip.read(METADATA_MEMBER).decode('utf-8'))
+
+    def read_image(self, ref):
+        """
+        Isi gambar dari referensinya, tanpa salinan
+
+        memoryview harus dilepas sebelum close() dipanggil.
+
+        Returns:
+            memoryview ke dalam mmap archive
+        """
+        _, digest = parse_blob_ref(ref)
+        span = self._offsets.get(digest)
+        if span is None:
+            info = self._zip.getinfo(IMAGE_DIR + digest)
+            if info.compress_type != zipfile.ZIP_STORED:
+                return memoryview(self._zip.read(info))
+            _, name_length, extra_length = _LOCAL_HEADER.unpack_from(self._mmap, info.header_offset)
+            start = info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
+            span = self._offsets[digest] = (start, start + info.file_size)
+        return memoryview(self._mmap)[span[0]:span[1]]
+
+    def to_data_url(self, ref):
+        mime_type, _ = parse_blob_ref(ref)
+        return f"data:{mime_type};base64,{base64.b64encode(self.read_image(ref)).decode()}"
+
+    def resolve(self):
+        """Dictionary scrapbook dengan foto dikembalikan menjadi data URL"""
+        data = self._read_metadata()
+        # Referensi blob yang gambarnya tidak ikut dikemas dibiarkan apa adanya
+        names = set(self._zip.namelist())
+        for page in data.get('pages', []):
+            for photo in page.get('photos', []):
+                src = photo.get('src')
+                if is_blob_ref(src) and IMAGE_DIR + parse_blob_ref(src)[1] in names:
+                    photo['src'] = self.to_data_url(src)
+        return data
+
+    def close(self):
+        self._mmap.close()
+        self._zip.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def load_archive(path):
+    """
+    Memuat archive scrapbook dengan foto sebagai data URL
+
+    Hasilnya sama persis dengan data yang disimpan lewat save_archive().
+
+    Returns:
+        Dictionary berisi data scrapbook
+    """
+    with ScrapbookArchive(path) as archive:
+        return archive.resolve()
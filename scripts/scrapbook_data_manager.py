@@ -1,15 +1,71 @@
 import json
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from atomic_write import GroupCommitWriter, atomic_open, atomic_write
+from blob_store import BlobStore, is_blob_ref, parse_blob_ref
+from image_derivatives import DerivativeStore
+from image_processor import json_default
+from html_export import SITE_IMAGE_WIDTHS, split_data_url, write_html, write_html_site
+from scrapbook_index import ScrapbookIndex, summarize_scrapbook
+import scrapbook_journal
+from scrapbook_archive import ARCHIVE_EXTENSION, ScrapbookArchive, load_archive, save_archive
+
+INDEX_FILENAME = 'scrapbook_index.sqlite3'
+# Batas total panjang data URL yang referensi blob-nya diingat (LRU)
+BLOB_REF_MEMO_BYTES = 64 * 1024 * 1024
+
+def _image_src(src):
+    """Handle gambar (mis. ScrapbookImage) diubah ke data URL di batas ekspor"""
+    to_data_url = getattr(src, 'to_data_url', None)
+    return to_data_url() if to_data_url else src
+
 class ScrapbookDataManager:
     """
     Mengelola data scrapbook untuk aplikasi vanilla JavaScript
     """
     
-    def __init__(self, data_dir="scrapbook_data"):
+    def __init__(self, data_dir="scrapbook_data", blob_dir=None,
+                 journal_limit=1024 * 1024, background_compaction=True,
+                 group_commit_window=None, derivative_dir=None):
+        """
+        Args:
+            data_dir: Direktori file JSON scrapbook
+            blob_dir: Direktori blob foto (default: <data_dir>_blobs di sebelahnya)
+            journal_limit: Ukuran journal (byte) minimum sebelum dipadatkan
+                           ke snapshot
+            background_compaction: Padatkan journal di thread terpisah
+            group_commit_window: Jika diisi (detik), save penuh dalam satu
+                                 window digabung menjadi satu fsync
+            derivative_dir: Jika diisi, foto baru di blob store langsung
+                            dibuatkan derivatif 160/480/1200 px di sini
+                            (lihat image_derivatives)
+        """
         self.data_dir = data_dir
         self.ensure_data_directory()
+        
+        # State untuk save incremental: hash halaman terakhir per file
+        self.journal_limit = journal_limit
+        self.background_compaction = background_compaction
+        self._journal_states = {}
+        self._journal_lock = threading.Lock()
+        self._snapshot_versions = {}
+        self._compacting = set()
+        self._blob_refs = OrderedDict()
+        self._blob_refs_size = 0
+        self.writer = GroupCommitWriter(group_commit_window) if group_commit_window else None
+        
+        if blob_dir is None:
+            blob_dir = f"{os.path.normpath(data_dir)}_blobs"
+        self.blob_store = BlobStore(blob_dir)
+        self.derivatives = DerivativeStore(derivative_dir) if derivative_dir else None
+        
+        # Katalog metadata untuk list_scrapbooks; file yang berubah di luar
+        # manager (atau sebelum ada katalog) disesuaikan saat dibuka
+        self.index = ScrapbookIndex(os.path.join(data_dir, INDEX_FILENAME))
+        self.sync_index()
     
     def ensure_data_directory(self):
         """Memastikan direktori data ada"""
@@ -17,13 +73,87 @@ class ScrapbookDataManager:
             os.makedirs(self.data_dir)
             print(f"Created data directory: {self.data_dir}")
     
-    def save_scrapbook(self, scrapbook_data, filename=None):
+    def _externalize_photos(self, scrapbook_data):
+        """
+        Salinan scrapbook dengan src foto dipindahkan ke blob store
+        
+        Data asli tidak diubah; hanya halaman dan foto yang disalin.
+        """
+        stored = dict(scrapbook_data)
+        pages = []
+        for page in scrapbook_data.get('pages', []):
+            photos = []
+            for photo in page.get('photos', []):
+                src = _image_src(photo.get('src'))
+                if isinstance(src, str) and src.startswith('data:'):
+                    photo = dict(photo, src=self._blob_ref(src))
+                photos.append(photo)
+            pages.append(dict(page, photos=photos) if 'photos' in page else page)
+        if 'pages' in scrapbook_data:
+            stored['pages'] = pages
+        return stored
+    
+    def _blob_ref(self, data_url):
+        """Referensi blob untuk data URL, diingat supaya autosave tidak meng-hash ulang foto"""
+        ref = self._blob_refs.get(data_url)
+        if ref is not None:
+            self._blob_refs.move_to_end(data_url)
+            return ref
+        
+        ref = self.blob_store.put_data_url(data_url)
+        if self.derivatives and is_blob_ref(ref):
+            # Derivatif dibuat sekali saat foto masuk
+            digest = parse_blob_ref(ref)[1]
+            if self.derivatives.manifest(digest) is None:
+                self.derivatives.generate(self.blob_store.read(ref), digest)
+        
+        # Dibatasi dalam byte: data URL foto yang sudah diganti tidak boleh
+        # tertahan di memori sepanjang sesi autosave
+        if len(data_url) <= BLOB_REF_MEMO_BYTES:
+            self._blob_refs[data_url] = ref
+            self._blob_refs_size += len(data_url)
+            while self._blob_refs_size > BLOB_REF_MEMO_BYTES:
+                evicted, _ = self._blob_refs.popitem(last=False)
+                self._blob_refs_size -= len(evicted)
+        return ref
+    
+    def resolve_src(self, src):
+        """
+        Mengubah src foto (referensi blob atau handle gambar) menjadi data URL
+        
+        Args:
+            src: Referensi blob, data URL, atau handle gambar
+        
+        Returns:
+            Data URL (atau src apa adanya jika bukan blob / handle)
+        """
+        if is_blob_ref(src):
+            return self.blob_store.to_data_url(src)
+        return _image_src(src)
+    
+    def resolve_blobs(self, scrapbook_data):
+        """Mengganti semua referensi blob foto dengan data URL (in-place)"""
+        for page in scrapbook_data.get('pages', []):
+            for photo in page.get('photos', []):
+                if is_blob_ref(photo.get('src')):
+                    photo['src'] = self.blob_store.to_data_url(photo['src'])
+        return scrapbook_data
+    
+    def save_scrapbook(self, scrapbook_data, filename=None, incremental=False):
         """
         Menyimpan data scrapbook ke file JSON
         
+        Foto base64 disimpan sekali di blob store dan JSON hanya berisi
+        referensi hash-nya, jadi foto yang sama tidak tersimpan berulang.
+        
+        Dengan incremental=True (untuk autosave) hanya halaman yang berubah
+        sejak save terakhir yang ditambahkan ke journal <file>.journal;
+        journal dipadatkan ke snapshot JSON setelah melewati journal_limit.
+        
         Args:
             scrapbook_data: Dictionary berisi data scrapbook
             filename: Nama file (optional)
+            incremental: Simpan perubahan saja jika snapshot sudah ada
         
         Returns:
             Path file yang disimpan
@@ -37,13 +167,41 @@ class ScrapbookDataManager:
         # Add metadata
         scrapbook_data['metadata'] = {
             'saved_at': datetime.now().isoformat(),
-            'version': '1.0',
-            'app_type': 'vanilla_js_scrapbook'
+            'version': '1.1',
+            'app_type': 'vanilla_js_scrapbook',
+            'blob_dir': os.path.relpath(self.blob_store.directory, self.data_dir)
         }
+        if self.derivatives:
+            scrapbook_data['metadata']['derivative_dir'] = os.path.relpath(self.derivatives.directory,
+                                                                           self.data_dir)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(scrapbook_data, f, indent=2, ensure_ascii=False)
+            stored_data = self._externalize_photos(scrapbook_data)
+            
+            if incremental and (os.path.exists(filepath) or self._pending_write(filepath)):
+                return self._save_delta(stored_data, filename, filepath)
+            
+            with self._journal_lock:
+                if self.writer:
+                    payload = json.dumps(stored_data, indent=2, ensure_ascii=False, default=json_default)
+                    size = len(payload.encode('utf-8'))
+                    mtime_ns = None
+                    # Journal lama baru dihapus setelah snapshot benar-benar tertulis
+                    self.writer.write(filepath, payload,
+                                      on_commit=lambda: self._snapshot_committed(filename, filepath))
+                else:
+                    with atomic_open(filepath, 'w') as f:
+                        json.dump(stored_data, f, indent=2, ensure_ascii=False, default=json_default)
+                    # Snapshot baru menggantikan journal lama
+                    self._remove_journal(filepath)
+                    size, mtime_ns = self._file_state(filepath)
+                self._snapshot_versions[filepath] = self._snapshot_versions.get(filepath, 0) + 1
+                if incremental:
+                    self._journal_states[filepath] = scrapbook_journal.snapshot_state(stored_data, json_default)
+                else:
+                    self._journal_states.pop(filepath, None)
+            
+            self.index.upsert(filename, summarize_scrapbook(stored_data), size, mtime_ns)
             
             print(f"✅ Scrapbook saved to: {filepath}")
             return filepath
@@ -52,24 +210,151 @@ class ScrapbookDataManager:
             print(f"❌ Error saving scrapbook: {e}")
             return None
     
-    def load_scrapbook(self, filename):
+    def _remove_journal(self, filepath):
+        journal_path = scrapbook_journal.journal_path(filepath)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+    
+    def _snapshot_committed(self, filename, filepath):
+        # Dipanggil group commit setelah snapshot tertulis
+        self._remove_journal(filepath)
+        self.index.update_size(filename, *self._file_state(filepath))
+    
+    def _file_state(self, filepath):
+        """Ukuran (snapshot + journal) dan mtime_ns terbaru sebuah file scrapbook"""
+        stat = os.stat(filepath)
+        size, mtime_ns = stat.st_size, stat.st_mtime_ns
+        try:
+            journal = os.stat(scrapbook_journal.journal_path(filepath))
+        except FileNotFoundError:
+            return size, mtime_ns
+        return size + journal.st_size, max(mtime_ns, journal.st_mtime_ns)
+    
+    def _pending_write(self, filepath):
+        return self.writer is not None and self.writer.pending(filepath)
+    
+    def _flush_pending(self, filepath):
+        """Memastikan snapshot yang masih tertunda di group commit sudah tertulis"""
+        if self.writer is not None:
+            self.writer.flush(filepath)
+    
+    def flush(self):
+        """Menulis semua save yang masih tertunda di group commit"""
+        if self.writer is not None:
+            self.writer.flush()
+    
+    def _save_delta(self, stored_data, filename, filepath):
+        """Menambahkan halaman yang berubah ke journal"""
+        with self._journal_lock:
+            self._flush_pending(filepath)
+            state = self._journal_states.get(filepath)
+            if state is None:
+                # Sekali per file: hash isi yang tersimpan sekarang
+                state = scrapbook_journal.snapshot_state(scrapbook_journal.load_scrapbook(filepath))
+            records, state = scrapbook_journal.diff_records(state, stored_data, json_default)
+            if records:
+                scrapbook_journal.append_records(filepath, records, json_default)
+            self._journal_states[filepath] = state
+            
+            snapshot_size = os.path.getsize(filepath)
+            journal_size = scrapbook_journal.journal_size(filepath)
+            # Di dalam lock agar tidak menimpa ukuran dari compaction yang lebih baru
+            self.index.upsert(filename, summarize_scrapbook(stored_data), *self._file_state(filepath))
+        
+        # Dipadatkan saat journal sudah sebanding dengan snapshot, jadi
+        # biaya penulisan ulang snapshot tetap teramortisasi
+        if journal_size > max(self.journal_limit, snapshot_size // 2):
+            if self.background_compaction:
+                threading.Thread(target=self.compact_scrapbook, args=(filename,), daemon=True).start()
+            else:
+                self.compact_scrapbook(filename)
+        
+        print(f"✅ Scrapbook changes saved to: {filepath} ({len(records)} records)")
+        return filepath
+    
+    def compact_scrapbook(self, filename):
         """
-        Memuat data scrapbook dari file JSON
+        Memadatkan journal ke snapshot JSON
+        
+        Snapshot baru ditulis di luar lock; save incremental yang masuk
+        selama itu tetap ditambahkan ke journal dan dipindahkan ke journal
+        baru setelah snapshot diganti.
         
         Args:
             filename: Nama file atau path lengkap
         
         Returns:
-            Dictionary berisi data scrapbook
+            Path file snapshot, atau None jika gagal / sedang dipadatkan
         """
-        if not os.path.dirname(filename):
-            filepath = os.path.join(self.data_dir, filename)
-        else:
-            filepath = filename
+        filepath = self._filepath(filename)
+        journal_path = scrapbook_journal.journal_path(filepath)
+        
+        with self._journal_lock:
+            self._flush_pending(filepath)
+            if filepath in self._compacting:
+                return None
+            self._compacting.add(filepath)
+            version = self._snapshot_versions.get(filepath, 0)
+            offset = scrapbook_journal.journal_size(filepath)
         
         try:
+            if offset == 0:
+                return filepath
+            
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            scrapbook_journal.apply_overlay(data, scrapbook_journal.read_overlay(filepath, offset))
+            payload = json.dumps(data, indent=2, ensure_ascii=False)
+            
+            with self._journal_lock:
+                if self._snapshot_versions.get(filepath, 0) != version:
+                    # Sudah ditimpa save penuh selama dipadatkan
+                    return None
+                
+                with open(journal_path, 'rb') as f:
+                    f.seek(offset)
+                    tail = f.read()
+                atomic_write(filepath, payload)
+                if tail:
+                    atomic_write(journal_path, tail)
+                else:
+                    os.remove(journal_path)
+                self._snapshot_versions[filepath] = version + 1
+                # Ringkasan katalog sudah dari save terakhir; hanya ukurannya yang berubah
+                self.index.update_size(filename, *self._file_state(filepath))
+            
+            print(f"🗜️ Compacted scrapbook journal: {filepath}")
+            return filepath
+            
+        except Exception as e:
+            print(f"❌ Error compacting scrapbook: {e}")
+            return None
+        finally:
+            with self._journal_lock:
+                self._compacting.discard(filepath)
+    
+    def load_scrapbook(self, filename, resolve_blobs=True):
+        """
+        Memuat data scrapbook dari file JSON
+        
+        Args:
+            filename: Nama file atau path lengkap
+            resolve_blobs: True (default) untuk mengganti referensi blob foto
+                           dengan data URL, sehingga hasilnya bisa langsung
+                           diekspor; False untuk membiarkan referensi blob
+                           (dibaca saat dibutuhkan lewat resolve_src())
+        
+        Returns:
+            Dictionary berisi data scrapbook
+        """
+        filepath = self._filepath(filename)
+        
+        try:
+            self._flush_pending(filepath)
+            data = scrapbook_journal.load_scrapbook(filepath)
+            
+            if resolve_blobs:
+                self.resolve_blobs(data)
             
             print(f"✅ Scrapbook loaded from: {filepath}")
             return data
@@ -78,25 +363,226 @@ class ScrapbookDataManager:
             print(f"❌ Error loading scrapbook: {e}")
             return None
     
-    def list_scrapbooks(self):
+    def save_scrapbook_archive(self, scrapbook_data, filename=None):
+        """
+        Menyimpan scrapbook sebagai archive biner (.sbz)
+        
+        Metadata berupa JSON ringkas, foto berupa member ZIP tanpa kompresi
+        yang bisa dibaca lewat mmap. Alternatif untuk save_scrapbook().
+        
+        Args:
+            scrapbook_data: Dictionary berisi data scrapbook
+            filename: Nama file (optional)
+        
+        Returns:
+            Path file yang disimpan
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"scrapbook_{timestamp}{ARCHIVE_EXTENSION}"
+        
+        filepath = os.path.join(self.data_dir, filename)
+        
+        scrapbook_data['metadata'] = {
+            'saved_at': datetime.now().isoformat(),
+            'version': '1.1',
+            'app_type': 'vanilla_js_scrapbook',
+            'format': 'archive'
+        }
+        
+        try:
+            save_archive(scrapbook_data, filepath, self.blob_store)
+            
+            self.index.upsert(filename, summarize_scrapbook(scrapbook_data), *self._file_state(filepath))
+            
+            print(f"✅ Scrapbook archive saved to: {filepath}")
+            return filepath
+            
+        except Exception as e:
+            print(f"❌ Error saving scrapbook archive: {e}")
+            return None
+    
+    def load_scrapbook_archive(self, filename):
+        """
+        Memuat scrapbook dari archive biner (.sbz)
+        
+        Returns:
+            Dictionary berisi data scrapbook dengan foto sebagai data URL
+        """
+        filepath = self._filepath(filename)
+        
+        try:
+            data = load_archive(filepath)
+            print(f"✅ Scrapbook archive loaded from: {filepath}")
+            return data
+            
+        except Exception as e:
+            print(f"❌ Error loading scrapbook archive: {e}")
+            return None
+    
+    def _filepath(self, filename):
+        if not os.path.dirname(filename):
+            return os.path.join(self.data_dir, filename)
+        return filename
+    
+    def iter_pages(self, filename):
+        """
+        Menghasilkan halaman scrapbook satu per satu tanpa memuat seluruh file
+        
+        Args:
+            filename: Nama file atau path lengkap
+        
+        Yields:
+            Dictionary halaman (src foto tetap berupa referensi blob)
+        """
+        self._flush_pending(self._filepath(filename))
+        return scrapbook_journal.iter_pages(self._filepath(filename))
+    
+    def load_scrapbook_header(self, filename):
+        """
+        Memuat field level atas scrapbook (title, metadata, ...) tanpa halaman
+        
+        Returns:
+            Dictionary ditambah 'page_count'
+        """
+        self._flush_pending(self._filepath(filename))
+        return scrapbook_journal.read_header(self._filepath(filename))
+    
+    def export_file_to_html(self, filename, output_file="scrapbook_export.html"):
+        """
+        Mengekspor file scrapbook ke HTML dengan membaca halaman secara bertahap
+        
+        Args:
+            filename: Nama file atau path lengkap scrapbook JSON
+            output_file: Nama file output HTML
+        
+        Returns:
+            Path file HTML yang dibuat
+        """
+        try:
+            scrapbook_data = self.load_scrapbook_header(filename)
+        except Exception as e:
+            print(f"❌ Error reading scrapbook: {e}")
+            return None
+        scrapbook_data['pages'] = self.iter_pages(filename)
+        return self.export_to_html(scrapbook_data, output_file)
+    
+    def rebuild_index(self):
+        """
+        Membangun ulang katalog dari semua file JSON dan archive di data_dir
+        
+        Biasanya tidak perlu dipanggil: sync_index() saat manager dibuka
+        sudah mengindeks file yang baru atau berubah.
+        
+        Returns:
+            Jumlah scrapbook yang diindeks
+        """
+        entries = []
+        for file in os.listdir(self.data_dir):
+            if file.endswith(('.json', ARCHIVE_EXTENSION)):
+                entry = self._index_entry(file)
+                if entry:
+                    entries.append(entry)
+        
+        self.index.upsert_many(entries)
+        if entries:
+            print(f"🗂️ Indexed {len(entries)} scrapbooks")
+        return len(entries)
+    
+    def sync_index(self):
+        """
+        Menyesuaikan katalog dengan file di data_dir
+        
+        File yang ditambah, diubah atau dihapus di luar save_scrapbook()
+        dikenali dari ukuran dan mtime-nya: file baru atau berubah diindeks
+        ulang, entri yang filenya sudah tidak ada dihapus.
+        
+        Returns:
+            Tuple (jumlah entri yang diindeks ulang, jumlah entri yang dihapus)
+        """
+        stored = self.index.file_states()
+        names = set(stored)
+        names.update(file for file in os.listdir(self.data_dir) if file.endswith(('.json', ARCHIVE_EXTENSION)))
+        
+        entries = []
+        removed = []
+        for name in sorted(names):
+            filepath = self._filepath(name)
+            if self._pending_write(filepath):
+                continue
+            if not os.path.exists(filepath):
+                removed.append(name)
+            elif stored.get(name) != self._file_state(filepath):
+                entry = self._index_entry(name)
+                if entry:
+                    entries.append(entry)
+        
+        self.index.upsert_many(entries)
+        self.index.remove_many(removed)
+        if entries or removed:
+            print(f"🗂️ Index synced: {len(entries)} indexed, {len(removed)} removed")
+        return len(entries), len(removed)
+    
+    def _index_entry(self, filename):
+        """Entri katalog (filename, summary, size, mtime_ns) dari isi file, atau None jika gagal dibaca"""
+        filepath = self._filepath(filename)
+        try:
+            if filename.endswith(ARCHIVE_EXTENSION):
+                with ScrapbookArchive(filepath) as archive:
+                    summary = summarize_scrapbook(archive.data)
+            else:
+                summary = summarize_scrapbook(scrapbook_journal.load_scrapbook(filepath))
+        except Exception as e:
+            print(f"⚠️ Skipping {filename}: {e}")
+            return None
+        if not summary['saved_at']:
+            summary['saved_at'] = datetime.fromtimestamp(os.path.getmtime(filepath)).isoformat()
+        return (filename, summary) + self._file_state(filepath)
+    
+    def query_scrapbooks(self, limit=None, offset=0, sort_by='filename', descending=True,
+                         theme=None, title_contains=None, min_pages=None):
+        """
+        Mengambil metadata scrapbook dari katalog tanpa membuka file JSON
+        
+        Args:
+            limit: Jumlah entri per halaman (None = semua)
+            offset: Jumlah entri yang dilewati
+            sort_by: 'filename', 'title', 'page_count', 'photo_count',
+                     'theme', 'size' atau 'saved_at'
+            descending: Urutan menurun (default: terbaru dulu)
+            theme: Filter tema
+            title_contains: Filter judul (substring)
+            min_pages: Filter jumlah halaman minimum
+        
+        Returns:
+            List of dictionaries (filename, title, page_count, photo_count,
+            theme, size, saved_at)
+        """
+        return self.index.query(limit, offset, sort_by, descending, theme, title_contains, min_pages)
+    
+    def list_scrapbooks(self, limit=None, offset=0, sort_by='filename', descending=True,
+                        theme=None, title_contains=None, min_pages=None):
         """
         Menampilkan daftar file scrapbook yang tersimpan
         
+        Args:
+            Sama dengan query_scrapbooks()
+        
         Returns:
             List of scrapbook files
         """
         try:
-            files = [f for f in os.listdir(self.data_dir) if f.endswith('.json')]
-            files.sort(reverse=True)  # Newest first
+            entries = self.query_scrapbooks(limit, offset, sort_by, descending,
+                                            theme, title_contains, min_pages)
+            total = self.index.count(theme, title_contains, min_pages)
             
-            print(f"📚 Found {len(files)} scrapbook files:")
-            for i, file in enumerate(files, 1):
-                filepath = os.path.join(self.data_dir, file)
-                size = os.path.getsize(filepath)
-                modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-                print(f"  {i}. {file} ({size} bytes, modified: {modified.strftime('%Y-%m-%d %H:%M')})")
+            print(f"📚 Found {total} scrapbook files:")
+            for i, entry in enumerate(entries, offset + 1):
+                saved_at = (entry['saved_at'] or '')[:16].replace('T', ' ')
+                print(f"  {i}. {entry['filename']} - {entry['title']} "
+                      f"({entry['page_count']} pages, {entry['size']} bytes, saved: {saved_at})")
             
-            return files
+            return [entry['filename'] for entry in entries]
             
         except Exception as e:
             print(f"❌ Error listing scrapbooks: {e}")
@@ -106,6 +592,9 @@ class ScrapbookDataManager:
         """
         Mengekspor scrapbook ke file HTML standalone
         
+        Memori tetap datar untuk 'pages' berupa iterator: setiap halaman dan
+        fotonya ditulis lalu dilepas sebelum halaman berikutnya dibaca.
+        
         Args:
             scrapbook_data: Data scrapbook
             output_file: Nama file output HTML
@@ -113,122 +602,11 @@ class ScrapbookDataManager:
         Returns:
             Path file HTML yang dibuat
         """
-        html_template = """
-<!DOCTYPE html>
-<html lang="id">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>📖 {title}</title>
-    <style>
-        body {{
-            font-family: 'Arial', sans-serif;
-            background: linear-gradient(135deg, #fef3c7 0%, #fed7aa 50%, #fecaca 100%);
-            margin: 0;
-            padding: 20px;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 800px;
-            margin: 0 auto;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 2rem;
-        }}
-        .title {{
-            font-size: 2.5rem;
-            color: #92400e;
-            margin-bottom: 0.5rem;
-        }}
-        .page {{
-            background: white;
-            border-radius: 0.75rem;
-            padding: 2rem;
-            margin-bottom: 2rem;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            position: relative;
-            min-height: 400px;
-        }}
-        .page-number {{
-            position: absolute;
-            bottom: 1rem;
-            right: 1rem;
-            color: #6b7280;
-            font-size: 0.9rem;
-        }}
-        .photo {{
-            position: absolute;
-            border: 4px solid white;
-            border-radius: 0.25rem;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-        }}
-        .photo img {{
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-            border-radius: 0.125rem;
-        }}
-        .text {{
-            position: absolute;
-            font-family: 'Dancing Script', cursive;
-            font-weight: 600;
-        }}
-        .sticker {{
-            position: absolute;
-            font-size: 2rem;
-        }}
-        @import url('https://fonts.googleapis.com/css2?family=Dancing+Script:wght@400;500;600;700&display=swap');
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 class="title">📖 {title}</h1>
-            <p>Dibuat pada: {created_date}</p>
-        </div>
-        {pages_html}
-    </div>
-</body>
-</html>
-        """
-        
         try:
-            title = scrapbook_data.get('title', 'My Digital Scrapbook')
-            created_date = datetime.now().strftime('%d %B %Y')
-            
-            pages_html = ""
-            for i, page in enumerate(scrapbook_data.get('pages', []), 1):
-                page_html = f'<div class="page">\n'
-                page_html += f'  <div class="page-number">Halaman {i}</div>\n'
-                
-                # Add photos
-                for photo in page.get('photos', []):
-                    style = f"left: {photo['x']}px; top: {photo['y']}px; width: {photo['width']}px; height: {photo['height']}px; transform: rotate({photo['rotation']}deg);"
-                    page_html += f'  <div class="photo" style="{style}"><img src="{photo['src']}" alt="Photo"></div>\n'
-                
-                # Add texts
-                for text in page.get('texts', []):
-                    style = f"left: {text['x']}px; top: {text['y']}px; font-size: {text['fontSize']}px; color: {text['color']}; font-family: {text['fontFamily']};"
-                    page_html += f'  <div class="text" style="{style}">{text['content']}</div>\n'
-                
-                # Add stickers
-                for sticker in page.get('stickers', []):
-                    style = f"left: {sticker['x']}px; top: {sticker['y']}px; font-size: {sticker['size']}px;"
-                    page_html += f'  <div class="sticker" style="{style}">{sticker['emoji']}</div>\n'
-                
-                page_html += '</div>\n'
-                pages_html += page_html
-            
-            html_content = html_template.format(
-                title=title,
-                created_date=created_date,
-                pages_html=pages_html
-            )
-            
+            # Ditulis langsung ke file halaman demi halaman (lihat html_export)
             output_path = os.path.join(self.data_dir, output_file)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            with atomic_open(output_path, 'w') as f:
+                write_html(f, scrapbook_data, self.resolve_src)
             
             print(f"✅ HTML export created: {output_path}")
             return output_path
@@ -236,6 +614,61 @@ class ScrapbookDataManager:
         except Exception as e:
             print(f"❌ Error exporting to HTML: {e}")
             return None
+    
+    def image_data(self, src):
+        """
+        Bytes gambar sebuah src foto (referensi blob, data URL, atau handle)
+        
+        Returns:
+            Tuple (mime_type, bytes), atau None jika src bukan gambar tersimpan
+            (mis. URL)
+        """
+        if is_blob_ref(src):
+            mime_type, _ = parse_blob_ref(src)
+            return mime_type, self.blob_store.read(src)
+        return split_data_url(_image_src(src))
+    
+    def export_html_site(self, scrapbook_data, output_dir="scrapbook_site", widths=SITE_IMAGE_WIDTHS):
+        """
+        Mengekspor scrapbook ke situs HTML multi-file dengan gambar terpisah
+        
+        Setiap halaman menjadi file HTML sendiri (dengan link sebelumnya /
+        berikutnya) dan foto ditulis sekali ke images/ beserta varian
+        srcset-nya, dimuat dengan loading="lazy". Lihat
+        html_export.write_html_site().
+        
+        Args:
+            scrapbook_data: Data scrapbook ('pages' boleh berupa iterator)
+            output_dir: Nama direktori output (di dalam data_dir)
+            widths: Lebar varian gambar (px), kosong untuk tanpa varian;
+                    diabaikan jika derivative_dir diisi (tangga derivatif dipakai)
+        
+        Returns:
+            Dictionary laporan ukuran (ditambah 'path'), atau None jika gagal
+        """
+        try:
+            output_path = os.path.join(self.data_dir, output_dir)
+            report = write_html_site(scrapbook_data, output_path, self.image_data, widths,
+                                     derivatives=self.derivatives)
+            report['path'] = output_path
+            
+            print(f"✅ HTML site export created: {output_path} ({report['pages']} pages, "
+                  f"{report['total_bytes'] / 1e6:.1f} MB; inline export: {report['inline_bytes'] / 1e6:.1f} MB)")
+            return report
+            
+        except Exception as e:
+            print(f"❌ Error exporting HTML site: {e}")
+            return None
+    
+    def export_file_to_html_site(self, filename, output_dir="scrapbook_site", widths=SITE_IMAGE_WIDTHS):
+        """Versi export_html_site() yang membaca halaman file scrapbook secara bertahap"""
+        try:
+            scrapbook_data = self.load_scrapbook_header(filename)
+        except Exception as e:
+            print(f"❌ Error reading scrapbook: {e}")
+            return None
+        scrapbook_data['pages'] = self.iter_pages(filename)
+        return self.export_html_site(scrapbook_data, output_dir, widths)
 
 # Example usage
 if __name__ == "__main__":
@@ -302,7 +735,13 @@ if __name__ == "__main__":
     
     print("\n✅ Data manager ready!")
     print("Available methods:")
-    print("  - save_scrapbook(data, filename)")
-    print("  - load_scrapbook(filename)")
-    print("  - list_scrapbooks()")
+    print("  - save_scrapbook(data, filename, incremental) / compact_scrapbook(filename)")
+    print("  - flush()  (with group_commit_window)")
+    print("  - load_scrapbook(filename, resolve_blobs)")
+    print("  - save_scrapbook_archive(data, filename) / load_scrapbook_archive(filename)")
+    print("  - resolve_src(src)")
+    print("  - list_scrapbooks(limit, offset, sort_by, ...)")
+    print("  - query_scrapbooks(...) / rebuild_index()")
     print("  - export_to_html(data, output_file)")
+    print("  - iter_pages(filename) / export_file_to_html(filename, output_file)")
+    print("  - export_html_site(data, output_dir) / export_file_to_html_site(filename, output_dir)")
@@ -1,313 +1,479 @@
 import json
 import base64
+import os
 from PIL import Image, ImageDraw, ImageFont
 import io
 import random
+from collections import namedtuple
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 
-def generate_scrapbook_template(theme='vintage', pages=5):
+from image_cache import resolve_cache
+from image_processor import ScrapbookImage, json_default, load_image
+
+# Definisi tema bawaan; registry immutable dibangun sekali dari sini
+# (lihat theme_registry())
+BUILTIN_THEMES = {
+    'vintage': {
+        'name': 'Vintage Classic',
+        'colors': ['bg-amber-50', 'bg-orange-50', 'bg-yellow-50', 'bg-red-50'],
+        'text_colors': ['#8B4513', '#A0522D', '#CD853F', '#D2691E'],
+        'fonts': ['serif', 'cursive'],
+        'decorations': ['🌸', '🍂', '📜', '🕯️', '🗝️', '📸', '🎭', '🌹'],
+        'sticker_sets': [
+            ['🌸', '🍂', '📜'],
+            ['🕯️', '🗝️', '📸'],
+            ['🎭', '🌹', '💌']
+        ],
+        'text_suggestions': [
+            'Kenangan Indah',
+            'Masa Lalu yang Berharga',
+            'Cerita Klasik',
+            'Nostalgia'
+        ]
+    },
+    'modern': {
+        'name': 'Modern Minimalist',
+        'colors': ['bg-white', 'bg-gray-50', 'bg-slate-50', 'bg-zinc-50'],
+        'text_colors': ['#374151', '#4B5563', '#6B7280', '#1F2937'],
+        'fonts': ['sans-serif', 'monospace'],
+        'decorations': ['⭐', '💫', '🔸', '🔹', '◆', '▲', '●', '■'],
+        'sticker_sets': [
+            ['⭐', '💫', '🔸'],
+            ['🔹', '◆', '▲'],
+            ['●', '■', '◇']
+        ],
+        'text_suggestions': [
+            'Clean & Simple',
+            'Modern Life',
+            'Minimalist',
+            'Contemporary'
+        ]
+    },
+    'cute': {
+        'name': 'Cute & Sweet',
+        'colors': ['bg-pink-50', 'bg-rose-50', 'bg-purple-50', 'bg-indigo-50'],
+        'text_colors': ['#EC4899', '#F472B6', '#A855F7', '#8B5CF6'],
+        'fonts': ['cursive', 'fantasy'],
+        'decorations': ['🌸', '🦋', '💕', '🌈', '🎀', '🧸', '🍭', '⭐'],
+        'sticker_sets': [
+            ['🌸', '🦋', '💕'],
+            ['🌈', '🎀', '🧸'],
+            ['🍭', '⭐', '💖']
+        ],
+        'text_suggestions': [
+            'Sweet Memories',
+            'Kawaii Moments',
+            'Cute Adventures',
+            'Lovely Times'
+        ]
+    },
+    'nature': {
+        'name': 'Nature Fresh',
+        'colors': ['bg-green-50', 'bg-emerald-50', 'bg-teal-50', 'bg-lime-50'],
+        'text_colors': ['#059669', '#10B981', '#14B8A6', '#65A30D'],
+        'fonts': ['serif', 'cursive'],
+        'decorations': ['🌿', '🌱', '🍃', '🌳', '🌻', '🦋', '🌺', '🍀'],
+        'sticker_sets': [
+            ['🌿', '🌱', '🍃'],
+            ['🌳', '🌻', '🦋'],
+            ['🌺', '🍀', '🌸']
+        ],
+        'text_suggestions': [
+            'Natural Beauty',
+            'Green Adventures',
+            'Nature Walks',
+            'Outdoor Memories'
+        ]
+    },
+    'travel': {
+        'name': 'Travel Adventure',
+        'colors': ['bg-blue-50', 'bg-sky-50', 'bg-cyan-50', 'bg-indigo-50'],
+        'text_colors': ['#2563EB', '#0EA5E9', '#06B6D4', '#4F46E5'],
+        'fonts': ['sans-serif', 'serif'],
+        'decorations': ['✈️', '🗺️', '🧳', '📍', '🏔️', '🏖️', '🚗', '📷'],
+        'sticker_sets': [
+            ['✈️', '🗺️', '🧳'],
+            ['📍', '🏔️', '🏖️'],
+            ['🚗', '📷', '🌍']
+        ],
+        'text_suggestions': [
+            'Adventure Awaits',
+            'Travel Memories',
+            'Journey Stories',
+            'Wanderlust'
+        ]
+    },
+    'birthday': {
+        'name': 'Birthday Party',
+        'colors': ['bg-yellow-50', 'bg-orange-50', 'bg-red-50', 'bg-pink-50'],
+        'text_colors': ['#F59E0B', '#EF4444', '#EC4899', '#8B5CF6'],
+        'fonts': ['cursive', 'fantasy'],
+        'decorations': ['🎉', '🎂', '🎈', '🎁', '🎊', '🥳', '🎵', '🌟'],
+        'sticker_sets': [
+            ['🎉', '🎂', '🎈'],
+            ['🎁', '🎊', '🥳'],
+            ['🎵', '🌟', '💫']
+        ],
+        'text_suggestions': [
+            'Happy Birthday!',
+            'Celebration Time',
+            'Party Memories',
+            'Special Day'
+        ]
+    }
+}
+
+DEFAULT_THEME = 'vintage'
+# Direktori tema tambahan: setiap <key>.json berisi definisi seperti di atas
+THEMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'themes')
+
+# Tema di registry: list definisi menjadi tuple (tabel pilihan untuk random.choice)
+Theme = namedtuple('Theme', ['key', 'name', 'colors', 'text_colors', 'fonts', 'decorations',
+                             'sticker_sets', 'text_suggestions'])
+
+def _freeze_theme(key, definition):
+    """Theme immutable dari dictionary definisi tema"""
+    missing = [field for field in Theme._fields[1:] if field not in definition]
+    if missing:
+        raise ValueError(f"Theme '{key}' is missing: {', '.join(missing)}")
+    return Theme(
+        key=key,
+        name=definition['name'],
+        colors=tuple(definition['colors']),
+        text_colors=tuple(definition['text_colors']),
+        fonts=tuple(definition['fonts']),
+        decorations=tuple(definition['decorations']),
+        sticker_sets=tuple(tuple(sticker_set) for sticker_set in definition['sticker_sets']),
+        text_suggestions=tuple(definition['text_suggestions']),
+    )
+
+@lru_cache(maxsize=None)
+def theme_registry(themes_dir=THEMES_DIR):
     """
-    Menghasilkan template scrapbook dengan tema tertentu
+    Registry tema yang dibangun sekali per direktori tema
+    
+    Berisi tema bawaan ditambah setiap <key>.json di themes_dir (jika ada),
+    jadi tema baru tidak perlu mengubah kode. Hasilnya read-only.
     
     Args:
-        theme: Tema scrapbook ('vintage', 'modern', 'cute', 'nature', 'travel', 'birthday')
-        pages: Jumlah halaman yang akan dibuat
+        themes_dir: Direktori file JSON tema (None untuk bawaan saja)
     
     Returns:
-        Dictionary berisi template scrapbook
+        Mapping read-only {key: Theme}
+    """
+    themes = {key: _freeze_theme(key, definition) for key, definition in BUILTIN_THEMES.items()}
+    
+    if themes_dir and os.path.isdir(themes_dir):
+        for filename in sorted(os.listdir(themes_dir)):
+            key, extension = os.path.splitext(filename)
+            if extension != '.json':
+                continue
+            try:
+                with open(os.path.join(themes_dir, filename), 'r', encoding='utf-8') as f:
+                    themes[key] = _freeze_theme(key, json.load(f))
+            except Exception as e:
+                print(f"⚠️ Skipping theme {filename}: {e}")
+    
+    return MappingProxyType(themes)
+
+def get_theme(theme):
+    """Theme dari registry (tema tidak dikenal memakai DEFAULT_THEME)"""
+    themes = theme_registry()
+    return themes.get(theme) or themes[DEFAULT_THEME]
+
+def _template_page(theme, selected_theme, page_number, rng=random):
     """
+    Satu halaman template dengan pilihan acak dari tabel tema
     
-    themes = {
-        'vintage': {
-            'name': 'Vintage Classic',
-            'colors': ['bg-amber-50', 'bg-orange-50', 'bg-yellow-50', 'bg-red-50'],
-            'text_colors': ['#8B4513', '#A0522D', '#CD853F', '#D2691E'],
-            'fonts': ['serif', 'cursive'],
-            'decorations': ['🌸', '🍂', '📜', '🕯️', '🗝️', '📸', '🎭', '🌹'],
-            'sticker_sets': [
-                ['🌸', '🍂', '📜'],
-                ['🕯️', '🗝️', '📸'],
-                ['🎭', '🌹', '💌']
-            ],
-            'text_suggestions': [
-                'Kenangan Indah',
-                'Masa Lalu yang Berharga',
-                'Cerita Klasik',
-                'Nostalgia'
-            ]
-        },
-        'modern': {
-            'name': 'Modern Minimalist',
-            'colors': ['bg-white', 'bg-gray-50', 'bg-slate-50', 'bg-zinc-50'],
-            'text_colors': ['#374151', '#4B5563', '#6B7280', '#1F2937'],
-            'fonts': ['sans-serif', 'monospace'],
-            'decorations': ['⭐', '💫', '🔸', '🔹', '◆', '▲', '●', '■'],
-            'sticker_sets': [
-                ['⭐', '💫', '🔸'],
-                ['🔹', '◆', '▲'],
-                ['●', '■', '◇']
-            ],
-            'text_suggestions': [
-                'Clean & Simple',
-                'Modern Life',
-                'Minimalist',
-                'Contemporary'
-            ]
-        },
-        'cute': {
-            'name': 'Cute & Sweet',
-            'colors': ['bg-pink-50', 'bg-rose-50', 'bg-purple-50', 'bg-indigo-50'],
-            'text_colors': ['#EC4899', '#F472B6', '#A855F7', '#8B5CF6'],
-            'fonts': ['cursive', 'fantasy'],
-            'decorations': ['🌸', '🦋', '💕', '🌈', '🎀', '🧸', '🍭', '⭐'],
-            'sticker_sets': [
-                ['🌸', '🦋', '💕'],
-                ['🌈', '🎀', '🧸'],
-                ['🍭', '⭐', '💖']
-            ],
-            'text_suggestions': [
-                'Sweet Memories',
-                'Kawaii Moments',
-                'Cute Adventures',
-                'Lovely Times'
-            ]
-        },
-        'nature': {
-            'name': 'Nature Fresh',
-            'colors': ['bg-green-50', 'bg-emerald-50', 'bg-teal-50', 'bg-lime-50'],
-            'text_colors': ['#059669', '#10B981', '#14B8A6', '#65A30D'],
-            'fonts': ['serif', 'cursive'],
-            'decorations': ['🌿', '🌱', '🍃', '🌳', '🌻', '🦋', '🌺', '🍀'],
-            'sticker_sets': [
-                ['🌿', '🌱', '🍃'],
-                ['🌳', '🌻', '🦋'],
-                ['🌺', '🍀', '🌸']
-            ],
-            'text_suggestions': [
-                'Natural Beauty',
-                'Green Adventures',
-                'Nature Walks',
-                'Outdoor Memories'
-            ]
-        },
-        'travel': {
-            'name': 'Travel Adventure',
-            'colors': ['bg-blue-50', 'bg-sky-50', 'bg-cyan-50', 'bg-indigo-50'],
-            'text_colors': ['#2563EB', '#0EA5E9', '#06B6D4', '#4F46E5'],
-            'fonts': ['sans-serif', 'serif'],
-            'decorations': ['✈️', '🗺️', '🧳', '📍', '🏔️', '🏖️', '🚗', '📷'],
-            'sticker_sets': [
-                ['✈️', '🗺️', '🧳'],
-                ['📍', '🏔️', '🏖️'],
-                ['🚗', '📷', '🌍']
-            ],
-            'text_suggestions': [
-                'Adventure Awaits',
-                'Travel Memories',
-                'Journey Stories',
-                'Wanderlust'
-            ]
+    rng: random.Random (atau modul random) sumber semua pilihan acak
+    """
+    # Random elements for each page
+    page_color = rng.choice(selected_theme.colors)
+    text_color = rng.choice(selected_theme.text_colors)
+    font_family = rng.choice(selected_theme.fonts)
+    sticker_set = rng.choice(selected_theme.sticker_sets)
+    text_suggestion = rng.choice(selected_theme.text_suggestions)
+    
+    return {
+        'id': page_number,
+        'background': page_color,
+        'suggested_layouts': generate_layout_suggestions(rng),
+        'decorations': list(sticker_set),
+        'text_suggestions': {
+            'content': f"{text_suggestion} - Halaman {page_number}",
+            'color': text_color,
+            'font_family': font_family
         },
-        'birthday': {
-            'name': 'Birthday Party',
-            'colors': ['bg-yellow-50', 'bg-orange-50', 'bg-red-50', 'bg-pink-50'],
-            'text_colors': ['#F59E0B', '#EF4444', '#EC4899', '#8B5CF6'],
-            'fonts': ['cursive', 'fantasy'],
-            'decorations': ['🎉', '🎂', '🎈', '🎁', '🎊', '🥳', '🎵', '🌟'],
-            'sticker_sets': [
-                ['🎉', '🎂', '🎈'],
-                ['🎁', '🎊', '🥳'],
-                ['🎵', '🌟', '💫']
-            ],
-            'text_suggestions': [
-                'Happy Birthday!',
-                'Celebration Time',
-                'Party Memories',
-                'Special Day'
-            ]
+        'theme_elements': {
+            'primary_color': text_color,
+            'font_family': font_family,
+            'decoration_style': theme
         }
     }
+
+def generate_scrapbook_template(theme='vintage', pages=5):
+    """
+    Menghasilkan template scrapbook dengan tema tertentu
     
-    selected_theme = themes.get(theme, themes['vintage'])
+    Args:
+        theme: Tema scrapbook ('vintage', 'modern', 'cute', 'nature', 'travel',
+               'birthday', atau tema dari THEMES_DIR)
+        pages: Jumlah halaman yang akan dibuat
     
-    print(f"Generating {selected_theme['name']} template with {pages} pages...")
+    Returns:
+        Dictionary berisi template scrapbook
+    """
+    selected_theme = get_theme(theme)
+    
+    print(f"Generating {selected_theme.name} template with {pages} pages...")
     
     template = {
         'theme': theme,
-        'theme_name': selected_theme['name'],
+        'theme_name': selected_theme.name,
         'created_at': datetime.now().isoformat(),
-        'pages': []
+        'pages': [_template_page(theme, selected_theme, page_num + 1) for page_num in range(pages)]
     }
     
-    for page_num in range(pages):
-        # Random elements for each page
-        page_color = random.choice(selected_theme['colors'])
-        text_color = random.choice(selected_theme['text_colors'])
-        font_family = random.choice(selected_theme['fonts'])
-        sticker_set = random.choice(selected_theme['sticker_sets'])
-        text_suggestion = random.choice(selected_theme['text_suggestions'])
-        
-        page = {
-            'id': page_num + 1,
-            'background': page_color,
-            'suggested_layouts': generate_layout_suggestions(),
-            'decorations': sticker_set,
-            'text_suggestions': {
-                'content': f"{text_suggestion} - Halaman {page_num + 1}",
-                'color': text_color,
-                'font_family': font_family
-            },
-            'theme_elements': {
-                'primary_color': text_color,
-                'font_family': font_family,
-                'decoration_style': theme
-            }
-        }
-        template['pages'].append(page)
-    
     print(f"✅ Template generated successfully!")
     return template
 
-def generate_layout_suggestions():
+# Saran layout; rotation foto berupa rentang (min, max) derajat yang diacak
+# setiap kali layout dipakai
+LAYOUTS = (
+    {
+        'name': 'Single Focus',
+        'description': 'Satu foto besar di tengah dengan teks di bawah',
+        'photo_positions': [
+            {
+                'x': 150, 
+                'y': 80, 
+                'width': 300, 
+                'height': 200,
+                'rotation': (-5, 5)
+            }
+        ],
+        'text_positions': [{'x': 200, 'y': 320}],
+        'sticker_positions': [
+            {'x': 400, 'y': 100},
+            {'x': 100, 'y': 250}
+        ]
+    },
+    {
+        'name': 'Dual Photos',
+        'description': 'Dua foto bersebelahan',
+        'photo_positions': [
+            {
+                'x': 50, 
+                'y': 100, 
+                'width': 200, 
+                'height': 150,
+                'rotation': (-3, 3)
+            },
+            {
+                'x': 350, 
+                'y': 100, 
+                'width': 200, 
+                'height': 150,
+                'rotation': (-3, 3)
+            }
+        ],
+        'text_positions': [{'x': 250, 'y': 280}],
+        'sticker_positions': [
+            {'x': 300, 'y': 80},
+            {'x': 480, 'y': 200}
+        ]
+    },
+    {
+        'name': 'Collage Style',
+        'description': 'Beberapa foto dengan ukuran berbeda',
+        'photo_positions': [
+            {
+                'x': 50, 
+                'y': 50, 
+                'width': 180, 
+                'height': 120,
+                'rotation': (-8, 8)
+            },
+            {
+                'x': 280, 
+                'y': 80, 
+                'width': 150, 
+                'height': 100,
+                'rotation': (-8, 8)
+            },
+            {
+                'x': 480, 
+                'y': 60, 
+                'width': 100, 
+                'height': 80,
+                'rotation': (-8, 8)
+            },
+            {
+                'x': 150, 
+                'y': 200, 
+                'width': 200, 
+                'height': 130,
+                'rotation': (-8, 8)
+            }
+        ],
+        'text_positions': [{'x': 400, 'y': 250}],
+        'sticker_positions': [
+            {'x': 250, 'y': 40},
+            {'x': 450, 'y': 150},
+            {'x': 100, 'y': 300}
+        ]
+    },
+    {
+        'name': 'Story Layout',
+        'description': 'Layout bercerita dengan foto dan teks bergantian',
+        'photo_positions': [
+            {
+                'x': 80, 
+                'y': 60, 
+                'width': 150, 
+                'height': 100,
+                'rotation': (-5, 5)
+            }
+        ],
+        'text_positions': [
+            {'x': 280, 'y': 80},
+            {'x': 100, 'y': 200},
+            {'x': 350, 'y': 250}
+        ],
+        'sticker_positions': [
+            {'x': 450, 'y': 100},
+            {'x': 50, 'y': 180}
+        ]
+    },
+    {
+        'name': 'Corner Focus',
+        'description': 'Foto di sudut dengan dekorasi mengelilingi',
+        'photo_positions': [
+            {
+                'x': 400, 
+                'y': 50, 
+                'width': 180, 
+                'height': 120,
+                'rotation': (-10, 10)
+            }
+        ],
+        'text_positions': [
+            {'x': 50, 'y': 100},
+            {'x': 100, 'y': 250}
+        ],
+        'sticker_positions': [
+            {'x': 200, 'y': 80},
+            {'x': 350, 'y': 200},
+            {'x': 500, 'y': 250}
+        ]
+    }
+)
+
+def generate_layout_suggestions(rng=random):
     """
     Menghasilkan saran layout untuk halaman scrapbook
+    
+    Args:
+        rng: random.Random untuk hasil yang bisa diulang (default: modul random)
+    
+    Returns:
+        Salinan baru salah satu LAYOUTS dengan rotasi foto acak
     """
-    layouts = [
-        {
-            'name': 'Single Focus',
-            'description': 'Satu foto besar di tengah dengan teks di bawah',
-            'photo_positions': [
-                {
-                    'x': 150, 
-                    'y': 80, 
-                    'width': 300, 
-                    'height': 200,
-                    'rotation': random.randint(-5, 5)
-                }
-            ],
-            'text_positions': [{'x': 200, 'y': 320}],
-            'sticker_positions': [
-                {'x': 400, 'y': 100},
-                {'x': 100, 'y': 250}
-            ]
-        },
-        {
-            'name': 'Dual Photos',
-            'description': 'Dua foto bersebelahan',
-            'photo_positions': [
-                {
-                    'x': 50, 
-                    'y': 100, 
-                    'width': 200, 
-                    'height': 150,
-                    'rotation': random.randint(-3, 3)
-                },
-                {
-                    'x': 350, 
-                    'y': 100, 
-                    'width': 200, 
-                    'height': 150,
-                    'rotation': random.randint(-3, 3)
-                }
-            ],
-            'text_positions': [{'x': 250, 'y': 280}],
-            'sticker_positions': [
-                {'x': 300, 'y': 80},
-                {'x': 480, 'y': 200}
-            ]
-        },
-        {
-            'name': 'Collage Style',
-            'description': 'Beberapa foto dengan ukuran berbeda',
-            'photo_positions': [
-                {
-                    'x': 50, 
-                    'y': 50, 
-                    'width': 180, 
-                    'height': 120,
-                    'rotation': random.randint(-8, 8)
-                },
-                {
-                    'x': 280, 
-                    'y': 80, 
-                    'width': 150, 
-                    'height': 100,
-                    'rotation': random.randint(-8, 8)
-                },
-                {
-                    'x': 480, 
-                    'y': 60, 
-                    'width': 100, 
-                    'height': 80,
-                    'rotation': random.randint(-8, 8)
-                },
-                {
-                    'x': 150, 
-                    'y': 200, 
-                    'width': 200, 
-                    'height': 130,
-                    'rotation': random.randint(-8, 8)
-                }
-            ],
-            'text_positions': [{'x': 400, 'y': 250}],
-            'sticker_positions': [
-                {'x': 250, 'y': 40},
-                {'x': 450, 'y': 150},
-                {'x': 100, 'y': 300}
-            ]
-        },
-        {
-            'name': 'Story Layout',
-            'description': 'Layout bercerita dengan foto dan teks bergantian',
-            'photo_positions': [
-                {
-                    'x': 80, 
-                    'y': 60, 
-                    'width': 150, 
-                    'height': 100,
-                    'rotation': random.randint(-5, 5)
-                }
-            ],
-            'text_positions': [
-                {'x': 280, 'y': 80},
-                {'x': 100, 'y': 200},
-                {'x': 350, 'y': 250}
-            ],
-            'sticker_positions': [
-                {'x': 450, 'y': 100},
-                {'x': 50, 'y': 180}
-            ]
-        },
-        {
-            'name': 'Corner Focus',
-            'description': 'Foto di sudut dengan dekorasi mengelilingi',
-            'photo_positions': [
-                {
-                    'x': 400, 
-                    'y': 50, 
-                    'width': 180, 
-                    'height': 120,
-                    'rotation': random.randint(-10, 10)
-                }
-            ],
-            'text_positions': [
-                {'x': 50, 'y': 100},
-                {'x': 100, 'y': 250}
-            ],
-            'sticker_positions': [
-                {'x': 200, 'y': 80},
-                {'x': 350, 'y': 200},
-                {'x': 500, 'y': 250}
-            ]
-        }
-    ]
+    layout = rng.choice(LAYOUTS)
+    return {
+        'name': layout['name'],
+        'description': layout['description'],
+        'photo_positions': [
+            dict(position, rotation=rng.randint(*position['rotation']))
+            for position in layout['photo_positions']
+        ],
+        'text_positions': [dict(position) for position in layout['text_positions']],
+        'sticker_positions': [dict(position) for position in layout['sticker_positions']],
+    }
+
+# Pola background sebagai tile yang berulang: (periode x, periode y)
+PATTERN_TILES = {
+    'dots': (60, 60),
+    'lines': (1, 25),
+    'grid': (20, 20),
+}
+PATTERN_COLOR = (200, 200, 200)
+
+@lru_cache(maxsize=32)
+def _pattern_tile(pattern, color_rgb):
+    """
+    Satu periode pola sebagai gambar kecil (diingat per pola dan warna)
+    
+    Bentuk yang melewati tepi tile digambar juga dari sisi seberangnya,
+    jadi tile bisa disusun tanpa sambungan.
+    """
+    tile_width, tile_height = PATTERN_TILES[pattern]
+    tile = Image.new('RGB', (tile_width, tile_height), color_rgb)
+    draw = ImageDraw.Draw(tile)
+    
+    if pattern == 'dots':
+        # Titik setiap 30px, berselang-seling (x + y kelipatan 60)
+        for x, y in ((0, 0), (60, 0), (0, 60), (60, 60), (30, 30)):
+            draw.ellipse([x-2, y-2, x+2, y+2], fill=PATTERN_COLOR)
+    
+    elif pattern == 'lines':
+        draw.line([(0, 0), (tile_width, 0)], fill=PATTERN_COLOR, width=1)
     
-    return random.choice(layouts)
+    elif pattern == 'grid':
+        draw.line([(0, 0), (0, tile_height)], fill=PATTERN_COLOR, width=1)
+        draw.line([(0, 0), (tile_width, 0)], fill=PATTERN_COLOR, width=1)
+    
+    return tile
+
+def _tile_image(tile, width, height):
+    """Menyusun tile sampai width x height (lebar yang terisi digandakan tiap paste)"""
+    img = Image.new(tile.mode, (width, height))
+    img.paste(tile, (0, 0))
+    
+    filled = tile.width
+    while filled < width:
+        img.paste(img.crop((0, 0, filled, tile.height)), (filled, 0))
+        filled *= 2
+    filled = tile.height
+    while filled < height:
+        img.paste(img.crop((0, 0, width, filled)), (0, filled))
+        filled *= 2
+    return img
+
+@lru_cache(maxsize=64)
+def _render_page_background(width, height, color_rgb, pattern):
+    """Data URL PNG background (diingat per ukuran, warna dan pola)"""
+    if pattern in PATTERN_TILES:
+        img = _tile_image(_pattern_tile(pattern, color_rgb), width, height)
+        if pattern == 'dots':
+            # Titik hanya berpusat di dalam halaman: sisa titik dari tile
+            # berikutnya di tepi kanan / bawah dihapus
+            last_x = (width - 1) // 30 * 30
+            last_y = (height - 1) // 30 * 30
+            if last_x + 3 < width:
+                img.paste(color_rgb, (last_x + 3, 0, width, height))
+            if last_y + 3 < height:
+                img.paste(color_rgb, (0, last_y + 3, width, height))
+    else:
+        img = Image.new('RGB', (width, height), color_rgb)
+    
+    # Convert to base64
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    img_str = base64.b64encode(buffer.getvalue()).decode()
+    
+    return f"data:image/png;base64,{img_str}"
 
 def create_page_background(width=600, height=400, color='#F5E6D3', pattern='dots'):
     """
     Membuat background untuk halaman scrapbook
     
+    Pola disusun dari satu tile kecil yang sudah digambar, dan hasilnya
+    diingat per (ukuran, warna, pola): halaman berikutnya dengan background
+    yang sama cukup mengambil string yang sudah ada.
+    
     Args:
         width: Lebar halaman
         height: Tinggi halaman
@@ -321,54 +487,32 @@ def create_page_background(width=600, height=400, color='#F5E6D3', pattern='dots
     # Convert hex color to RGB
     color_rgb = tuple(int(color[i:i+2], 16) for i in (1, 3, 5))
     
-    # Create image
-    img = Image.new('RGB', (width, height), color_rgb)
-    draw = ImageDraw.Draw(img)
-    
-    if pattern == 'dots':
-        # Add dot pattern
-        for x in range(0, width, 30):
-            for y in range(0, height, 30):
-                if (x + y) % 60 == 0:
-                    draw.ellipse([x-2, y-2, x+2, y+2], fill=(200, 200, 200, 50))
-    
-    elif pattern == 'lines':
-        # Add line pattern
-        for y in range(0, height, 25):
-            draw.line([(0, y), (width, y)], fill=(200, 200, 200, 30), width=1)
-    
-    elif pattern == 'grid':
-        # Add grid pattern
-        for x in range(0, width, 20):
-            draw.line([(x, 0), (x, height)], fill=(200, 200, 200, 20), width=1)
-        for y in range(0, height, 20):
-            draw.line([(0, y), (width, y)], fill=(200, 200, 200, 20), width=1)
-    
-    # Convert to base64
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return f"data:image/png;base64,{img_str}"
+    return _render_page_background(width, height, color_rgb, pattern)
 
-def add_decorative_border(image_data, border_style='ornate'):
+def add_decorative_border(image_data, border_style='ornate', cache=None):
     """
     Menambahkan border dekoratif ke gambar
     
     Args:
-        image_data: Base64 encoded image
+        image_data: Base64 encoded image atau ScrapbookImage
         border_style: Style border ('ornate', 'simple', 'floral')
+        cache: ImageCache (default: cache bersama, False untuk menonaktifkan)
     
     Returns:
-        Image with border as base64 string
+        Image with border as base64 string, atau ScrapbookImage jika input
+        berupa ScrapbookImage
     """
+    as_handle = isinstance(image_data, ScrapbookImage)
+    cache = None if as_handle else resolve_cache(cache)
+    key = None
+    if cache:
+        key = cache.make_key(image_data, 'border', border_style, 'JPEG', 90)
+        cached = cache.get(key)
+        if cached is not None:
+            return f"data:image/jpeg;base64,{base64.b64encode(cached).decode()}"
     
     # Decode image
-    image_bytes = base64.b64decode(image_data.split(',')[1])
-    image = Image.open(io.BytesIO(image_bytes))
-    
-    if image.mode != 'RGB':
-        image = image.convert('RGB')
+    image = load_image(image_data)
     
     # Create new image with border space
     border_size = 20
@@ -397,9 +541,14 @@ def add_decorative_border(image_data, border_style='ornate'):
         draw.rectangle([0, 0, 5, new_height], fill='black')
         draw.rectangle([new_width-5, 0, new_width, new_height], fill='black')
     
+    if as_handle:
+        return ScrapbookImage(bordered_image)
+    
     # Convert back to base64
     buffer = io.BytesIO()
     bordered_image.save(buffer, format='JPEG', quality=90)
+    if cache:
+        cache.put(key, buffer.getvalue())
     img_str = base64.b64encode(buffer.getvalue()).decode()
     
     return f"data:image/jpeg;base64,{img_str}"
@@ -415,9 +564,14 @@ def create_themed_page(theme='vintage', page_number=1):
     Returns:
         Dictionary berisi data halaman
     """
-    template = generate_scrapbook_template(theme, 1)
-    page_data = template['pages'][0]
-    page_data['id'] = page_number
+    page_data = _themed_page(theme, get_theme(theme), page_number)
+    print(f"✅ Themed page created for {theme} theme")
+    return page_data
+
+def _themed_page(theme, selected_theme, page_number, rng=random):
+    """Halaman bertema berisi teks dan stiker dari saran layout-nya"""
+    # Tema diambil dari registry, tanpa membuat template satu halaman
+    page_data = _template_page(theme, selected_theme, page_number, rng)
     
     # Apply layout suggestions
     layout = page_data['suggested_layouts']
@@ -449,12 +603,48 @@ def create_themed_page(theme='vintage', page_number=1):
                 'emoji': page_data['decorations'][i],
                 'x': pos['x'],
                 'y': pos['y'],
-                'size': random.randint(25, 35)
+                'size': rng.randint(25, 35)
             })
     
-    print(f"✅ Themed page created for {theme} theme")
     return page_data
 
+def iter_themed_album(theme='vintage', pages=10, seed=None):
+    """
+    Menghasilkan halaman album bertema satu per satu (lihat create_themed_album())
+    
+    Yields:
+        Dictionary halaman, sama seperti create_themed_page()
+    """
+    rng = random.Random(seed)
+    selected_theme = get_theme(theme)
+    for page_number in range(1, pages + 1):
+        yield _themed_page(theme, selected_theme, page_number, rng)
+
+def create_themed_album(theme='vintage', pages=10, seed=None, lazy=False):
+    """
+    Membuat seluruh halaman album bertema dalam satu kali jalan
+    
+    Tema diambil sekali dari registry dan semua pilihan acak memakai satu
+    random.Random(seed), jadi seed yang sama selalu menghasilkan album yang
+    sama (mis. untuk album awal banyak pengguna sekaligus) tanpa mengubah
+    state modul random.
+    
+    Args:
+        theme: Tema album
+        pages: Jumlah halaman
+        seed: Seed RNG (None: acak)
+        lazy: True untuk generator yang membuat halaman saat dibaca
+    
+    Returns:
+        List halaman, atau generator halaman jika lazy=True
+    """
+    if lazy:
+        return iter_themed_album(theme, pages, seed)
+    
+    album = list(iter_themed_album(theme, pages, seed))
+    print(f"✅ Themed album created for {theme} theme ({pages} pages)")
+    return album
+
 def generate_memory_prompts(theme='general'):
     """
     Menghasilkan prompt untuk membantu pengguna mengisi scrapbook
@@ -523,7 +713,7 @@ def export_scrapbook_data(pages_data, filename='scrapbook_export.json'):
         }
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+            json.dump(export_data, f, indent=2, ensure_ascii=False, default=json_default)
         
         print(f"✅ Scrapbook exported to {filename}")
         return True
@@ -538,7 +728,7 @@ if __name__ == "__main__":
     print("=" * 50)
     
     # Generate different themed templates
-    themes = ['vintage', 'modern', 'cute', 'nature', 'travel', 'birthday']
+    themes = list(theme_registry())
     
     print("Available themes:")
     for i, theme in enumerate(themes, 1):
@@ -563,6 +753,10 @@ if __name__ == "__main__":
     print(f"  - {len(sample_page.get('stickers', []))} stickers")
     print(f"  - Background: {sample_page.get('background', 'default')}")
     
+    # Create a whole album at once (same seed -> same album)
+    sample_album = create_themed_album('travel', 3, seed=42)
+    print(f"\nSample travel album created with {len(sample_album)} pages")
+    
     # Export sample data
     sample_pages = [sample_page]
     export_success = export_scrapbook_data(sample_pages, 'sample_scrapbook.json')
@@ -570,6 +764,8 @@ if __name__ == "__main__":
     print(f"\n✅ Scrapbook generator ready!")
     print("Available functions:")
     print("  - generate_scrapbook_template(theme, pages)")
+    print("  - theme_registry(themes_dir) / get_theme(theme)")
     print("  - create_themed_page(theme, page_number)")
+    print("  - create_themed_album(theme, pages, seed, lazy)")
     print("  - generate_memory_prompts(theme)")
     print("  - export_scrapbook_data(pages_data, filename)")
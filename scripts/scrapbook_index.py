@@ -0,0 +1,186 @@
+import sqlite3
+import threading
+from collections import Counter
+
+# Kolom yang boleh dipakai untuk sorting (nama kolom tidak bisa diparameterkan)
+SORT_COLUMNS = ('filename', 'title', 'page_count', 'photo_count', 'theme', 'size', 'saved_at')
+
+def summarize_scrapbook(scrapbook_data):
+    """
+    Ringkasan metadata scrapbook untuk katalog
+
+    Args:
+        scrapbook_data: Dictionary berisi data scrapbook
+
+    Returns:
+        Dictionary berisi title, page_count, photo_count, theme dan saved_at
+    """
+    pages = scrapbook_data.get('pages', [])
+    theme = scrapbook_data.get('theme')
+    if not theme:
+        # Tema yang paling sering dipakai halaman-halamannya
+        themes = Counter(page.get('theme') for page in pages if page.get('theme'))
+        theme = themes.most_common(1)[0][0] if themes else None
+
+    return {
+        'title': scrapbook_data.get('title') or scrapbook_data.get('scrapbook_title'),
+        'page_count': len(pages),
+        'photo_count': sum(len(page.get('photos', [])) for page in pages),
+        'theme': theme,
+        'saved_at': scrapbook_data.get('metadata', {}).get('saved_at'),
+    }
+
+class ScrapbookIndex:
+    """
+    Katalog SQLite kecil berisi metadata setiap scrapbook yang tersimpan
+
+    Diperbarui setiap kali scrapbook disimpan, jadi daftar scrapbook bisa
+    ditampilkan (dengan sorting, filter dan paginasi) tanpa membuka file
+    JSON satu per satu. Boleh dipakai dari beberapa thread (mis. compaction
+    di background).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS scrapbooks (
+                    filename TEXT PRIMARY KEY,
+                    title TEXT,
+                    page_count INTEGER NOT NULL DEFAULT 0,
+                    photo_count INTEGER NOT NULL DEFAULT 0,
+                    theme TEXT,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    saved_at TEXT,
+                    mtime_ns INTEGER
+                )
+            """)
+            # Katalog lama belum punya mtime_ns; entrinya akan diindeks ulang oleh sync
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(scrapbooks)")}
+            if 'mtime_ns' not in columns:
+                self._conn.execute("ALTER TABLE scrapbooks ADD COLUMN mtime_ns INTEGER")
+            # filename ikut di index karena dipakai sebagai urutan kedua
+            for column in ('title', 'saved_at', 'page_count', 'photo_count', 'size'):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_scrapbooks_{column} ON scrapbooks ({column}, filename)"
+                )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_scrapbooks_theme ON scrapbooks (theme, saved_at, filename)"
+            )
+
+    def upsert(self, filename, summary, size, mtime_ns=None):
+        """Menambah atau memperbarui entri katalog satu scrapbook"""
+        self.upsert_many([(filename, summary, size, mtime_ns)])
+
+    def upsert_many(self, entries):
+        """
+        Menambah atau memperbarui banyak entri dalam satu transaksi
+
+        Args:
+            entries: Iterable berisi (filename, summary, size) atau
+                     (filename, summary, size, mtime_ns); mtime_ns dipakai
+                     sync untuk mengenali file yang berubah di luar katalog
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO scrapbooks (filename, title, page_count, photo_count, theme, size, saved_at, mtime_ns)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(filename) DO UPDATE SET
+                    title = excluded.title,
+                    page_count = excluded.page_count,
+                    photo_count = excluded.photo_count,
+                    theme = excluded.theme,
+                    size = excluded.size,
+                    saved_at = excluded.saved_at,
+                    mtime_ns = excluded.mtime_ns
+                """,
+                (
+                    (filename, summary['title'], summary['page_count'], summary['photo_count'],
+                     summary['theme'], size, summary['saved_at'], mtime_ns[0] if mtime_ns else None)
+                    for filename, summary, size, *mtime_ns in entries
+                ),
+            )
+
+    def update_size(self, filename, size, mtime_ns=None):
+        """Memperbarui ukuran (dan mtime) file satu entri katalog, mis. setelah compaction"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE scrapbooks SET size = ?, mtime_ns = ? WHERE filename = ?",
+                               (size, mtime_ns, filename))
+
+    def file_states(self):
+        """
+        Ukuran dan mtime yang tercatat untuk setiap file
+
+        Returns:
+            Dictionary filename -> (size, mtime_ns)
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT filename, size, mtime_ns FROM scrapbooks").fetchall()
+        return {row['filename']: (row['size'], row['mtime_ns']) for row in rows}
+
+    def remove_many(self, filenames):
+        """Menghapus banyak entri katalog dalam satu transaksi"""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM scrapbooks WHERE filename = ?",
+                                   ((filename,) for filename in filenames))
+
+    def remove(self, filename):
+        """Menghapus entri katalog"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scrapbooks WHERE filename = ?", (filename,))
+
+    def _where(self, theme=None, title_contains=None, min_pages=None):
+        clauses = []
+        params = []
+        if theme is not None:
+            clauses.append("theme = ?")
+            params.append(theme)
+        if title_contains:
+            clauses.append("title LIKE ? ESCAPE '\\'")
+            escaped = title_contains.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"%{escaped}%")
+        if min_pages is not None:
+            clauses.append("page_count >= ?")
+            params.append(min_pages)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, limit=None, offset=0, sort_by='filename', descending=True,
+              theme=None, title_contains=None, min_pages=None):
+        """
+        Mengambil entri katalog dengan sorting, filter dan paginasi
+
+        Args:
+            limit: Jumlah entri maksimum (None = semua)
+            offset: Jumlah entri yang dilewati
+            sort_by: Kolom sorting (lihat SORT_COLUMNS)
+            descending: Urutan menurun
+            theme: Filter tema
+            title_contains: Filter judul (substring, case-insensitive)
+            min_pages: Filter jumlah halaman minimum
+
+        Returns:
+            List of dictionaries
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Unknown sort column: {sort_by}")
+        where, params = self._where(theme, title_contains, min_pages)
+        order = 'DESC' if descending else 'ASC'
+        # SQLite butuh LIMIT agar OFFSET berlaku; -1 berarti tanpa batas
+        sql = f"SELECT * FROM scrapbooks {where} ORDER BY {sort_by} {order}, filename {order} LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def count(self, theme=None, title_contains=None, min_pages=None):
+        """Jumlah entri yang cocok dengan filter"""
+        where, params = self._where(theme, title_contains, min_pages)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM scrapbooks {where}", params).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+
+import scrapbook_stream
+
+JOURNAL_SUFFIX = '.journal'
+
+def journal_path(path):
+    """Path journal untuk file snapshot scrapbook"""
+    return path + JOURNAL_SUFFIX
+
+def fingerprint(value, default=None):
+    """Hash isi sebuah halaman / header untuk mendeteksi perubahan"""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False,
+                         separators=(',', ':'), default=default)
+    return hashlib.sha1(encoded.encode('utf-8')).digest()
+
+def snapshot_state(scrapbook_data, default=None):
+    """
+    State perubahan (hash header dan hash per halaman) sebuah scrapbook
+
+    Returns:
+        Dictionary {'header': hash, 'pages': [hash, ...]}
+    """
+    header = {key: value for key, value in scrapbook_data.items() if key != 'pages'}
+    return {
+        'header': fingerprint(header, default),
+        'pages': [fingerprint(page, default) for page in scrapbook_data.get('pages', [])],
+    }
+
+def diff_records(state, scrapbook_data, default=None):
+    """
+    Record journal untuk perubahan sejak state terakhir
+
+    Args:
+        state: State dari snapshot_state() / diff_records() sebelumnya
+        scrapbook_data: Data scrapbook terbaru
+        default: Serializer JSON untuk nilai non-standar
+
+    Returns:
+        Tuple (records, state baru)
+    """
+    new_state = snapshot_state(scrapbook_data, default)
+    records = []
+
+    if new_state['header'] != state['header']:
+        records.append({
+            'op': 'fields',
+            'fields': {key: value for key, value in scrapbook_data.items() if key != 'pages'},
+        })
+
+    old_pages = state['pages']
+    for index, (page, page_hash) in enumerate(zip(scrapbook_data.get('pages', []), new_state['pages'])):
+        if index >= len(old_pages) or old_pages[index] != page_hash:
+            records.append({'op': 'page', 'index': index, 'page': page})
+
+    if records or len(new_state['pages']) != len(old_pages):
+        # Jumlah halaman ditulis di akhir setiap batch sebagai penanda commit
+        records.append({'op': 'count', 'count': len(new_state['pages'])})
+    return records, new_state
+
+def append_records(path, records, default=None):
+    """
+    Menambahkan record ke journal (append-only, satu JSON per baris)
+
+    Returns:
+        Jumlah byte yang ditulis
+    """
+    payload = ''.join(
+        json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=default) + '\n'
+        for record in records
+    ).encode('utf-8')
+    with open(journal_path(path), 'ab') as f:
+        f.write(payload)
+    return len(payload)
+
+def read_overlay(path, limit=None):
+    """
+    Membaca journal menjadi perubahan akhir terhadap snapshot
+
+    Batch yang tidak lengkap di akhir file (mis. karena crash saat menulis)
+    diabaikan.
+
+    Args:
+        path: Path file snapshot scrapbook
+        limit: Hanya membaca sejumlah byte pertama journal (optional)
+
+    Returns:
+        Tuple (fields atau None, {index: page}, jumlah halaman atau None)
+    """
+    fields = None
+    pages = {}
+    count = None
+    pending_fields = None
+    pending_pages = {}
+
+    try:
+        f = open(journal_path(path), 'rb')
+    except FileNotFoundError:
+        return fields, pages, count
+
+    with f:
+        position = 0
+        for line in f:
+            position += len(line)
+            if limit is not None and position > limit:
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record['op'] == 'fields':
+                pending_fields = record['fields']
+            elif record['op'] == 'page':
+                pending_pages[record['index']] = record['page']
+            elif record['op'] == 'count':
+                # Batch lengkap: terapkan
+                if pending_fields is not None:
+                    fields = pending_fields
+                pages.update(pending_pages)
+                count = record['count']
+                pending_fields = None
+                pending_pages = {}
+
+    return fields, pages, count
+
+def apply_overlay(scrapbook_data, overlay):
+    """Menerapkan hasil read_overlay() ke data snapshot (in-place)"""
+    fields, pages, count = overlay
+    if fields is not None:
+        snapshot_pages = scrapbook_data.get('pages', [])
+        scrapbook_data.clear()
+        scrapbook_data.update(fields)
+        scrapbook_data['pages'] = snapshot_pages
+    if count is not None:
+        snapshot_pages = scrapbook_data.get('pages', [])
+        scrapbook_data['pages'] = [
+            pages[index] if index in pages else snapshot_pages[index]
+            for index in range(count)
+        ]
+    return scrapbook_data
+
+def iter_overlay_pages(snapshot_pages, overlay):
+    """Versi streaming dari apply_overlay() untuk halaman"""
+    _, pages, count = overlay
+    index = -1
+    for index, page in enumerate(snapshot_pages):
+        if count is not None and index >= count:
+            return
+        yield pages.get(index, page)
+    if count is not None:
+        for index in range(index + 1, count):
+            yield pages[index]
+
+def load_scrapbook(path):
+    """Memuat snapshot JSON scrapbook beserta perubahan di journal-nya"""
+    overlay = read_overlay(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return apply_overlay(json.load(f), overlay)
+
+def read_header(path):
+    """
+    Versi scrapbook_stream.read_header() yang ikut membaca journal
+
+    Returns:
+        Dictionary field level atas ditambah 'page_count'
+    """
+    fields, _, count = read_overlay(path)
+    header = scrapbook_stream.read_header(path)
+    if fields is not None:
+        header = dict(fields, page_count=header['page_count'])
+    if count is not None:
+        header['page_count'] = count
+    return header
+
+def iter_pages(path):
+    """
+    Versi scrapbook_stream.iter_pages() yang ikut membaca journal
+
+    Journal dibaca lebih dulu (sebelum snapshot dibuka), jadi hasilnya tetap
+    benar walaupun journal sedang dipadatkan ke snapshot baru.
+    """
+    return iter_overlay_pages(scrapbook_stream.iter_pages(path), read_overlay(path))
+
+def journal_size(path):
+    try:
+        return os.path.getsize(journal_path(path))
+    except FileNotFoundError:
+        return 0
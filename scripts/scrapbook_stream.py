@@ -0,0 +1,199 @@
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+_decoder = json.JSONDecoder()
+
+class _JSONChunkReader:
+    """
+    Pembaca JSON bertahap: hanya menyimpan potongan file yang sedang diproses
+
+    Nilai di-decode dengan JSONDecoder.raw_decode (C) begitu potongannya
+    lengkap, jadi satu halaman scrapbook di-decode sekaligus tanpa perlu
+    memuat seluruh file ke memori. Nilai yang tidak dibutuhkan bisa
+    dilewati dengan skip() tanpa di-decode sama sekali.
+    """
+
+    def __init__(self, f, chunk_size=64 * 1024):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Karakter non-whitespace berikutnya ('' di akhir file)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        """Men-decode satu nilai JSON utuh mulai dari posisi sekarang"""
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # Angka di ujung buffer mungkin belum lengkap (mis. '2.' dari '2.5')
+                if _NUMBER_TAIL.match(self.buf, end).end() < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Potongan belum lengkap: baca lebih banyak, makin besar tiap kali
+            self._fill(size)
+            size *= 2
+
+    def skip(self):
+        """Melewati satu nilai JSON tanpa men-decode-nya"""
+        if self.peek() not in ('[', '{', '"'):
+            self.value()
+            return
+
+        # Hanya tanda kutip, escape dan kurung yang diperiksa; isi string
+        # (mis. foto base64) dilompati dengan str.find
+        depth = 0
+        in_string = False
+        pos = self.pos
+        while True:
+            if in_string:
+                index = self.buf.find('"', pos)
+                escape = self.buf.find('\\', pos, len(self.buf) if index < 0 else index)
+                if escape >= 0:
+                    index = escape
+            else:
+                match = _STRUCTURE.search(self.buf, pos)
+                index = match.start() if match else -1
+            if index < 0 or (self.buf[index] == '\\' and index + 1 >= len(self.buf)):
+                # Potongan habis: buang yang sudah dilewati, lalu baca lagi
+                self.pos = index if index >= 0 else len(self.buf)
+                if not self._fill(self.chunk_size):
+                    raise ValueError("Unterminated JSON value")
+                pos = self.pos
+                continue
+
+            token = self.buf[index]
+            pos = index + 1
+            if in_string:
+                if token == '\\':
+                    pos += 1
+                    continue
+                in_string = False
+            elif token == '"':
+                in_string = True
+                continue
+            elif token in '[{':
+                depth += 1
+                continue
+            else:
+                depth -= 1
+            if depth == 0:
+                self.pos = pos
+                return
+
+def iter_scrapbook(path, chunk_size=64 * 1024, skip_pages=False):
+    """
+    Membaca file JSON scrapbook secara bertahap
+
+    Args:
+        path: Path file JSON scrapbook
+        chunk_size: Ukuran potongan baca (karakter)
+        skip_pages: Lewati isi halaman tanpa di-decode (page bernilai None)
+
+    Yields:
+        ('field', key, value) untuk field level atas selain pages, dan
+        ('page', index, page) untuk setiap halaman, sesuai urutan di file
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _JSONChunkReader(f, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+
+        while True:
+            key = reader.value()
+            reader.expect(':')
+
+            if key == 'pages' and reader.peek() == '[':
+                reader.expect('[')
+                index = 0
+                if reader.peek() == ']':
+                    reader.expect(']')
+                else:
+                    while True:
+                        if skip_pages:
+                            reader.skip()
+                            yield 'page', index, None
+                        else:
+                            yield 'page', index, reader.value()
+                        index += 1
+                        if reader.peek() == ',':
+                            reader.expect(',')
+                            continue
+                        reader.expect(']')
+                        break
+            else:
+                yield 'field', key, reader.value()
+
+            if reader.peek() == ',':
+                reader.expect(',')
+                continue
+            reader.expect('}')
+            break
+
+def iter_pages(path, chunk_size=64 * 1024):
+    """
+    Menghasilkan halaman scrapbook satu per satu dari file JSON
+
+    Memori yang dipakai sebanding dengan satu halaman, bukan seluruh file.
+
+    Args:
+        path: Path file JSON scrapbook
+
+    Yields:
+        Dictionary halaman
+    """
+    for kind, _, value in iter_scrapbook(path, chunk_size):
+        if kind == 'page':
+            yield value
+
+def read_header(path, chunk_size=64 * 1024):
+    """
+    Membaca field level atas scrapbook (title, metadata, ...) tanpa pages
+
+    Halaman hanya dilewati untuk dihitung, tidak di-decode, jadi halaman
+    scrapbook tetap di-decode sekali saja oleh iter_pages().
+
+    Returns:
+        Dictionary field level atas ditambah 'page_count'
+    """
+    header = {}
+    page_count = 0
+    for kind, key, value in iter_scrapbook(path, chunk_size, skip_pages=True):
+        if kind == 'page':
+            page_count += 1
+        else:
+            header[key] = value
+    header['page_count'] = page_count
+    return header
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from pypdf import PdfReader
+
+from benchmarks import iter_synthetic_pages, make_data_url, make_test_image
+from pdf_generator import ScrapbookPDFGenerator
+
+class StreamingPDFMemoryTest(unittest.TestCase):
+    """Profil memori create_streaming_pdf pada album sintetis 1.000 halaman"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sources = [make_data_url(make_test_image(0.02, seed)) for seed in range(6)]
+        cls.directory = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def export(self, pages):
+        path = os.path.join(self.directory.name, f'album_{pages}.pdf')
+        album = {'title': 'Memory Test Album', 'pages': iter_synthetic_pages(pages, self.sources)}
+        generator = ScrapbookPDFGenerator(cache=False)
+        tracemalloc.start()
+        try:
+            result = generator.create_streaming_pdf(album, path)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(result, path)
+        return path, peak
+
+    def test_peak_memory_is_flat_and_output_is_complete(self):
+        _, small_peak = self.export(100)
+        path, large_peak = self.export(1000)
+
+        growth = large_peak / small_peak
+        self.assertLessEqual(growth, 1.5, f"peak memory grew {growth:.2f}x from 100 to 1000 pages")
+
+        reader = PdfReader(path)
+        self.assertEqual(len(reader.pages), 1000)
+        titles = [entry.title for entry in reader.outline]
+        self.assertEqual(titles, [f"Halaman {page}" for page in range(1, 1001)])
+        self.assertEqual(reader.get_destination_page_number(reader.outline[-1]), 999)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from scrapbook_index import ScrapbookIndex
+
+def _summary(title, page_count=1):
+    return {'title': title, 'page_count': page_count, 'photo_count': 0, 'theme': None, 'saved_at': None}
+
+class ScrapbookIndexQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.index = ScrapbookIndex(os.path.join(self.directory.name, 'index.sqlite3'))
+        self.index.upsert_many((f"album_{i}.json", _summary(f"Album {i}", i), 100 * i) for i in range(5))
+
+    def tearDown(self):
+        self.index.close()
+        self.directory.cleanup()
+
+    def filenames(self, **kwargs):
+        return [entry['filename'] for entry in self.index.query(sort_by='filename', descending=False, **kwargs)]
+
+    def test_limit_and_offset(self):
+        self.assertEqual(self.filenames(limit=2, offset=1), ['album_1.json', 'album_2.json'])
+
+    def test_offset_without_limit(self):
+        self.assertEqual(self.filenames(offset=3), ['album_3.json', 'album_4.json'])
+
+    def test_no_limit_no_offset(self):
+        self.assertEqual(len(self.filenames()), 5)
+
+    def test_update_size(self):
+        self.index.update_size('album_2.json', 42)
+        entry = self.index.query(title_contains='Album 2')[0]
+        self.assertEqual((entry['size'], entry['page_count']), (42, 2))
+
+    def test_file_states_and_remove_many(self):
+        self.index.upsert('album_9.json', _summary('Album 9'), 900, 12345)
+        states = self.index.file_states()
+        self.assertEqual((states['album_9.json'], states['album_0.json']), ((900, 12345), (0, None)))
+        self.index.remove_many(['album_9.json', 'album_0.json'])
+        self.assertEqual(self.index.count(), 4)
+
+    def test_other_thread(self):
+        thread = threading.Thread(target=self.index.update_size, args=('album_1.json', 7))
+        thread.start()
+        thread.join()
+        self.assertEqual(self.index.query(title_contains='Album 1')[0]['size'], 7)
+
+if __name__ == '__main__':
+    unittest.main()